@@ -0,0 +1,180 @@
+import datetime
+import json
+import time
+from urllib.parse import parse_qs
+
+import pytz
+
+from app import DEFAULT_LANG, GREETINGS, TIMEZONES
+
+# 요청마다 pytz.timezone()을 호출하지 않도록 시작할 때 한 번만 만들어 둠
+TZINFOS = {lang: pytz.timezone(name) for lang, name in TIMEZONES.items()}
+
+# 지원하는 응답 형식 (Accept 헤더로 선택, 첫 번째가 기본값)
+MEDIA_TYPES = ('application/json', 'text/plain')
+
+# 언어별 (초 단위 시각, {형식: 직렬화된 응답 본문}) 캐시
+_payload_cache = {}
+
+
+def build_payloads(lang, second):
+    """해당 초의 응답 본문을 형식별로 미리 직렬화합니다."""
+    current_time = datetime.datetime.fromtimestamp(
+        second, TZINFOS[lang]
+    ).strftime('%Y-%m-%d %H:%M:%S')
+    greeting = GREETINGS[lang]
+
+    # Flask의 jsonify와 같은 모양의 JSON (키 정렬, 한 줄 끝 개행)
+    body = json.dumps(
+        {'greeting': greeting, 'time': current_time},
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return {
+        'application/json': (body + '\n').encode('utf-8'),
+        'text/plain': f'{greeting} {current_time}\n'.encode('utf-8'),
+    }
+
+
+def get_payloads(lang, now=None):
+    """
+    언어별 응답 본문을 반환합니다.
+    시각은 초 단위로만 표시되므로 같은 초 안의 요청은 캐시된 본문을 그대로 씁니다.
+    """
+    second = int(now if now is not None else time.time())
+    cached = _payload_cache.get(lang)
+    if cached is None or cached[0] != second:
+        cached = (second, build_payloads(lang, second))
+        _payload_cache[lang] = cached
+    return cached[1]
+
+
+def _parse_accept(accept):
+    """Accept 헤더를 [(구체성, 순서, q, 형식)] 목록으로 나눕니다.
+
+    구체성: */* = 0, text/* 같은 type/* = 1, 정확한 형식 = 2
+    """
+    ranges = []
+    for order, item in enumerate(accept.split(',')):
+        parts = item.strip().split(';')
+        media = parts[0].strip().lower()
+        q = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition('=')
+            if key.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media == '*/*':
+            spec = 0
+        elif media.endswith('/*'):
+            spec = 1
+        else:
+            spec = 2
+        ranges.append((spec, order, q, media))
+    return ranges
+
+
+def _matches(media_range, media_type):
+    if media_range == '*/*':
+        return True
+    if media_range.endswith('/*'):
+        return media_type.startswith(media_range[:-1])
+    return media_range == media_type
+
+
+def negotiate(accept):
+    """
+    Accept 헤더에서 가장 선호하는 지원 형식을 고릅니다.
+    - 헤더가 없거나 */* 이면 JSON
+    - 지원하는 형식이 하나도 없으면 None (406)
+    형식마다 가장 구체적인 범위의 q를 쓰므로, application/json;q=0처럼
+    명시적으로 거부한 형식은 */*가 있어도 고르지 않습니다.
+    q가 같으면 와일드카드보다 구체적인 범위, 그다음 먼저 나온 범위를 우선합니다.
+    """
+    if not accept:
+        return MEDIA_TYPES[0]
+
+    ranges = _parse_accept(accept)
+    best, best_key = None, None
+    for index, media_type in enumerate(MEDIA_TYPES):
+        matching = [
+            (spec, -order, q)
+            for spec, order, q, media in ranges
+            if _matches(media, media_type)
+        ]
+        if not matching:
+            continue
+        spec, first, q = max(matching)
+        if q <= 0:
+            continue
+        key = (q, spec, first, -index)
+        if best_key is None or key > best_key:
+            best, best_key = media_type, key
+    return best
+
+
+def _header(scope, name):
+    for key, value in scope.get('headers', ()):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+async def _send_response(send, status, content_type, body):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type),
+            (b'content-length', str(len(body)).encode('ascii')),
+            (b'vary', b'accept'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope, receive, send):
+    """
+    03/app.py의 home()과 같은 응답을 돌려주는 ASGI 애플리케이션입니다.
+    - /?lang=ko -> 한국 시간과 한국어 인사
+    - / or /?lang=en -> UTC 시간과 영어 인사
+    - Accept: text/plain -> "인사말 시각" 한 줄
+    실행: uvicorn asgi_app:app --port 8080 (03 폴더에서)
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return
+
+    # 1. 경로 확인 (Flask 앱과 같이 '/'만 지원)
+    if scope['path'] != '/':
+        await _send_response(send, 404, b'text/plain', b'Not Found\n')
+        return
+
+    # 2. URL에서 'lang' 파라미터 가져오기 (지원하지 않으면 기본값)
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    lang = query.get('lang', [DEFAULT_LANG])[0]
+    if lang not in GREETINGS:
+        lang = DEFAULT_LANG
+
+    # 3. Accept 헤더로 응답 형식 선택
+    media = negotiate(_header(scope, b'accept'))
+    if media is None:
+        await _send_response(
+            send, 406, b'text/plain', b'Not Acceptable\n'
+        )
+        return
+
+    # 4. 캐시된(같은 초) 응답 본문 전송
+    body = get_payloads(lang)[media]
+    content_type = f'{media}; charset=utf-8'.encode('ascii')
+    await _send_response(send, 200, content_type, body)
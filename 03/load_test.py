@@ -0,0 +1,173 @@
+import argparse
+import asyncio
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from werkzeug.test import create_environ
+
+import asgi_app
+from app import app as flask_app
+
+
+def percentile(sorted_values, p):
+    """정렬된 값 목록에서 p 백분위수를 구합니다 (최근접 순위)."""
+    if not sorted_values:
+        return 0.0
+    k = round(p / 100 * (len(sorted_values) - 1))
+    return sorted_values[k]
+
+
+def summarize(name, latencies, elapsed):
+    """지연 시간 목록으로 p50/p99(ms)와 초당 요청 수를 계산합니다."""
+    latencies = sorted(latencies)
+    return {
+        'name': name,
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def bench_wsgi(path, requests):
+    """기존 Flask 앱(WSGI)을 서버 없이 직접 호출해 측정합니다."""
+    # 요청 환경은 측정 전에 미리 만들어 둠 (앱 처리 시간만 측정)
+    environs = [create_environ(path) for _ in range(requests)]
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    latencies = []
+    started = time.perf_counter()
+    for environ in environs:
+        t0 = time.perf_counter()
+        body = b''.join(flask_app(environ, start_response))
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return summarize('flask (wsgi)', latencies, elapsed), body
+
+
+def bench_asgi(path, requests, accept='application/json'):
+    """새 ASGI 앱을 서버 없이 직접 호출해 측정합니다."""
+    route, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': route,
+        'query_string': query.encode('latin-1'),
+        'headers': [(b'accept', accept.encode('latin-1'))],
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def run():
+        chunks = []
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                chunks.append(message['body'])
+
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            chunks.clear()
+            t0 = time.perf_counter()
+            await asgi_app.app(scope, receive, send)
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        return latencies, elapsed, b''.join(chunks)
+
+    latencies, elapsed, body = asyncio.run(run())
+    return summarize('asgi', latencies, elapsed), body
+
+
+def bench_http(name, url, requests, concurrency):
+    """실행 중인 서버에 HTTP 요청을 보내 측정합니다 (연결 재사용)."""
+    parts = urlsplit(url)
+    target = parts.path or '/'
+    if parts.query:
+        target += '?' + parts.query
+
+    per_worker = [requests // concurrency] * concurrency
+    for i in range(requests % concurrency):
+        per_worker[i] += 1
+
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(count):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        local = []
+        for _ in range(count):
+            t0 = time.perf_counter()
+            conn.request('GET', target)
+            conn.getresponse().read()
+            local.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in per_worker]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return summarize(name, latencies, elapsed)
+
+
+def print_report(results):
+    print(f"{'name':<16}{'requests':>10}{'rps':>12}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for r in results:
+        print(
+            f"{r['name']:<16}{r['requests']:>10}{r['rps']:>12.0f}"
+            f"{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+        )
+
+
+def main():
+    """
+    기존 Flask 엔드포인트와 ASGI 엔드포인트의 p50/p99 지연 시간과 초당 요청 수를 비교합니다.
+    - python load_test.py                       (서버 없이 앱을 직접 호출)
+    - python load_test.py --old-url http://localhost:8080/?lang=ko \\
+                          --new-url http://localhost:8081/?lang=ko -c 16
+    """
+    parser = argparse.ArgumentParser(description='인사말/시간 엔드포인트 부하 테스트')
+    parser.add_argument('-n', '--requests', type=int, default=20000)
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('--path', default='/?lang=ko')
+    parser.add_argument('--old-url', help='실행 중인 Flask 서버 주소')
+    parser.add_argument('--new-url', help='실행 중인 ASGI 서버 주소')
+    args = parser.parse_args()
+
+    if args.old_url or args.new_url:
+        results = []
+        for name, url in (('old (http)', args.old_url), ('new (http)', args.new_url)):
+            if url:
+                results.append(
+                    bench_http(name, url, args.requests, args.concurrency)
+                )
+        print_report(results)
+        return
+
+    old, old_body = bench_wsgi(args.path, args.requests)
+    new, new_body = bench_asgi(args.path, args.requests)
+    plain, _ = bench_asgi(args.path, args.requests, accept='text/plain')
+    plain['name'] = 'asgi (text)'
+    print_report([old, new, plain])
+
+    # 시각을 제외한 응답 내용이 같은지 확인
+    old_data, new_data = json.loads(old_body), json.loads(new_body)
+    if old_data.keys() != new_data.keys() or (
+        old_data['greeting'] != new_data['greeting']
+    ):
+        print('경고: 두 엔드포인트의 JSON 응답이 다릅니다.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import io
+import json
+import os
+
+from csv_ingest import StructTable, read_merged
+
+PARTITION_FOLDER_NAME = "merged_by_area"
+INDEX_NAME = "index.json"
+
+
+def partition_folder(data_folder):
+    """area별 파티션 폴더 경로를 반환합니다."""
+    return os.path.join(data_folder, PARTITION_FOLDER_NAME)
+
+
+def partition_path(output_folder, area):
+    """area별 파티션 파일 경로를 반환합니다."""
+    return os.path.join(output_folder, f"area_{area}.csv")
+
+
+class AreaIndexBuilder:
+    """병합 데이터를 청크 단위로 받아 area별 행 수/범위/구조물 수를 누적하는 클래스"""
+
+    def __init__(self):
+        self.areas = {}
+
+    def add(self, chunk):
+        """청크 하나의 통계를 누적합니다."""
+        grouped = chunk.groupby("area", sort=True)
+        bounds = grouped.agg(
+            min_x=("x", "min"),
+            min_y=("y", "min"),
+            max_x=("x", "max"),
+            max_y=("y", "max"),
+            rows=("x", "size"),
+        )
+        structs = (
+            chunk[chunk["category"] > 0]
+            .groupby(["area", "struct"], observed=True)
+            .size()
+        )
+
+        for area, row in bounds.iterrows():
+            entry = self.areas.setdefault(
+                int(area),
+                {"rows": 0, "bbox": None, "structs": {}},
+            )
+            entry["rows"] += int(row["rows"])
+            bbox = [int(row[k]) for k in ("min_x", "min_y", "max_x", "max_y")]
+            if entry["bbox"] is None:
+                entry["bbox"] = bbox
+            else:
+                old = entry["bbox"]
+                entry["bbox"] = [
+                    min(old[0], bbox[0]),
+                    min(old[1], bbox[1]),
+                    max(old[2], bbox[2]),
+                    max(old[3], bbox[3]),
+                ]
+
+        for (area, struct), count in structs.items():
+            counts = self.areas[int(area)]["structs"]
+            counts[struct] = counts.get(struct, 0) + int(count)
+
+    def sorted_areas(self):
+        """누적된 area 번호를 오름차순으로 반환합니다."""
+        return sorted(self.areas)
+
+
+def write_area_index(output_folder, builder, merged_name, offsets):
+    """area → 파일/오프셋, 범위(bbox), 구조물 개수 인덱스를 저장합니다.
+
+    offsets는 {area: (시작 바이트, 바이트 길이)}로, 병합 CSV 안에서 해당
+    area 행들이 차지하는 위치입니다.
+    """
+    index = {"merged_file": merged_name, "areas": {}}
+    for area in builder.sorted_areas():
+        entry = dict(builder.areas[area])
+        entry["file"] = os.path.basename(partition_path(output_folder, area))
+        entry["offset"], entry["length"] = offsets[area]
+        index["areas"][str(area)] = entry
+
+    with open(
+        os.path.join(output_folder, INDEX_NAME), "w", encoding="utf-8"
+    ) as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def read_area_index(data_folder):
+    """area 인덱스를 읽습니다 (없으면 None)."""
+    index_path = os.path.join(partition_folder(data_folder), INDEX_NAME)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_area(area_id, data_folder, usecols=None):
+    """지정한 area의 데이터만 불러옵니다.
+
+    area 파티션 파일을 읽고, 파티션이 없으면 병합 CSV에서 인덱스에 기록된
+    바이트 범위만 읽어 파싱합니다. 인덱스에 없는 area면 KeyError를 냅니다.
+    usecols를 주면 그 컬럼만 읽습니다. struct 컬럼은 category 번호로
+    만든 공용 코드표(StructTable)의 Categorical입니다.
+    """
+    index = read_area_index(data_folder)
+    if index is None:
+        raise FileNotFoundError(
+            "area 인덱스가 없습니다. caffee_map.py를 먼저 실행하세요."
+        )
+
+    entry = index["areas"][str(area_id)]
+    folder = partition_folder(data_folder)
+    part_path = os.path.join(folder, entry["file"])
+    table = StructTable.load(data_folder)
+    if os.path.exists(part_path):
+        return read_merged(part_path, table, usecols)
+
+    merged_path = os.path.join(data_folder, index["merged_file"])
+    with open(merged_path, "rb") as f:
+        header = f.readline()
+        f.seek(entry["offset"])
+        body = f.read(entry["length"])
+    return read_merged(io.BytesIO(header + body), table, usecols)
@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+from distance_field import DistanceField
+
+# 출발점 하나의 결과 (도달 불가면 cafe/distance/path가 None)
+CafeRoute = namedtuple("CafeRoute", ["origin", "cafe", "distance", "path"])
+
+
+class NearestCafeRouter:
+    """모든 반달곰 커피에서 한 번 역방향 BFS를 해 두고 여러 출발점을 조회하는 클래스
+
+    4방향 단위 비용 격자는 방향을 바꿔도 거리가 같으므로, 카페들을 출발점으로
+    한 거리장 하나로 모든 출발점의 가장 가까운 카페와 거리를 알 수 있습니다.
+    출발점이 몇 개든 격자 탐색은 한 번이고, 이후 조회는 배열 인덱싱입니다.
+    """
+
+    def __init__(self, graph, cafes):
+        self.cafes = list(cafes)
+        self.field = DistanceField(graph, self.cafes)
+
+    def route_many(self, origins, with_paths=False):
+        """출발점마다 가장 가까운 카페, 거리, (선택) 경로를 반환합니다.
+
+        with_paths가 True이면 경로도 구합니다 (출발점마다 O(경로 길이)).
+        반환값: origins 순서와 같은 CafeRoute 리스트
+        """
+        origins = [tuple(int(v) for v in pos) for pos in origins]
+        if not origins:
+            return []
+
+        dist, label = self.field.query_many(origins)
+        routes = []
+        for origin, d, i in zip(origins, dist.tolist(), label.tolist()):
+            if i < 0:
+                routes.append(CafeRoute(origin, None, None, None))
+                continue
+            path = self.field.path(origin) if with_paths else None
+            routes.append(CafeRoute(origin, self.cafes[i], d, path))
+        return routes
+
+    def route(self, origin, with_path=True):
+        """출발점 하나의 결과를 반환합니다."""
+        return self.route_many([origin], with_path)[0]
+
+
+def nearest_cafe_routes(graph, cafes, origins, with_paths=False):
+    """여러 출발점에서 가장 가까운 반달곰 커피까지의 결과를 한 번에 구합니다."""
+    return NearestCafeRouter(graph, cafes).route_many(origins, with_paths)
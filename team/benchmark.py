@@ -0,0 +1,308 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from area_index import partition_folder
+from batch_routing import NearestCafeRouter
+from caffee_map import (
+    load_sources,
+    merge_area_data,
+    save_merged_outputs,
+    write_partitions,
+)
+from csv_ingest import StructTable, read_merged
+from grid_graph import GridGraph
+from map_cache import load_merged_data, write_cache
+from map_direct_save import (
+    create_grid_matrix,
+    draw_map_with_path,
+    find_coffee_locations,
+    find_home_location,
+    find_optimal_structure_tour,
+)
+from map_synth import (
+    DEFAULT_CAFES,
+    DEFAULT_DENSITY,
+    DEFAULT_STRUCTURES,
+    generate_map,
+    write_map,
+)
+from pathfinding import find_path
+
+STAGES = (
+    "integration",
+    "load_csv",
+    "load_cache",
+    "grid_build",
+    "route",
+    "nearest_cafe",
+    "tour",
+    "render",
+)
+DEFAULT_SIZES = (15, 256, 1024)
+# 이 크기를 넘는 지도는 렌더링(300 dpi PNG) 단계를 기본으로 생략
+RENDER_LIMIT = 1024
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info():
+    """결과 비교에 필요한 실행 환경 정보를 모읍니다."""
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+class StageTimer:
+    """단계별로 여러 번 실행한 시간 중 최솟값/중앙값을 기록하는 클래스"""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = {}
+
+    def run(self, name, fn):
+        """fn을 repeat번 실행해 시간을 기록하고 마지막 반환값을 돌려줍니다."""
+        times = []
+        value = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            value = fn()
+            times.append(time.perf_counter() - start)
+        self.results[name] = {
+            "min_s": min(times),
+            "median_s": float(np.median(times)),
+            "runs": len(times),
+        }
+        return value
+
+
+def bench_map(
+    size,
+    workdir,
+    density=DEFAULT_DENSITY,
+    structures=DEFAULT_STRUCTURES,
+    cafes=DEFAULT_CAFES,
+    seed=0,
+    repeat=3,
+    stages=STAGES,
+):
+    """가상 지도 하나를 만들어 각 단계를 따로 측정합니다."""
+    data_folder = os.path.join(workdir, f"map_{size}")
+    map_df, struct_df = generate_map(
+        size, density, structures, cafes, seed=seed
+    )
+    write_map(data_folder, map_df, struct_df)
+    del map_df, struct_df
+
+    merged_path = os.path.join(data_folder, "merged_data.csv")
+    parts = partition_folder(data_folder)
+    timer = StageTimer(repeat)
+
+    def integrate():
+        merged = merge_area_data(*load_sources(data_folder))
+        save_merged_outputs(
+            write_partitions(merged, parts), parts, data_folder
+        )
+        write_cache(merged, data_folder)
+
+    # 이후 단계에 필요한 병합 파일은 측정 여부와 관계없이 만들어 둠
+    if "integration" in stages:
+        timer.run("integration", integrate)
+    else:
+        integrate()
+
+    table = StructTable.load(data_folder)
+    df = None
+    if "load_csv" in stages:
+        df = timer.run("load_csv", lambda: read_merged(merged_path, table))
+    if "load_cache" in stages:
+        df = timer.run("load_cache", lambda: load_merged_data(merged_path))
+    if df is None:
+        df = load_merged_data(merged_path)
+
+    def build():
+        grid, structs, max_x, max_y = create_grid_matrix(df, table)
+        return grid, structs, max_x, max_y, GridGraph(grid, max_x, max_y)
+
+    if "grid_build" in stages:
+        grid, structs, max_x, max_y, graph = timer.run("grid_build", build)
+    else:
+        grid, structs, max_x, max_y, graph = build()
+
+    home = find_home_location(structs)
+    cafe_positions = find_coffee_locations(structs)
+    path = None
+    if "route" in stages and cafe_positions:
+        path = timer.run(
+            "route", lambda: find_path(graph, home, cafe_positions[0])
+        )
+    if "nearest_cafe" in stages and cafe_positions:
+        result = timer.run(
+            "nearest_cafe",
+            lambda: NearestCafeRouter(graph, cafe_positions).route(home),
+        )
+        path = result.path
+
+    bonus_path = None
+    if "tour" in stages:
+        bonus_path, _ = timer.run(
+            "tour",
+            lambda: find_optimal_structure_tour(
+                grid, home, structs, max_x, max_y
+            ),
+        )
+
+    if "render" in stages:
+        output_path = os.path.join(data_folder, "map_final.png")
+        timer.run(
+            "render",
+            lambda: draw_map_with_path(
+                df,
+                path,
+                structs,
+                max_x,
+                max_y,
+                bonus_path,
+                output_path=output_path,
+            ),
+        )
+
+    return {
+        "size": size,
+        "cells": size * size,
+        "density": density,
+        "structures": structures,
+        "cafes": cafes,
+        "seed": seed,
+        "route_length": len(path) - 1 if path else None,
+        "stages": timer.results,
+    }
+
+
+def compare_reports(baseline, report, threshold=1.1):
+    """이전 결과와 비교해 단계별 시간 비율을 출력합니다.
+
+    같은 크기/조건의 지도끼리 비교하며, threshold배 이상 느려진 단계 수를 반환합니다.
+    """
+
+    def run_key(run):
+        return (run["size"], run["density"], run["structures"], run["cafes"])
+
+    old_runs = {run_key(run): run for run in baseline["runs"]}
+    regressions = 0
+    print(f"\n기준 커밋 {baseline['environment'].get('commit')}와 비교:")
+    for run in report["runs"]:
+        old = old_runs.get(run_key(run))
+        if old is None:
+            continue
+        for name, result in run["stages"].items():
+            if name not in old["stages"]:
+                continue
+            ratio = result["min_s"] / max(old["stages"][name]["min_s"], 1e-9)
+            mark = ""
+            if ratio >= threshold:
+                mark = "  <- 느려짐"
+                regressions += 1
+            print(f"  {run['size']:>5} {name:<14}{ratio:>8.2f}x{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지도 파이프라인 벤치마크")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="측정할 지도 한 변 길이들 (15 ~ 4096)",
+    )
+    parser.add_argument("--density", type=float, default=DEFAULT_DENSITY)
+    parser.add_argument("--structures", type=int, default=DEFAULT_STRUCTURES)
+    parser.add_argument("--cafes", type=int, default=DEFAULT_CAFES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="단계별 반복 횟수"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=None,
+        help=f"측정할 단계 (기본: 전체, {RENDER_LIMIT} 초과 지도는 render 제외)",
+    )
+    parser.add_argument(
+        "--workdir",
+        default=None,
+        help="가상 지도를 저장할 폴더 (기본: 임시 폴더, 끝나면 삭제)",
+    )
+    parser.add_argument(
+        "--output", default="benchmark.json", help="결과 JSON 파일"
+    )
+    parser.add_argument(
+        "--compare", default=None, help="비교할 이전 결과 JSON 파일"
+    )
+    args = parser.parse_args()
+
+    # 창을 띄우지 않고 파일로만 렌더링
+    matplotlib.use("Agg")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        runs = []
+        for size in args.sizes:
+            stages = args.stages or [
+                s for s in STAGES if s != "render" or size <= RENDER_LIMIT
+            ]
+            print(f"{size}x{size} 지도 측정 중...")
+            run = bench_map(
+                size,
+                workdir,
+                args.density,
+                args.structures,
+                args.cafes,
+                args.seed,
+                args.repeat,
+                stages,
+            )
+            for name, result in run["stages"].items():
+                print(f"  {name:<14}{result['min_s'] * 1000:>12.1f} ms")
+            runs.append(run)
+
+    report = {"environment": environment_info(), "runs": runs}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과가 저장되었습니다: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare_reports(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+import argparse
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from csv_ingest import iter_table
+from grid_graph import BLOCKED, PASSABLE
+from pathfinding import search
+
+# 파일 형식: 헤더(매직, max_x, max_y, 타일 한 변) 다음 DATA_OFFSET부터
+# 타일 번호(열 우선: tx * tiles_y + ty) 순으로 타일마다 tile² 비트를 저장
+# (타일 안에서도 열 우선 lx * tile + ly, 1: 이동 가능, little-endian 비트 순서)
+BIT_GRID_MAGIC = b"BITG"
+_HEADER = struct.Struct("<4sIII")
+# 타일 데이터를 OS 페이지 경계에서 시작 (128×128 타일 = 2 KiB, 한 페이지에 2개)
+DATA_OFFSET = 4096
+DEFAULT_TILE = 128
+# 풀어서 보관하는 최근 타일 수 (128×128 타일 하나에 16 KiB)
+DEFAULT_CACHE_TILES = 256
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# 큰 지도의 좌표는 int16을 넘을 수 있으므로 병합 CSV를 읽을 때 int32 사용
+_COORD_SCHEMA = {"x": "int32", "y": "int32", "ConstructionSite": "uint8"}
+
+
+def _tile_count(length, tile):
+    return (length + tile - 1) // tile
+
+
+class BitGrid:
+    """건설현장 여부를 칸당 1비트로 담은 메모리 매핑 격자 파일
+
+    격자를 tile × tile 칸 타일로 나눠 타일별로 연속해서 저장하므로, 탐색이
+    읽는 칸이 있는 타일의 페이지만 디스크에서 올라옵니다. 읽은 타일은
+    막힘 여부(1: 막힘) 바이트열로 풀어 최근 cache_tiles개만 보관합니다.
+
+    GridGraph와 같은 셀 번호(idx = x * stride + y, 테두리 포함)와
+    cells[셀 번호] 접근을 제공하므로 단위 비용 4방향 탐색 엔진
+    (pathfinding.find_path의 astar/jps/bidir)에 그대로 넘길 수 있습니다.
+    sparse가 True이면 탐색 엔진은 격자 크기 배열 대신 방문한 칸만 dict에
+    저장합니다.
+
+    격자 전체를 배열로 다루는 구조(ConnectivityIndex, DistanceField,
+    HierarchicalPlanner, IncrementalPlanner, CachedPathfinder,
+    ParallelRouter)는 지원하지 않으며 TypeError를 냅니다. 이런 구조가
+    필요하면 to_grid()로 GridGraph를 만들어 쓰세요.
+    """
+
+    sparse = True
+    diagonal = False
+    costs = None
+    min_cost = 1.0
+    unit_cost = True
+
+    def __init__(
+        self, file_path, writable=False, cache_tiles=DEFAULT_CACHE_TILES
+    ):
+        with open(file_path, "rb") as f:
+            magic, max_x, max_y, tile = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != BIT_GRID_MAGIC:
+            raise ValueError(f"비트 격자 파일 형식이 아닙니다: {file_path}")
+
+        self.file_path = file_path
+        self.max_x = int(max_x)
+        self.max_y = int(max_y)
+        self.tile = int(tile)
+        self.stride = self.max_y + 2
+        self.size = (self.max_x + 2) * self.stride
+        # GridGraph와 같은 순서: 좌, 우, 상, 하
+        self.offsets = (-self.stride, self.stride, -1, 1)
+
+        self.tiles_x = _tile_count(self.max_x, self.tile)
+        self.tiles_y = _tile_count(self.max_y, self.tile)
+        self.tile_bytes = self.tile * self.tile // 8
+        self.bits = np.memmap(
+            file_path,
+            dtype=np.uint8,
+            mode="r+" if writable else "r",
+            offset=DATA_OFFSET,
+            shape=(self.tiles_x * self.tiles_y * self.tile_bytes,),
+        )
+
+        self.cache_tiles = int(cache_tiles)
+        self._tiles = OrderedDict()  # 타일 번호 → 막힘 여부 바이트열
+        self.touched = set()  # 한 번이라도 읽은 타일 번호
+        self.tiles_read = 0  # 파일에서 타일을 읽어 푼 횟수
+
+    @classmethod
+    def create(cls, file_path, max_x, max_y, tile=DEFAULT_TILE, **options):
+        """모든 칸이 막힌 빈 격자 파일을 만들어 쓰기 모드로 엽니다.
+
+        비트 0이 막힌 칸이므로 파일 크기만 늘리면 되고(sparse 파일),
+        지도 크기와 관계없이 바로 끝납니다.
+        """
+        if tile <= 0 or tile % 8:
+            raise ValueError("타일 한 변은 8의 배수여야 합니다.")
+        if max_x <= 0 or max_y <= 0:
+            raise ValueError("지도 크기는 1칸 이상이어야 합니다.")
+        tiles = _tile_count(max_x, tile) * _tile_count(max_y, tile)
+        with open(file_path, "wb") as f:
+            f.write(_HEADER.pack(BIT_GRID_MAGIC, max_x, max_y, tile))
+            f.truncate(DATA_OFFSET + tiles * tile * tile // 8)
+        return cls(file_path, writable=True, **options)
+
+    @classmethod
+    def from_grid(
+        cls, file_path, grid, max_x, max_y, tile=DEFAULT_TILE, **options
+    ):
+        """1-based grid[y][x](1: 건설현장) 격자를 비트 격자 파일로 저장합니다."""
+        bit_grid = cls.create(file_path, max_x, max_y, tile, **options)
+        free = np.zeros(
+            (bit_grid.tiles_x * tile, bit_grid.tiles_y * tile), dtype=bool
+        )
+        interior = np.asarray(grid, dtype=np.uint8)[
+            1 : max_y + 1, 1 : max_x + 1
+        ]
+        free[:max_x, :max_y] = interior.T == PASSABLE
+        tiles = free.reshape(bit_grid.tiles_x, tile, bit_grid.tiles_y, tile)
+        bit_grid.bits[:] = np.packbits(
+            tiles.transpose(0, 2, 1, 3).ravel(), bitorder="little"
+        )
+        bit_grid.flush()
+        return bit_grid
+
+    @classmethod
+    def from_csv(
+        cls,
+        file_path,
+        csv_path,
+        tile=DEFAULT_TILE,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        **options,
+    ):
+        """병합 CSV를 청크 단위로 두 번 읽어 비트 격자 파일을 만듭니다.
+
+        처음에는 x, y만 읽어 지도 크기를 정하고, 다음에 이동 가능한 칸의
+        비트만 켭니다. 한 번에 청크 하나만 메모리에 두므로 지도 전체를
+        메모리에 올릴 수 없어도 만들 수 있습니다. 데이터에 없는 칸은
+        막힌 칸입니다.
+        """
+        max_x = max_y = 0
+        for chunk in iter_table(
+            csv_path, chunk_size, _COORD_SCHEMA, usecols=["x", "y"]
+        ):
+            max_x = max(max_x, int(chunk["x"].max()))
+            max_y = max(max_y, int(chunk["y"].max()))
+
+        bit_grid = cls.create(file_path, max_x, max_y, tile, **options)
+        for chunk in iter_table(
+            csv_path, chunk_size, _COORD_SCHEMA, usecols=list(_COORD_SCHEMA)
+        ):
+            free = chunk["ConstructionSite"].to_numpy() == PASSABLE
+            bit_grid.set_cells(
+                chunk["x"].to_numpy()[free], chunk["y"].to_numpy()[free]
+            )
+        bit_grid.flush()
+        return bit_grid
+
+    def _bit_positions(self, xs, ys):
+        """좌표 배열을 (바이트 위치, 비트 마스크) 배열로 변환합니다."""
+        x0 = np.asarray(xs, dtype=np.int64) - 1
+        y0 = np.asarray(ys, dtype=np.int64) - 1
+        if (
+            (x0 < 0) | (x0 >= self.max_x) | (y0 < 0) | (y0 >= self.max_y)
+        ).any():
+            raise ValueError("지도 밖 좌표가 있습니다.")
+        tile = self.tile
+        key = (x0 // tile) * self.tiles_y + y0 // tile
+        bit = key * tile * tile + (x0 % tile) * tile + y0 % tile
+        return bit >> 3, (1 << (bit & 7)).astype(np.uint8)
+
+    def set_cells(self, xs, ys, passable=True):
+        """여러 칸의 이동 가능 여부를 한꺼번에 바꿉니다 (쓰기 모드 전용)."""
+        positions, masks = self._bit_positions(xs, ys)
+        if passable:
+            np.bitwise_or.at(self.bits, positions, masks)
+        else:
+            np.bitwise_and.at(self.bits, positions, ~masks)
+        # 바뀐 칸이 든 타일은 다음에 다시 읽음
+        tile_ids = np.unique(positions // self.tile_bytes).tolist()
+        for key in tile_ids:
+            self._tiles.pop(key, None)
+
+    def set_blocked(self, pos, blocked=True):
+        """해당 좌표의 건설현장 여부를 변경합니다."""
+        self.set_cells([pos[0]], [pos[1]], not blocked)
+
+    def _tile(self, key):
+        """타일 하나를 막힘 여부 바이트열(1: 막힘, 열 우선)로 반환합니다."""
+        tiles = self._tiles
+        cells = tiles.get(key)
+        if cells is not None:
+            tiles.move_to_end(key)
+            return cells
+
+        start = key * self.tile_bytes
+        free = np.unpackbits(
+            self.bits[start : start + self.tile_bytes], bitorder="little"
+        )
+        cells = (free ^ 1).tobytes()
+        self.tiles_read += 1
+        self.touched.add(key)
+        tiles[key] = cells
+        if len(tiles) > self.cache_tiles:
+            tiles.popitem(last=False)
+        return cells
+
+    @property
+    def cells(self):
+        # 탐색 엔진은 cells[셀 번호]로 막힘 여부만 읽음
+        return self
+
+    def __getitem__(self, idx):
+        """셀 번호의 막힘 여부 (1: 건설현장/지도 밖, 0: 이동 가능)"""
+        x, y = divmod(idx, self.stride)
+        x -= 1
+        y -= 1
+        if not (0 <= x < self.max_x and 0 <= y < self.max_y):
+            return BLOCKED
+        tile = self.tile
+        tx, lx = divmod(x, tile)
+        ty, ly = divmod(y, tile)
+        return self._tile(tx * self.tiles_y + ty)[lx * tile + ly]
+
+    def __len__(self):
+        return self.size
+
+    def index(self, pos):
+        """(x, y) 좌표를 셀 번호로 변환합니다."""
+        return pos[0] * self.stride + pos[1]
+
+    def coord(self, idx):
+        """셀 번호를 (x, y) 좌표로 변환합니다."""
+        x, y = divmod(int(idx), self.stride)
+        return (x, y)
+
+    def is_passable(self, pos):
+        """해당 좌표가 지도 안에 있고 이동 가능한지 확인합니다."""
+        return self[self.index(pos)] == PASSABLE
+
+    def neighbors(self, pos):
+        """4방향으로 이동 가능한 이웃 좌표 (좌, 우, 상, 하 순)"""
+        idx = self.index(pos)
+        return [
+            self.coord(idx + offset)
+            for offset in self.offsets
+            if self[idx + offset] == PASSABLE
+        ]
+
+    def moves(self):
+        """이동 방향 목록 (GridGraph.moves와 같은 형식, 4방향 단위 비용)"""
+        return [(offset, 1.0, 0, 0) for offset in self.offsets]
+
+    def step_cost(self, a, b):
+        return 1.0
+
+    def _line(self, fixed, along):
+        """한 행(along=0: x 방향) 또는 열(along=1: y 방향)의 막힘 여부"""
+        tile = self.tile
+        length = self.max_x if along == 0 else self.max_y
+        line = np.full(length + 1, BLOCKED, dtype=np.uint8)
+        t_fixed, l_fixed = divmod(fixed - 1, tile)
+        for t in range(_tile_count(length, tile)):
+            if along == 0:
+                cells = self._tile(t * self.tiles_y + t_fixed)
+                part = cells[l_fixed::tile]
+            else:
+                cells = self._tile(t_fixed * self.tiles_y + t)
+                part = cells[l_fixed * tile : (l_fixed + 1) * tile]
+            start = t * tile + 1
+            stop = min(start + tile, length + 1)
+            line[start:stop] = np.frombuffer(part, np.uint8)[: stop - start]
+        return line
+
+    def row(self, y):
+        """y행의 막힘 여부 배열 (grid[y]와 같이 1-based, 0번 칸은 막힘)"""
+        if not 1 <= y <= self.max_y:
+            raise IndexError("지도 밖 행입니다.")
+        return self._line(y, 0)
+
+    def column(self, x):
+        """x열의 막힘 여부 배열 (1-based, 0번 칸은 막힘)"""
+        if not 1 <= x <= self.max_x:
+            raise IndexError("지도 밖 열입니다.")
+        return self._line(x, 1)
+
+    def to_grid(self):
+        """1-based grid[y][x](1: 건설현장) 격자로 풉니다 (메모리에 올릴 수 있는 지도용)."""
+        tile = self.tile
+        free = np.unpackbits(self.bits, bitorder="little").reshape(
+            self.tiles_x, self.tiles_y, tile, tile
+        )
+        free = free.transpose(0, 2, 1, 3).reshape(
+            self.tiles_x * tile, self.tiles_y * tile
+        )
+        grid = np.full((self.max_y + 1, self.max_x + 1), BLOCKED, np.uint8)
+        grid[1:, 1:] = free[: self.max_x, : self.max_y].T ^ 1
+        return grid
+
+    def reset_stats(self):
+        """읽은 타일 기록을 지웁니다 (보관 중인 타일은 유지)."""
+        self.touched.clear()
+        self.tiles_read = 0
+
+    def flush(self):
+        self.bits.flush()
+
+    def close(self):
+        """변경 내용을 파일에 쓰고 메모리 매핑을 해제합니다."""
+        self.flush()
+        self._tiles.clear()
+        del self.bits
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _point(text):
+    try:
+        x, y = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'x,y' 형식이어야 합니다: {text!r}")
+    return (x, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="1비트 메모리 매핑 격자")
+    parser.add_argument("csv", help="병합 CSV (merged_data.csv)")
+    parser.add_argument("output", help="만들 비트 격자 파일")
+    parser.add_argument("--tile", type=int, default=DEFAULT_TILE)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--route",
+        nargs=2,
+        type=_point,
+        metavar="X,Y",
+        help="만든 격자에서 두 좌표 사이 경로를 찾음",
+    )
+    args = parser.parse_args()
+
+    with BitGrid.from_csv(
+        args.output, args.csv, args.tile, args.chunk_size
+    ) as grid:
+        size = os.path.getsize(args.output)
+        print(
+            f"{grid.max_x}x{grid.max_y} 비트 격자를 저장했습니다: "
+            f"{args.output} ({size / 2**20:.1f} MiB, 타일 {grid.tile})"
+        )
+        if not args.route:
+            return
+
+        start, goal = args.route
+        grid.reset_stats()
+        result = search(grid, start, goal)
+        if result.path is None:
+            print("경로를 찾을 수 없습니다.")
+        else:
+            print(f"경로 길이: {len(result.path)}단계")
+        print(
+            f"확장 노드: {result.expanded}, 읽은 타일: {len(grid.touched)}"
+            f"/{grid.tiles_x * grid.tiles_y}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,238 @@
+import argparse
+import glob
+import os
+import shutil
+from itertools import zip_longest
+
+import numpy as np
 import pandas as pd
 
+import profiling
+from area_index import (
+    AreaIndexBuilder,
+    partition_folder,
+    partition_path,
+    write_area_index,
+)
+from csv_ingest import StructTable, iter_table, read_source
+from map_cache import write_cache
+from profiling import add_profile_argument, stage
+
+DATA_FOLDER = os.path.join(os.path.dirname(__file__), "dataFile")
+PARTITION_FOLDER = partition_folder(DATA_FOLDER)
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def load_sources(data_folder=DATA_FOLDER):
+    """세 원본 CSV 파일을 스키마에 맞춰 불러옵니다 (csv_ingest)."""
+    map_df = read_source(data_folder, "area_map.csv")
+    struct_df = read_source(data_folder, "area_struct.csv")
+    cat_df = read_source(data_folder, "area_category.csv")
+    return map_df, struct_df, cat_df
+
+
+def merge_area_data(map_df, struct_df, cat_df):
+    """지도/구조물/카테고리 데이터를 하나로 병합합니다.
+
+    struct 컬럼은 area_category.csv 코드표의 Categorical이라 행마다 정수
+    코드만 저장하고, 구조물이 없는 칸은 결측입니다 (CSV에는 "None").
+    """
+    table = StructTable.from_frame(cat_df)
+    struct_df["struct"] = table.categorical(struct_df["category"].to_numpy())
+
+    merged = pd.merge(map_df, struct_df, on=["x", "y"], how="left")
+    return merged.sort_values("area", kind="stable")
+
+
+def stream_merge_area_data(
+    data_folder=DATA_FOLDER,
+    output_folder=PARTITION_FOLDER,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """원본 CSV를 청크 단위로 읽어 병합하고 area별 파티션 파일로 씁니다.
+
+    area_map.csv와 area_struct.csv는 같은 (x, y) 순서로 저장되어 있으므로
+    해시 조인 대신 같은 위치의 청크끼리 이어 붙이고 좌표가 같은지만
+    확인합니다. 한 번에 청크 하나만 메모리에 올리므로 지도 크기와 상관없이
+    최대 메모리 사용량이 일정합니다.
+
+    반환값: area별 통계를 누적한 AreaIndexBuilder
+    """
+    table = StructTable.load(data_folder)
+
+    _reset_partitions(output_folder)
+
+    map_reader = iter_table(
+        os.path.join(data_folder, "area_map.csv"), chunk_size
+    )
+    struct_reader = iter_table(
+        os.path.join(data_folder, "area_struct.csv"), chunk_size
+    )
+
+    builder = AreaIndexBuilder()
+    for map_chunk, struct_chunk in zip_longest(map_reader, struct_reader):
+        if (
+            map_chunk is None
+            or struct_chunk is None
+            or len(map_chunk) != len(struct_chunk)
+        ):
+            raise ValueError(
+                "area_map.csv와 area_struct.csv의 행 수가 다릅니다."
+            )
+        for column in ("x", "y"):
+            if not (
+                map_chunk[column].to_numpy() == struct_chunk[column].to_numpy()
+            ).all():
+                raise ValueError(
+                    "area_map.csv와 area_struct.csv의 좌표 순서가 다릅니다."
+                )
+
+        merged = map_chunk
+        merged["category"] = struct_chunk["category"].to_numpy()
+        merged["area"] = struct_chunk["area"].to_numpy()
+        merged["struct"] = table.categorical(merged["category"].to_numpy())
+
+        _append_partitions(merged, output_folder, builder)
+
+    return builder
+
+
+def _reset_partitions(output_folder):
+    os.makedirs(output_folder, exist_ok=True)
+    for old_partition in glob.glob(partition_path(output_folder, "*")):
+        os.remove(old_partition)
+
+
+def _append_partitions(merged, output_folder, builder):
+    """병합된 행들을 area별 파티션 파일 끝에 추가하고 통계를 누적합니다."""
+    for area, part in merged.groupby("area", sort=True):
+        part.to_csv(
+            partition_path(output_folder, area),
+            mode="a",
+            header=int(area) not in builder.areas,
+            index=False,
+            na_rep="None",
+        )
+    builder.add(merged)
+
+
+def write_partitions(merged, output_folder=PARTITION_FOLDER):
+    """메모리에 있는 병합 데이터를 area별 파티션 파일로 씁니다."""
+    _reset_partitions(output_folder)
+    builder = AreaIndexBuilder()
+    _append_partitions(merged, output_folder, builder)
+    return builder
+
+
+def concat_partitions(output_folder, areas, file_path):
+    """area 순서대로 파티션 파일을 이어 붙여 하나의 CSV로 만듭니다.
+
+    반환값: {area: (시작 바이트, 바이트 길이)} - 병합 CSV 안의 area별 위치
+    """
+    offsets = {}
+    with open(file_path, "wb") as out:
+        for i, area in enumerate(areas):
+            with open(partition_path(output_folder, area), "rb") as part:
+                header = part.readline()
+                if i == 0:
+                    out.write(header)
+                start = out.tell()
+                shutil.copyfileobj(part, out)
+                offsets[area] = (start, out.tell() - start)
+    return offsets
+
+
+def save_merged_outputs(
+    builder, output_folder=PARTITION_FOLDER, data_folder=DATA_FOLDER
+):
+    """파티션을 이어 붙여 merged_data.csv를 만들고 area 인덱스를 저장합니다."""
+    merged_path = os.path.join(data_folder, "merged_data.csv")
+    areas = builder.sorted_areas()
+    offsets = concat_partitions(output_folder, areas, merged_path)
+    write_area_index(
+        output_folder, builder, os.path.basename(merged_path), offsets
+    )
+    return areas
+
+
+def count_structs(file_path, table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV를 청크 단위로 읽어 구조물 종류별 개수를 셉니다.
+
+    category 번호 컬럼만 읽어 np.bincount로 세고 마지막에 코드표(table)로
+    이름을 붙입니다 (구조물이 없는 칸은 "None").
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    for chunk in iter_table(file_path, chunk_size, usecols=["category"]):
+        chunk_counts = np.bincount(chunk["category"].to_numpy())
+        size = max(counts.size, chunk_counts.size)
+        counts = np.pad(counts, (0, size - counts.size))
+        counts += np.pad(chunk_counts, (0, size - chunk_counts.size))
+    return table.summarize(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지역 데이터 통합")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="원본을 청크 단위로 읽어 area별 파티션으로 병합 (대용량 지도용)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="스트리밍 모드에서 한 번에 읽을 행 수",
+    )
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.enable(args.profile)
 
-map_df = pd.read_csv("dataFile/area_map.csv")
-struct_df = pd.read_csv("dataFile/area_struct.csv")
-cat_df = pd.read_csv("dataFile/area_category.csv")
+    if args.stream:
+        with stage("stream_merge", chunk_size=args.chunk_size):
+            builder = stream_merge_area_data(chunk_size=args.chunk_size)
+        with stage("save_outputs"):
+            areas = save_merged_outputs(builder)
+        print(f"area별 파티션 및 인덱스 저장 완료: {areas}")
 
+        if 1 in areas:
+            with stage(
+                "count_structs", "\n--- 구조물 종류별 요약 통계 (Area 1) ---"
+            ):
+                print(
+                    count_structs(
+                        partition_path(PARTITION_FOLDER, 1),
+                        StructTable.load(DATA_FOLDER),
+                        args.chunk_size,
+                    )
+                )
 
-cat_dict = cat_df.set_index("category")[" struct"].str.strip().to_dict()
-struct_df["struct"] = struct_df["category"].map(cat_dict).fillna("None")
+        print("\n병합된 데이터가 merged_data.csv로 저장되었습니다.")
+        return
 
+    with stage("load_sources"):
+        sources = load_sources()
+    with stage("merge"):
+        merged = merge_area_data(*sources)
 
-merged = pd.merge(map_df, struct_df, on=["x", "y"], how="left")
-merged = merged.sort_values("area")
+    area1 = merged[merged["area"] == 1]
+    print("--- Area 1 데이터 ---")
+    print(area1)
 
-area1 = merged[merged["area"] == 1]
-print("--- Area 1 데이터 ---")
-print(area1)
+    print("\n--- 구조물 종류별 요약 통계 (Area 1) ---")
+    table = StructTable.from_frame(sources[2])
+    summary = table.summarize(np.bincount(area1["category"].to_numpy()))
+    print(summary)
 
+    with stage("save_outputs"):
+        save_merged_outputs(write_partitions(merged))
+    print("\n병합된 데이터가 merged_data.csv로 저장되었습니다.")
+    print("area별 파티션과 인덱스가 merged_by_area/에 저장되었습니다.")
 
-print("\n--- 구조물 종류별 요약 통계 (Area 1) ---")
-summary = area1["struct"].value_counts()
-print(summary)
+    # 다음 실행부터 CSV 파싱 없이 불러올 수 있도록 바이너리 캐시도 저장
+    with stage("write_cache"):
+        write_cache(merged, DATA_FOLDER)
+    print("바이너리 캐시가 merged_data_cache/에 저장되었습니다.")
 
 
-merged.to_csv("dataFile/merged_data.csv", index=False)
-print("\n병합된 데이터가 merged_data.csv로 저장되었습니다.")
+if __name__ == "__main__":
+    main()
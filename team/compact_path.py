@@ -0,0 +1,225 @@
+import struct
+
+import numpy as np
+
+CSV_HEADER = b"step,x,y\r\n"
+# CSV를 한 번에 만들어 쓰는 행 수 (메모리 사용량 제한)
+CSV_CHUNK_ROWS = 1 << 16
+
+# 바이너리 경로 파일: 매직, stride, 셀 수 다음에 little-endian int32 셀 번호
+BINARY_MAGIC = b"PATH"
+_BINARY_HEADER = struct.Struct("<4sII")
+
+
+def _ascii_digits(values):
+    """음이 아닌 정수 배열을 (개수, 자릿수) ASCII 숫자 행렬로 바꿉니다.
+
+    앞자리 0은 0 바이트로 채우므로 나중에 0 바이트만 지우면 됩니다.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    width = len(str(int(values.max()))) if values.size else 1
+    digits = np.empty((values.size, width), dtype=np.uint8)
+    rest = values.copy()
+    for col in range(width - 1, -1, -1):
+        digits[:, col] = rest % 10 + ord("0")
+        rest //= 10
+
+    # 마지막 자리는 0이어도 남김
+    leading = np.ones(values.size, dtype=bool)
+    for col in range(width - 1):
+        leading &= digits[:, col] == ord("0")
+        digits[leading, col] = 0
+    return digits
+
+
+def _csv_rows(columns):
+    """정수 열들을 쉼표/CRLF로 이어 붙인 CSV 바이트로 한꺼번에 변환합니다.
+
+    csv.writer로 한 행씩 쓴 결과와 바이트 단위로 같습니다.
+    """
+    rows = len(columns[0])
+    parts = []
+    for i, column in enumerate(columns):
+        parts.append(_ascii_digits(column))
+        sep = b"," if i < len(columns) - 1 else b"\r\n"
+        parts.append(np.tile(np.frombuffer(sep, dtype=np.uint8), (rows, 1)))
+    table = np.hstack(parts)
+    return table[table != 0].tobytes()
+
+
+class Path:
+    """셀 번호(int32) 배열로 경로를 보관하는 좌표 시퀀스
+
+    (x, y) 튜플 리스트처럼 길이, 인덱싱, 반복, 뒤집기를 지원하지만 좌표 튜플
+    대신 셀 번호 배열 조각(segment)만 들고 있습니다 (칸당 4바이트).
+    구간 경로를 이어 붙이거나(concat) 뒤집을 때는 배열 view만 만들므로
+    복사가 없고, CSV/바이너리 저장도 조각에서 바로 씁니다.
+    셀 번호는 GridGraph와 같은 열 우선 번호(idx = x * stride + y)입니다.
+    """
+
+    __slots__ = ("stride", "segments", "_length")
+
+    def __init__(self, cells, stride):
+        """cells: 셀 번호 시퀀스 (array('i'), NumPy 배열 등 - 가능하면 복사 없음)"""
+        self.stride = int(stride)
+        cells = np.asarray(cells, dtype=np.int32)
+        self.segments = (cells,) if cells.size else ()
+        self._length = cells.size
+
+    @classmethod
+    def _from_segments(cls, segments, stride):
+        path = cls.__new__(cls)
+        path.stride = int(stride)
+        path.segments = tuple(seg for seg in segments if seg.size)
+        path._length = sum(seg.size for seg in path.segments)
+        return path
+
+    @classmethod
+    def from_coords(cls, coords, stride=None):
+        """(x, y) 좌표 시퀀스로 경로를 만듭니다.
+
+        stride가 없으면 좌표의 최대 y로 정합니다 (저장/출력 전용).
+        """
+        if isinstance(coords, cls):
+            return coords
+        points = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        if stride is None:
+            stride = int(points[:, 1].max()) + 2 if len(points) else 2
+        return cls(points[:, 0] * stride + points[:, 1], stride)
+
+    @classmethod
+    def concat(cls, paths):
+        """경로들을 순서대로 이어 붙입니다 (복사 없음).
+
+        앞 경로의 끝 칸과 다음 경로의 시작 칸이 같으면 한 번만 넣습니다
+        (순회 경로의 구간 연결).
+        """
+        segments = []
+        stride = None
+        last = None
+        for path in paths:
+            if stride is None:
+                stride = path.stride
+            elif path.stride != stride:
+                raise ValueError("stride가 다른 경로는 이을 수 없습니다.")
+            for seg in path.segments:
+                if last is not None and seg[0] == last:
+                    seg = seg[1:]
+                if seg.size:
+                    segments.append(seg)
+                    last = seg[-1]
+        return cls._from_segments(segments, stride or 2)
+
+    @property
+    def cells(self):
+        """전체 셀 번호 배열 (조각이 여러 개이면 한 번 합쳐서 보관)"""
+        if not self.segments:
+            return np.empty(0, dtype=np.int32)
+        if len(self.segments) > 1:
+            self.segments = (np.concatenate(self.segments),)
+        return self.segments[0]
+
+    @property
+    def xs(self):
+        return self.cells // self.stride
+
+    @property
+    def ys(self):
+        return self.cells % self.stride
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key == slice(None, None, -1):
+                # 뒤집기는 조각 순서와 조각마다 view만 뒤집음
+                return Path._from_segments(
+                    [seg[::-1] for seg in reversed(self.segments)],
+                    self.stride,
+                )
+            return Path(self.cells[key], self.stride)
+
+        i = key + self._length if key < 0 else key
+        if not 0 <= i < self._length:
+            raise IndexError("경로 인덱스가 범위를 벗어났습니다.")
+        for seg in self.segments:
+            if i < seg.size:
+                return divmod(int(seg[i]), self.stride)
+            i -= seg.size
+
+    def __iter__(self):
+        for seg in self.segments:
+            xs, ys = np.divmod(seg, self.stride)
+            yield from zip(xs.tolist(), ys.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, Path):
+            return self.stride == other.stride and np.array_equal(
+                self.cells, other.cells
+            )
+        try:
+            return list(self) == [tuple(pos) for pos in other]
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # 프로세스 간 전달 시 셀 번호 배열 하나만 보냄
+        return (Path, (self.cells, self.stride))
+
+    def __repr__(self):
+        return f"Path(len={self._length}, stride={self.stride})"
+
+    def tolist(self):
+        """(x, y) 튜플 리스트로 변환합니다."""
+        return list(self)
+
+    def write_csv(self, file):
+        """step,x,y 형식의 CSV로 저장합니다 (파일 경로 또는 바이너리 파일).
+
+        조각마다 CSV_CHUNK_ROWS 행씩 NumPy로 한꺼번에 숫자를 문자열로 바꿔
+        씁니다. 결과는 csv.writer로 한 행씩 쓴 것과 같습니다.
+        """
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            with open(file, "wb") as f:
+                return self.write_csv(f)
+
+        file.write(CSV_HEADER)
+        step = 1
+        for seg in self.segments:
+            for start in range(0, seg.size, CSV_CHUNK_ROWS):
+                chunk = seg[start : start + CSV_CHUNK_ROWS]
+                xs, ys = np.divmod(chunk, self.stride)
+                steps = np.arange(step, step + chunk.size)
+                file.write(_csv_rows((steps, xs, ys)))
+                step += chunk.size
+        return self._length
+
+    def write_binary(self, file):
+        """헤더(매직, stride, 셀 수)와 int32 셀 번호를 그대로 저장합니다."""
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            with open(file, "wb") as f:
+                return self.write_binary(f)
+
+        file.write(
+            _BINARY_HEADER.pack(BINARY_MAGIC, self.stride, self._length)
+        )
+        for seg in self.segments:
+            file.write(np.ascontiguousarray(seg, dtype="<i4"))
+        return self._length
+
+    @classmethod
+    def read_binary(cls, file):
+        """write_binary로 저장한 경로를 불러옵니다."""
+        with open(file, "rb") as f:
+            magic, stride, count = _BINARY_HEADER.unpack(
+                f.read(_BINARY_HEADER.size)
+            )
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"경로 파일 형식이 아닙니다: {file}")
+            cells = np.fromfile(f, dtype="<i4", count=count)
+        if cells.size != count:
+            raise ValueError(f"경로 파일이 잘렸습니다: {file}")
+        return cls(cells, stride)
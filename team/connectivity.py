@@ -0,0 +1,280 @@
+from collections import deque
+
+import numpy as np
+
+from grid_graph import PASSABLE, require_dense
+
+NO_COMPONENT = -1
+# 칸을 막을 때 요소가 나뉘는지 확인하는 국소 탐색의 최대 확장 칸 수
+# (넘으면 요소 전체를 NumPy로 다시 번호 매김)
+SPLIT_SEARCH_LIMIT = 8192
+
+# 칸을 둘러싼 8칸을 한 바퀴 도는 순서 (dx, dy) - 4방향 이웃은 짝수 번째
+_RING = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+
+def _compress(parent):
+    """모든 부모 포인터가 루트를 가리킬 때까지 건너뛰기(pointer jumping)"""
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(parent, grandparent):
+            return
+        parent[:] = grandparent
+
+
+def _link(parent, a, b):
+    """노드 쌍 (a, b)가 모두 같은 루트를 가리킬 때까지 합칩니다.
+
+    매 단계 번호가 큰 루트를 작은 루트에 붙이고(hooking) 경로를 압축하는
+    NumPy 병렬 union-find이므로, 파이썬 반복은 보통 수 번에 끝납니다.
+    끝나면 parent는 노드별 요소 루트(요소에서 가장 작은 노드 번호)입니다.
+    """
+    while a.size:
+        ra = parent[a]
+        rb = parent[b]
+        differ = ra != rb
+        if not differ.any():
+            return
+        # 이미 합쳐진 쌍은 다시 볼 필요 없음
+        a, b, ra, rb = a[differ], b[differ], ra[differ], rb[differ]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        _compress(parent)
+
+
+def label_components(graph, inside=None):
+    """지나갈 수 있는 칸을 4방향 연결 요소별로 번호 매깁니다.
+
+    요소 번호는 요소에서 가장 작은 셀 번호이고, 건설현장/테두리는 -1입니다.
+    8방향 이동도 두 모서리 칸이 모두 비어 있어야 하므로 연결 관계는 같고,
+    칸별 비용은 연결 여부와 무관합니다.
+    inside(셀별 bool 배열)를 주면 그 칸들만 번호 매깁니다.
+
+    셀 번호가 열 우선이므로 한 열 안의 연속된 빈 칸(run)은 셀 번호도
+    연속입니다. run마다 번호를 매긴 뒤 옆 열과 맞닿은 run 쌍만 합치므로
+    union-find 노드와 간선 수가 칸 수보다 훨씬 적습니다.
+    """
+    require_dense(graph, "연결 요소 색인")
+    if inside is None:
+        inside = graph.cells == PASSABLE
+    labels = np.full(graph.size, NO_COMPONENT, dtype=np.int32)
+    cells = np.flatnonzero(inside)
+    if not cells.size:
+        return labels
+
+    # 테두리가 막혀 있으므로 run은 열 경계를 넘지 않음
+    starts = np.ones(cells.size, dtype=bool)
+    starts[1:] = cells[1:] != cells[:-1] + 1
+    run = np.cumsum(starts) - 1
+    run_start = cells[starts]
+
+    run_of = np.zeros(graph.size, dtype=np.int64)
+    run_of[cells] = run
+    left = cells[inside[cells + graph.stride]]
+    a = run_of[left]
+    b = run_of[left + graph.stride]
+    # 맞닿은 run 쌍은 연속해서 반복되므로 바로 앞과 같은 쌍만 걸러 냄
+    distinct = np.ones(a.size, dtype=bool)
+    distinct[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1])
+
+    parent = np.arange(run_start.size)
+    _link(parent, a[distinct], b[distinct])
+    # run 번호도 셀 번호 순이므로 루트 run의 첫 칸이 요소의 가장 작은 셀 번호
+    labels[cells] = run_start[parent[run]]
+    return labels
+
+
+class ConnectivityIndex:
+    """격자의 연결 요소 번호로 두 칸의 도달 가능 여부를 O(1)에 답하는 색인
+
+    건설현장으로 막힌 카페나 구조물은 탐색을 시작하기 전에 걸러낼 수
+    있습니다 (A*는 도달할 수 없는 목표를 만나면 연결된 영역 전체를 확장함).
+    set_blocked로 칸을 막거나 열면 번호를 점진적으로 고칩니다.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.labels = label_components(graph)
+        self.relabeled = 0  # 칸을 막아 요소를 다시 번호 매긴 횟수
+
+    def component(self, pos):
+        """해당 좌표의 요소 번호 (지도 밖/건설현장: -1)"""
+        if not self.graph.is_passable(pos):
+            return NO_COMPONENT
+        return int(self.labels[self.graph.index(pos)])
+
+    def connected(self, a, b):
+        """두 좌표가 같은 연결 요소에 있는지 확인합니다."""
+        component = self.component(a)
+        return component != NO_COMPONENT and component == self.component(b)
+
+    def connected_cells(self, start, goals):
+        """셀 번호 start가 셀 번호 goals 중 하나와 같은 요소에 있는지 확인합니다."""
+        component = self.labels[start]
+        if component == NO_COMPONENT:
+            return False
+        return any(self.labels[goal] == component for goal in goals)
+
+    def reachable(self, start, goals):
+        """goals 중 start에서 도달할 수 있는 좌표만 순서대로 반환합니다."""
+        component = self.component(start)
+        if component == NO_COMPONENT:
+            return []
+        return [goal for goal in goals if self.component(goal) == component]
+
+    def all_connected(self, points):
+        """모든 좌표가 하나의 연결 요소에 있는지 확인합니다 (순회 가능 여부)."""
+        points = list(points)
+        if not points:
+            return True
+        return len(self.reachable(points[0], points)) == len(points)
+
+    def component_count(self):
+        """연결 요소 수"""
+        roots = self.labels == np.arange(self.graph.size)
+        return int(np.count_nonzero(roots))
+
+    def set_blocked(self, pos, blocked=True):
+        """칸의 건설현장 여부를 바꾸고 요소 번호를 고칩니다.
+
+        반환값: 상태가 바뀌었으면 True
+        """
+        graph = self.graph
+        if bool(graph.cells[graph.index(pos)]) == bool(blocked):
+            return False
+        graph.set_blocked(pos, blocked)
+        self.update_cells([pos])
+        return True
+
+    def update_cells(self, positions):
+        """격자에서 이미 바뀐 칸들을 요소 번호에 반영합니다.
+
+        칸이 열렸으면 이웃 요소들을 하나로 합치고, 막혔으면 그 칸이 속했던
+        요소에서 떨어져 나간 영역만 찾아 번호를 바꿉니다 (주변 8칸으로
+        우회 가능하면 생략). 반환값: 반영한 칸 수
+        """
+        changed = 0
+        for pos in positions:
+            idx = self.graph.index(pos)
+            passable = self.graph.cells[idx] == PASSABLE
+            if passable == (self.labels[idx] != NO_COMPONENT):
+                continue
+            if passable:
+                self._unblock(idx)
+            else:
+                self._block(idx)
+            changed += 1
+        return changed
+
+    def _neighbor_labels(self, idx):
+        return {
+            int(self.labels[idx + offset])
+            for offset in self.graph.offsets
+            if self.labels[idx + offset] != NO_COMPONENT
+        }
+
+    def _unblock(self, idx):
+        merged = self._neighbor_labels(idx)
+        target = min(merged | {idx})
+        self.labels[idx] = target
+        others = sorted(merged - {target})
+        if others:
+            self.labels[np.isin(self.labels, others)] = target
+
+    def _ring_seeds(self, idx):
+        """막힌 칸의 4방향 이웃 중 주변 8칸으로 서로 이어진 묶음마다 하나씩"""
+        stride = self.graph.stride
+        ring = [idx + dx * stride + dy for dx, dy in _RING]
+        free = [self.labels[cell] != NO_COMPONENT for cell in ring]
+        # 앞의 모서리와 4방향 이웃이 모두 비어 있으면 같은 묶음으로 이어짐
+        return [
+            ring[i]
+            for i in range(0, 8, 2)
+            if free[i] and not (free[i - 1] and free[i - 2])
+        ]
+
+    def _split_pockets(self, seeds):
+        """seeds에서 동시에 넓혀 가며 떨어져 나간 영역을 찾습니다.
+
+        다른 묶음과 만나면 하나로 합치고, 만나지 못한 채 더 넓힐 칸이 없는
+        묶음은 새 요소가 됩니다. 묶음이 하나만 남으면 끝나므로 작은 쪽
+        영역 크기만큼만 탐색합니다.
+        반환값: 떨어져 나간 영역(셀 번호 set) 리스트, 예산 초과: None
+        """
+        labels = self.labels
+        offsets = self.graph.offsets
+        owner = {seed: i for i, seed in enumerate(seeds)}
+        group = list(range(len(seeds)))
+        queues = [deque([seed]) for seed in seeds]
+        regions = [{seed} for seed in seeds]
+        active = set(group)
+        pockets = []
+        budget = SPLIT_SEARCH_LIMIT
+
+        def find(i):
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+
+        while len(active) > 1:
+            for g in sorted(active):
+                if g not in active:
+                    continue
+                if not queues[g]:
+                    active.discard(g)
+                    pockets.append(regions[g])
+                    continue
+                budget -= 1
+                if budget < 0:
+                    return None
+                cell = queues[g].popleft()
+                for offset in offsets:
+                    neighbor = cell + offset
+                    if labels[neighbor] == NO_COMPONENT:
+                        continue
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = g
+                        regions[g].add(neighbor)
+                        queues[g].append(neighbor)
+                        continue
+                    other = find(other)
+                    if other == g:
+                        continue
+                    # 작은 묶음을 큰 묶음에 합침
+                    if len(regions[g]) < len(regions[other]):
+                        g, other = other, g
+                    group[other] = g
+                    regions[g] |= regions[other]
+                    queues[g].extend(queues[other])
+                    active.discard(other)
+        return pockets
+
+    def _block(self, idx):
+        old = int(self.labels[idx])
+        self.labels[idx] = NO_COMPONENT
+        seeds = self._ring_seeds(idx)
+        pockets = self._split_pockets(seeds) if len(seeds) > 1 else []
+        if pockets is None:
+            # 우회로가 멀어 예산을 넘으면 요소 전체를 다시 번호 매김
+            inside = self.labels == old
+            self.labels[inside] = label_components(self.graph, inside)[inside]
+            self.relabeled += 1
+            return
+
+        # 떨어져 나간 영역은 그 안의 가장 작은 셀 번호로 번호 매김
+        moved = None
+        for pocket in pockets:
+            cells = np.fromiter(pocket, dtype=np.intp, count=len(pocket))
+            self.labels[cells] = cells.min()
+            if old in pocket:
+                moved = cells
+        self.relabeled += len(pockets)
+
+        # 요소 번호였던 칸이 막혔거나 떨어져 나갔으면 남은 칸의 번호를 교체
+        if old == idx or moved is not None:
+            rest = np.flatnonzero(self.labels == old)
+            if moved is not None:
+                rest = rest[~np.isin(rest, moved)]
+            if rest.size:
+                self.labels[rest] = rest[0]
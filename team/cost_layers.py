@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from csv_ingest import APARTMENT, BUILDING, StructTable
+from grid_builder import build_grid_layers
+
+# area별 이동 비용 배수 (목록에 없는 area: 1.0)
+DEFAULT_AREA_COSTS = {}
+# 구조물 이름별 칸 이동 비용 배수 (아파트/빌딩 단지는 돌아서 지나가야 해서 느림)
+DEFAULT_CATEGORY_COSTS = {APARTMENT: 2.0, BUILDING: 2.0}
+
+
+def _lookup(codes, multipliers):
+    """정수 코드 배열을 코드별 배수로 바꿉니다 (목록에 없는 코드: 1.0)."""
+    if not multipliers:
+        return np.ones(codes.shape, dtype=np.float32)
+    size = max(int(codes.max()), max(multipliers)) + 1
+    table = np.ones(size, dtype=np.float32)
+    for code, multiplier in multipliers.items():
+        table[code] = multiplier
+    return table[codes]
+
+
+def _category_multipliers(category_costs, table):
+    """구조물 이름 키를 코드표의 카테고리 번호로 바꿉니다 (번호 키는 그대로).
+
+    코드표에 없는 이름은 지도에 없는 종류이므로 건너뜁니다.
+    """
+    multipliers = {}
+    for key, multiplier in category_costs.items():
+        code = table.code(key) if isinstance(key, str) else key
+        if code is not None:
+            multipliers[int(code)] = multiplier
+    return multipliers
+
+
+def congestion_grid(congestion, max_x, max_y):
+    """x, y, congestion 컬럼의 혼잡도 데이터를 1-based [y, x] 격자로 만듭니다.
+
+    같은 칸이 여러 번 나오면 더하고, 지도 밖 좌표는 무시합니다.
+    """
+    grid = np.zeros((max_y + 1, max_x + 1), dtype=np.float32)
+    xs = congestion["x"].to_numpy(dtype=np.intp)
+    ys = congestion["y"].to_numpy(dtype=np.intp)
+    values = congestion["congestion"].to_numpy(dtype=np.float32)
+    inside = (1 <= xs) & (xs <= max_x) & (1 <= ys) & (ys <= max_y)
+    np.add.at(grid, (ys[inside], xs[inside]), values[inside])
+    return grid
+
+
+def build_cost_grid(
+    layers,
+    area_costs=None,
+    category_costs=None,
+    congestion=None,
+    base_cost=1.0,
+    table=None,
+):
+    """격자 레이어로 칸별 이동 비용 격자(float32, 1-based [y, x])를 만듭니다.
+
+    비용 = base_cost × area 배수 × 구조물 배수 + 혼잡도
+    건설현장 여부는 GridGraph가 따로 관리하므로 비용에는 넣지 않습니다
+    (건설현장이 사라져도 비용 격자를 다시 만들 필요 없음).
+    congestion: 같은 모양의 배열 또는 x, y, congestion 컬럼의 DataFrame
+    category_costs의 키는 구조물 이름이나 카테고리 번호이고, 이름은
+    table(area_category.csv의 StructTable)로 번호를 찾습니다.
+    """
+    if area_costs is None:
+        area_costs = DEFAULT_AREA_COSTS
+    if category_costs is None:
+        category_costs = DEFAULT_CATEGORY_COSTS
+    if table is None:
+        table = StructTable.default()
+
+    costs = np.float32(base_cost) * _lookup(layers.area, area_costs)
+    costs *= _lookup(
+        layers.category, _category_multipliers(category_costs, table)
+    )
+    if congestion is not None:
+        if isinstance(congestion, pd.DataFrame):
+            congestion = congestion_grid(
+                congestion, layers.max_x, layers.max_y
+            )
+        costs += np.asarray(congestion, dtype=np.float32)
+    if (costs[1:, 1:] <= 0).any():
+        raise ValueError("이동 비용은 0보다 커야 합니다.")
+    return costs
+
+
+def cost_grid_from_frame(df, **options):
+    """병합 데이터에서 바로 칸별 이동 비용 격자를 만듭니다."""
+    return build_cost_grid(build_grid_layers(df), **options)
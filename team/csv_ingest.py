@@ -0,0 +1,327 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pyarrow import csv as pa_csv
+    import pyarrow as pa
+except ImportError:  # 선택 의존성: 없으면 pandas C 파서 사용
+    pa_csv = None
+    pa = None
+
+# 파일별 컬럼 자료형 (정규화한 헤더 이름 기준)
+# 좌표는 int16(지도 한 변 32767칸까지), 플래그/카테고리 번호는 uint8,
+# 구조물 이름은 종류가 몇 개뿐이므로 category
+MAP_SCHEMA = {"x": "int16", "y": "int16", "ConstructionSite": "uint8"}
+STRUCT_SCHEMA = {
+    "x": "int16",
+    "y": "int16",
+    "category": "uint8",
+    "area": "int16",
+}
+CATEGORY_SCHEMA = {"category": "uint8", "struct": "category"}
+MERGED_SCHEMA = {
+    "x": "int16",
+    "y": "int16",
+    "ConstructionSite": "uint8",
+    "category": "uint8",
+    "area": "int16",
+    "struct": "category",
+}
+SCHEMAS = {
+    "area_map.csv": MAP_SCHEMA,
+    "area_struct.csv": STRUCT_SCHEMA,
+    "area_category.csv": CATEGORY_SCHEMA,
+    "merged_data.csv": MERGED_SCHEMA,
+}
+
+# 프로그램이 역할로 찾는 구조물 이름. 카테고리 번호는 항상
+# area_category.csv(StructTable)에서 이름으로 찾습니다.
+APARTMENT = "Apartment"
+BUILDING = "Building"
+MY_HOME = "MyHome"
+BANDALGOM_COFFEE = "BandalgomCoffee"
+# area_category.csv가 없을 때만 쓰는 기본 코드표 (원본 파일과 같은 번호)
+DEFAULT_CATEGORIES = {
+    1: APARTMENT,
+    2: BUILDING,
+    3: MY_HOME,
+    4: BANDALGOM_COFFEE,
+}
+
+# pandas read_csv 기본값과 같이 결측값으로 읽을 문자열 ("None" 포함)
+NULL_VALUES = ("", "None", "NA", "N/A", "n/a", "NaN", "nan", "null", "NULL")
+
+ENGINES = ("pyarrow", "c")
+DEFAULT_ENGINE = "pyarrow" if pa_csv is not None else "c"
+
+_ARROW_TYPES = {
+    "int16": "int16",
+    "uint8": "uint8",
+    "category": "dictionary",
+}
+
+
+def normalize_header(name):
+    """헤더 이름에서 UTF-8 BOM과 앞뒤 공백을 지웁니다 (' struct' → 'struct')."""
+    return name.replace("\ufeff", "").strip()
+
+
+def read_header(source):
+    """CSV 첫 줄의 원래 헤더 이름 목록 (파일 경로 또는 바이너리 버퍼)"""
+    if hasattr(source, "readline"):
+        position = source.tell()
+        line = source.readline()
+        source.seek(position)
+    else:
+        with open(source, "rb") as f:
+            line = f.readline()
+    if isinstance(line, bytes):
+        line = line.decode("utf-8-sig")
+    return line.rstrip("\r\n").split(",")
+
+
+def schema_for(source):
+    """파일 이름으로 스키마를 찾습니다 (area 파티션은 병합 데이터 스키마)."""
+    if hasattr(source, "readline"):
+        return MERGED_SCHEMA
+    name = os.path.basename(source)
+    return SCHEMAS.get(name, MERGED_SCHEMA)
+
+
+def _columns(source, usecols):
+    """정규화한 헤더 이름 목록과 읽을 컬럼 목록 (파일 순서)"""
+    names = [normalize_header(name) for name in read_header(source)]
+    if usecols is None:
+        return names, names
+    missing = [name for name in usecols if name not in names]
+    if missing:
+        raise ValueError(f"CSV에 없는 컬럼입니다: {missing}")
+    return names, [name for name in names if name in usecols]
+
+
+def _strip_categories(df, schema):
+    """category 컬럼으로 바꾸고 값의 앞뒤 공백을 지웁니다 (' Apartment')."""
+    for column, dtype in schema.items():
+        if dtype != "category" or column not in df:
+            continue
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+        categories = df[column].cat.categories
+        stripped = categories.str.strip()
+        if not stripped.equals(categories):
+            df[column] = df[column].cat.rename_categories(stripped)
+    return df
+
+
+def _parser_dtypes(columns, schema):
+    # C 파서는 내부 청크마다 category를 만든 뒤 합치는데, 값이 모두 결측인
+    # 청크가 섞이면 카테고리 자료형이 달라 합칠 수 없으므로 문자열로 읽고
+    # _strip_categories에서 category로 바꿈
+    return {
+        name: "str" if schema[name] == "category" else schema[name]
+        for name in columns
+        if name in schema
+    }
+
+
+def _read_pandas(source, names, columns, schema, chunksize=None):
+    # 원래 헤더 대신 정규화한 이름을 쓰므로 BOM/공백이 있어도 같은 이름
+    reader = pd.read_csv(
+        source,
+        header=0,
+        names=names,
+        usecols=columns,
+        dtype=_parser_dtypes(columns, schema),
+        skipinitialspace=True,
+        chunksize=chunksize,
+    )
+    if chunksize is None:
+        return _strip_categories(reader, schema)
+    return (_strip_categories(chunk, schema) for chunk in reader)
+
+
+def _read_arrow(source, names, columns, schema):
+    """pyarrow 멀티스레드 CSV 파서로 읽어 DataFrame으로 변환합니다."""
+    column_types = {}
+    for name in columns:
+        kind = _ARROW_TYPES.get(schema.get(name))
+        if kind == "dictionary":
+            column_types[name] = pa.dictionary(pa.int32(), pa.string())
+        elif kind is not None:
+            column_types[name] = getattr(pa, kind)()
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(
+            use_threads=True, column_names=names, skip_rows=1
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            include_columns=columns,
+            null_values=list(NULL_VALUES),
+            strings_can_be_null=True,
+        ),
+    )
+    return _strip_categories(table.to_pandas(), schema)
+
+
+def read_table(source, schema=None, usecols=None, engine=None):
+    """스키마에 맞춰 CSV를 읽습니다 (헤더 정규화, 작은 자료형, 필요한 컬럼만).
+
+    source: 파일 경로 또는 바이너리 버퍼
+    schema: {컬럼: 자료형} - 없으면 파일 이름으로 고름 (SCHEMAS)
+    usecols: 읽을 컬럼 (정규화한 이름) - 없으면 전체
+    engine: "pyarrow"(설치된 경우 기본, 멀티스레드) 또는 "c"(pandas)
+    컬럼 이름은 BOM/공백을 지운 이름으로, 자료형은 스키마대로 반환합니다.
+    """
+    if schema is None:
+        schema = schema_for(source)
+    engine = engine or DEFAULT_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"지원하지 않는 CSV 엔진입니다: {engine}")
+    if engine == "pyarrow" and pa_csv is None:
+        raise ImportError("pyarrow가 설치되어 있지 않습니다.")
+
+    names, columns = _columns(source, usecols)
+    if engine == "pyarrow":
+        return _read_arrow(source, names, columns, schema)
+    return _read_pandas(source, names, columns, schema)
+
+
+def iter_table(source, chunksize, schema=None, usecols=None):
+    """read_table과 같은 규칙으로 chunksize 행씩 DataFrame을 돌려줍니다.
+
+    한 번에 청크 하나만 메모리에 두는 스트리밍 병합용이라 pandas C 파서를
+    사용합니다.
+    """
+    if schema is None:
+        schema = schema_for(source)
+    names, columns = _columns(source, usecols)
+    return _read_pandas(source, names, columns, schema, chunksize)
+
+
+def read_source(data_folder, name, usecols=None, engine=None):
+    """dataFile 폴더의 원본/병합 CSV 하나를 스키마에 맞춰 읽습니다."""
+    return read_table(
+        os.path.join(data_folder, name), SCHEMAS[name], usecols, engine
+    )
+
+
+def read_merged(source, table, usecols=None, engine=None):
+    """병합/파티션 CSV를 읽되 struct 컬럼은 category 번호로 만듭니다.
+
+    struct는 category 번호에서 정해지는 값이므로 문자열을 파싱하지 않고
+    코드표(table)로 정수 코드만 채웁니다. source: 파일 경로 또는 바이너리 버퍼
+    """
+    names = [normalize_header(name) for name in read_header(source)]
+    wanted = names if usecols is None else [n for n in names if n in usecols]
+    if "struct" not in wanted or "category" not in names:
+        return read_table(source, MERGED_SCHEMA, wanted, engine)
+
+    columns = [n for n in names if n == "category" or n in wanted]
+    columns.remove("struct")
+    df = read_table(source, MERGED_SCHEMA, columns, engine)
+    df["struct"] = table.categorical(df["category"].to_numpy())
+    return df[wanted]
+
+
+class StructTable:
+    """카테고리 번호 ↔ 구조물 이름 공용 코드표 (area_category.csv 기준)
+
+    struct 컬럼은 이 표의 CategoricalDtype(카테고리 번호 순 이름 목록)을
+    쓰므로 이름 문자열은 표에 한 번만 있고 행마다 int8 코드만 남습니다.
+    구조물이 없는 칸(카테고리 0)과 표에 없는 번호는 결측(코드 -1)입니다.
+    다른 모듈은 카테고리 번호를 직접 쓰지 않고 code(MY_HOME)처럼 이름으로
+    찾으므로, 번호를 바꾸거나 종류를 더한 CSV도 그대로 읽습니다.
+    """
+
+    def __init__(self, names):
+        """names: {카테고리 번호: 구조물 이름}"""
+        self.names = {
+            int(code): str(name).strip()
+            for code, name in sorted(names.items())
+        }
+        self.dtype = pd.CategoricalDtype(list(self.names.values()))
+        self._codes = np.full(max(self.names, default=0) + 1, -1, np.int16)
+        for code, category in enumerate(self.names):
+            self._codes[category] = code
+        self._by_name = {name: code for code, name in self.names.items()}
+
+    @classmethod
+    def from_frame(cls, cat_df):
+        """area_category.csv DataFrame으로 코드표를 만듭니다."""
+        return cls(
+            dict(zip(cat_df["category"].tolist(), cat_df["struct"].tolist()))
+        )
+
+    @classmethod
+    def load(cls, data_folder):
+        """dataFile 폴더의 area_category.csv로 코드표를 만듭니다.
+
+        파일이 없으면 기본 코드표(DEFAULT_CATEGORIES)를 씁니다.
+        """
+        file_path = os.path.join(data_folder, "area_category.csv")
+        if not os.path.exists(file_path):
+            return cls.default()
+        return cls.from_frame(read_table(file_path, CATEGORY_SCHEMA))
+
+    @classmethod
+    def default(cls):
+        """원본 area_category.csv와 같은 기본 코드표를 만듭니다."""
+        return cls(DEFAULT_CATEGORIES)
+
+    def code(self, name):
+        """구조물 이름의 카테고리 번호를 반환합니다 (표에 없으면 None)."""
+        return self._by_name.get(str(name).strip())
+
+    def categories_of(self, names):
+        """구조물 이름 목록을 카테고리 번호 배열로 바꿉니다 (표에 없으면 0)."""
+        by_name = self._by_name
+        return np.array(
+            [
+                by_name.get(name.strip(), 0) if isinstance(name, str) else 0
+                for name in names
+            ],
+            dtype=np.int64,
+        )
+
+    def codes(self, category):
+        """카테고리 번호 배열을 struct 코드 배열로 바꿉니다 (없으면 -1)."""
+        category = np.asarray(category, dtype=np.intp)
+        known = (category >= 0) & (category < self._codes.size)
+        return np.where(
+            known, self._codes[np.where(known, category, 0)], -1
+        ).astype(np.int16)
+
+    def categorical(self, category):
+        """카테고리 번호 배열로 struct 컬럼(Categorical)을 만듭니다."""
+        return pd.Categorical.from_codes(
+            self.codes(category), dtype=self.dtype
+        )
+
+    def apply(self, df):
+        """df의 struct 컬럼을 코드표 자료형으로 맞춥니다 (없으면 만듦)."""
+        if "struct" in df:
+            df["struct"] = df["struct"].astype(self.dtype)
+        elif "category" in df:
+            df["struct"] = self.categorical(df["category"].to_numpy())
+        return df
+
+    def summarize(self, counts):
+        """카테고리 번호별 개수(np.bincount 결과)를 이름별 개수로 바꿉니다.
+
+        구조물이 없는 칸과 표에 없는 번호는 "None"으로 셉니다.
+        """
+        labels = [self.names.get(code, "None") for code in range(len(counts))]
+        summary = (
+            pd.Series(np.asarray(counts, dtype=np.int64), index=labels)
+            .groupby(level=0, sort=False)
+            .sum()
+        )
+        summary = summary[summary > 0].sort_values(
+            ascending=False, kind="stable"
+        )
+        summary.index.name = "struct"
+        summary.name = "count"
+        return summary
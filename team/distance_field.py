@@ -0,0 +1,258 @@
+import heapq
+from array import array
+
+import numpy as np
+
+import profiling
+from compact_path import Path
+from grid_graph import require_dense
+
+UNREACHABLE = -1
+
+
+def _distance_dtype(graph):
+    """격자 크기에 맞는 가장 작은 거리 배열 자료형을 고릅니다."""
+    return np.int16 if graph.size < np.iinfo(np.int16).max else np.int32
+
+
+def multi_source_bfs(graph, sources):
+    """여러 출발점에서 동시에 BFS를 수행해 모든 셀까지의 최단 거리를 구합니다.
+
+    단위 비용 4방향 격자이므로 BFS 한 번으로 정확한 거리를 얻습니다.
+    레벨 단위로 현재 경계(frontier)의 이웃을 NumPy로 한꺼번에 펼쳐서
+    파이썬 반복은 BFS 깊이만큼만 일어납니다.
+
+    반환값:
+        dist   - 셀별 최단 거리 (도달 불가: -1)
+        parent - 셀별 직전 이동 방향 번호 (graph.offsets의 인덱스, 출발점: -1)
+        label  - 셀별 가장 가까운 출발점의 sources 인덱스 (도달 불가: -1)
+    """
+    dist = np.full(graph.size, UNREACHABLE, dtype=_distance_dtype(graph))
+    parent = np.full(graph.size, -1, dtype=np.int8)
+    label = np.full(graph.size, -1, dtype=np.int32)
+
+    passable = graph.cells == 0
+    offsets = np.asarray(graph.offsets, dtype=np.intp)
+
+    frontier = []
+    for i, pos in enumerate(sources):
+        idx = graph.index(pos)
+        if dist[idx] == UNREACHABLE:
+            dist[idx] = 0
+            label[idx] = i
+            frontier.append(idx)
+    frontier = np.asarray(sorted(frontier), dtype=np.intp)
+
+    reached = frontier.size
+    max_frontier = frontier.size
+    level = 0
+    while frontier.size:
+        level += 1
+        neighbors = (frontier[:, None] + offsets).ravel()
+        valid = passable[neighbors] & (dist[neighbors] == UNREACHABLE)
+        candidates = neighbors[valid]
+        if not candidates.size:
+            break
+
+        # 같은 셀에 여러 경로로 도달하면 번호가 가장 작은 경계 셀을 부모로 선택
+        new_cells, first = np.unique(candidates, return_index=True)
+        origin = np.flatnonzero(valid)[first]
+
+        dist[new_cells] = level
+        parent[new_cells] = origin % len(offsets)
+        label[new_cells] = label[frontier[origin // len(offsets)]]
+        frontier = new_cells
+        reached += frontier.size
+        max_frontier = max(max_frontier, frontier.size)
+
+    # BFS는 도달한 칸마다 한 번씩 경계에 넣고 확장함
+    profiling.record_search("bfs", reached, reached, max_frontier)
+    return dist, parent, label
+
+
+def multi_source_dijkstra(graph, sources):
+    """칸별 비용이나 8방향 이동이 있는 격자에서 다중 출발점 Dijkstra를 수행합니다.
+
+    반환값은 multi_source_bfs와 같고 거리만 float64입니다 (도달 불가: -1).
+    parent는 graph.moves()의 인덱스입니다. 이동 비용이 양방향으로 같으므로
+    출발점을 도착점으로 바꿔 써도 거리가 같습니다.
+
+    힙 대신 폭이 가장 작은 이동 비용인 버킷 큐(Dial)를 씁니다. 한 버킷의
+    칸에서 나가는 이동은 항상 다음 버킷 이후로 가므로 버킷에 든 칸의 거리는
+    이미 확정된 값이고, multi_source_bfs처럼 버킷 하나를 NumPy로 한꺼번에
+    펼칩니다. 비어 있는 버킷은 건너뛰므로 파이썬 반복은 버킷 수만큼입니다.
+    """
+    dist = np.full(graph.size, np.inf)
+    parent = np.full(graph.size, -1, dtype=np.int8)
+    label = np.full(graph.size, -1, dtype=np.int32)
+
+    passable = graph.cells == 0
+    done = np.zeros(graph.size, dtype=bool)
+    moves = graph.moves()
+    offsets = np.array([move[0] for move in moves], dtype=np.intp)
+    lengths = np.array([move[1] for move in moves])
+    corners = np.array([move[2:] for move in moves], dtype=np.intp)
+    diagonal = corners[:, 0] != 0
+    # 두 칸 비용의 평균을 절반끼리 더해 계산 (힙 Dijkstra와 같은 float64 값)
+    half = None
+    if graph.costs is not None:
+        half = graph.costs.astype(np.float64) * 0.5
+    width = graph.min_cost
+
+    buckets = {}
+    seeds = []
+    for i, pos in enumerate(sources):
+        idx = graph.index(pos)
+        if dist[idx] != 0.0:
+            dist[idx] = 0.0
+            label[idx] = i
+            seeds.append(idx)
+    if seeds:
+        buckets[0] = [np.asarray(seeds, dtype=np.intp)]
+    order = list(buckets)
+
+    reached = 0
+    pushes = len(seeds)
+    max_open = len(seeds)
+    while order:
+        bucket = heapq.heappop(order)
+        parts = buckets.pop(bucket)
+        frontier = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        # 더 앞 버킷에서 이미 확정된 칸(거리가 줄어 옮겨 간 칸)과 중복은 제외
+        frontier = np.sort(frontier[~done[frontier]])
+        if frontier.size > 1:
+            frontier = frontier[np.r_[True, frontier[1:] != frontier[:-1]]]
+        if not frontier.size:
+            continue
+        done[frontier] = True
+        reached += frontier.size
+        max_open = max(max_open, frontier.size)
+
+        neighbors = (frontier[:, None] + offsets).ravel()
+        valid = passable[neighbors] & ~done[neighbors]
+        if diagonal.any():
+            corner_a = (frontier[:, None] + corners[:, 0]).ravel()
+            corner_b = (frontier[:, None] + corners[:, 1]).ravel()
+            blocked = ~(passable[corner_a] & passable[corner_b])
+            valid &= ~(np.tile(diagonal, frontier.size) & blocked)
+        candidates = np.flatnonzero(valid)
+        if not candidates.size:
+            continue
+        origin = frontier[candidates // len(moves)]
+        step = candidates % len(moves)
+        targets = neighbors[candidates]
+        if half is None:
+            nd = dist[origin] + lengths[step]
+        else:
+            nd = dist[origin] + lengths[step] * (half[origin] + half[targets])
+
+        # 칸마다 가장 짧은 후보만 남김. 같은 거리의 후보가 여럿이면 뒤집어
+        # 대입해 번호가 가장 작은 경계 칸이 부모가 됨 (마지막 대입이 남음)
+        before = dist[targets]
+        np.minimum.at(dist, targets, nd)
+        best = np.flatnonzero((nd < before) & (nd == dist[targets]))[::-1]
+        if not best.size:
+            continue
+        targets, nd = targets[best], nd[best]
+        parent[targets] = step[best]
+        label[targets] = label[origin[best]]
+        pushes += best.size
+
+        # 이동 비용은 width 이상이므로 다음 버킷 이후에 들어감 (반올림 보정)
+        slots = np.maximum((nd // width).astype(np.int64), bucket + 1)
+        low, high = int(slots.min()), int(slots.max())
+        if low == high:
+            groups = [(low, targets)]
+        else:
+            by_slot = np.argsort(slots, kind="stable")
+            slots, targets = slots[by_slot], targets[by_slot]
+            cuts = np.flatnonzero(slots[1:] != slots[:-1]) + 1
+            groups = zip(
+                slots[np.r_[0, cuts]].tolist(), np.split(targets, cuts)
+            )
+        for key, part in groups:
+            if key not in buckets:
+                buckets[key] = []
+                heapq.heappush(order, key)
+            buckets[key].append(part)
+
+    profiling.record_search("dijkstra", reached, pushes, max_open)
+    dist[np.isinf(dist)] = UNREACHABLE
+    return dist, parent, label
+
+
+class DistanceField:
+    """하나 이상의 출발점에서 모든 셀까지의 최단 거리장
+
+    단위 비용 4방향 격자는 BFS, 칸별 비용이나 8방향 이동이 있는 격자는
+    Dijkstra로 계산합니다. 거리 조회는 O(1), 경로 조회는 부모 방향을
+    따라가므로 O(경로 길이)입니다.
+    """
+
+    def __init__(self, graph, sources):
+        require_dense(graph, "거리장")
+        self.graph = graph
+        self.sources = list(sources)
+        search = multi_source_bfs if graph.unit_cost else multi_source_dijkstra
+        self.dist, self.parent, self.label = search(graph, self.sources)
+
+    def distance(self, pos):
+        """가장 가까운 출발점까지의 거리를 반환합니다 (도달 불가: None)."""
+        d = self.dist[self.graph.index(pos)].item()
+        return None if d == UNREACHABLE else d
+
+    def nearest_source(self, pos):
+        """해당 좌표에서 가장 가까운 출발점 좌표를 반환합니다."""
+        i = int(self.label[self.graph.index(pos)])
+        return None if i < 0 else self.sources[i]
+
+    def query_many(self, positions):
+        """여러 좌표의 거리와 가장 가까운 출발점 번호를 배열로 한꺼번에 조회합니다.
+
+        반환값: (거리 배열, sources 인덱스 배열) - 도달 불가/지도 밖은 -1
+        """
+        idx = self.graph.indices(positions)
+        inside = idx >= 0
+        safe = np.where(inside, idx, 0)
+        dist = np.where(inside, self.dist[safe], UNREACHABLE)
+        label = np.where(inside, self.label[safe], -1)
+        return dist, label
+
+    def path(self, pos):
+        """해당 좌표에서 가장 가까운 출발점까지의 경로를 반환합니다 (Path).
+
+        셀 번호만 array('i')에 모으고 좌표 튜플은 만들지 않습니다.
+        """
+        idx = self.graph.index(pos)
+        if self.dist[idx] == UNREACHABLE:
+            return None
+
+        offsets = [move[0] for move in self.graph.moves()]
+        parent = memoryview(self.parent)
+        cells = array("i", [idx])
+        step = parent[idx]
+        while step >= 0:
+            idx -= offsets[step]
+            cells.append(idx)
+            step = parent[idx]
+        return Path(cells, self.graph.stride)
+
+
+class DistanceTable:
+    """구조물과 집 등 주요 지점(landmark)마다 거리장을 하나씩 보관하는 전체 쌍 거리표"""
+
+    def __init__(self, graph, landmarks):
+        self.graph = graph
+        self.fields = {pos: DistanceField(graph, [pos]) for pos in landmarks}
+
+    def distance(self, a, b):
+        """지점 a에서 b까지의 최단 거리를 반환합니다 (도달 불가: None)."""
+        return self.fields[a].distance(b)
+
+    def path(self, a, b):
+        """지점 a에서 b까지의 최단 경로를 반환합니다 (도달 불가: None).
+
+        b → a 경로를 뒤집은 view이므로 복사가 없습니다.
+        """
+        path = self.fields[a].path(b)
+        return path[::-1] if path is not None else None
@@ -0,0 +1,245 @@
+from collections import namedtuple
+
+import numpy as np
+
+from csv_ingest import StructTable
+
+# 모든 격자는 1-based 좌표를 그대로 쓰도록 (max_y + 1, max_x + 1) 크기로 만들고
+# grid[y, x]로 접근합니다 (0행/0열은 비어 있음).
+GridLayers = namedtuple(
+    "GridLayers", ["construction", "area", "category", "max_x", "max_y"]
+)
+
+
+class BucketGrid:
+    """좌표를 bucket_size × bucket_size 칸 묶음(bucket)별로 정렬해 둔 격자
+
+    bucket 번호(열 우선) 순으로 정렬한 좌표 번호 배열 하나와 이진 탐색만
+    쓰므로, 맨해튼 반경 조회는 반경에 걸친 bucket 열마다 이진 탐색 두 번과
+    후보 거리 계산만 합니다. bucket_size를 주지 않으면 bucket 하나에 좌표가
+    평균 하나 들어가도록 정합니다.
+    """
+
+    def __init__(self, xs, ys, bucket_size=None):
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+        count = self.xs.size
+        span = int(max(self.xs.max(), self.ys.max())) + 1 if count else 1
+        if bucket_size is None:
+            bucket_size = max(1, int(np.ceil(span / np.sqrt(max(count, 1)))))
+        self.bucket_size = int(bucket_size)
+        self.span = span
+
+        bx = self.xs // self.bucket_size
+        by = self.ys // self.bucket_size
+        self.columns = int(bx.max()) + 1 if count else 1
+        self.rows = int(by.max()) + 1 if count else 1
+        keys = bx * self.rows + by
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return self.xs.size
+
+    def within(self, x, y, radius):
+        """(x, y)에서 맨해튼 거리 radius 이내인 좌표 번호와 거리를 반환합니다.
+
+        반환값: (좌표 번호 배열, 거리 배열) - 거리, 좌표 번호 순으로 정렬
+        """
+        size = self.bucket_size
+        bx0 = max((x - radius) // size, 0)
+        bx1 = min((x + radius) // size, self.columns - 1)
+        by0 = max((y - radius) // size, 0)
+        by1 = min((y + radius) // size, self.rows - 1)
+        empty = np.empty(0, dtype=np.int64)
+        if radius < 0 or bx0 > bx1 or by0 > by1:
+            return empty, empty
+
+        # bucket 열마다 by0 ~ by1 행의 좌표가 keys에서 연속 구간을 이룸
+        columns = np.arange(bx0, bx1 + 1) * self.rows
+        starts = np.searchsorted(self.keys, columns + by0, side="left")
+        ends = np.searchsorted(self.keys, columns + by1, side="right")
+        slices = [
+            self.order[start:end]
+            for start, end in zip(starts.tolist(), ends.tolist())
+            if end > start
+        ]
+        if not slices:
+            return empty, empty
+        candidates = np.concatenate(slices)
+        dist = np.abs(self.xs[candidates] - x) + np.abs(
+            self.ys[candidates] - y
+        )
+        inside = dist <= radius
+        candidates, dist = candidates[inside], dist[inside]
+        order = np.lexsort((candidates, dist))
+        return candidates[order], dist[order]
+
+    def nearest(self, x, y, k=1):
+        """(x, y)에서 맨해튼 거리가 가까운 좌표 k개의 번호와 거리를 반환합니다.
+
+        반경을 bucket 크기에서 시작해 두 배씩 넓히며 k개 이상 찾을 때까지
+        within을 반복합니다. 반경 안의 좌표는 모두 찾으므로 결과는 정확합니다.
+        """
+        k = min(int(k), len(self))
+        if k <= 0:
+            return self.within(x, y, -1)
+        # 지도 밖 좌표에서 조회해도 모든 좌표를 덮을 수 있는 반경
+        limit = abs(x) + abs(y) + 2 * self.span
+        radius = self.bucket_size
+        while True:
+            ids, dist = self.within(x, y, radius)
+            if ids.size >= k or radius >= limit:
+                return ids[:k], dist[:k]
+            radius *= 2
+
+
+class StructureIndex:
+    """구조물이 있는 칸의 좌표, 이름, 카테고리 번호를 배열로 보관하는 클래스
+
+    기존 {(x, y): 이름} 딕셔너리와 같은 items()/values() 인터페이스를
+    제공하므로 기존 코드에서 그대로 사용할 수 있습니다.
+    카테고리 번호로 좌표를 고르고(positions), 카테고리별 BucketGrid로
+    가장 가까운 구조물(nearest)과 맨해튼 반경 안의 구조물(within)을
+    이름 문자열 비교 없이 찾습니다.
+    카테고리는 번호나 구조물 이름(csv_ingest.MY_HOME 등)으로 지정하며,
+    이름은 table(area_category.csv의 StructTable)로 번호를 찾습니다.
+    """
+
+    def __init__(self, xs, ys, names, categories=None, table=None):
+        self.table = table if table is not None else StructTable.default()
+        self.xs = np.asarray(xs, dtype=np.int32)
+        self.ys = np.asarray(ys, dtype=np.int32)
+        self.names = np.asarray(names, dtype=object)
+        if categories is None:
+            categories = self.table.categories_of(self.names)
+        self.categories = np.asarray(categories, dtype=np.uint8)
+        self._grids = {}  # 카테고리 번호 묶음 → (구조물 번호, BucketGrid)
+
+    @classmethod
+    def from_frame(cls, df, table=None):
+        """병합 데이터에서 실제 구조물이 있는 행만 골라 인덱스를 만듭니다.
+
+        행은 category 번호(0: 구조물 없음)와 struct 코드의 결측 여부로만
+        고르고, 이름 문자열은 고른 구조물 행에서만 꺼냅니다.
+        table: df를 읽을 때 쓴 StructTable (이름 → 번호 조회용)
+        """
+        category = df["category"].to_numpy()
+        struct = df["struct"]
+        mask = (category > 0) & struct.notna().to_numpy()
+        return cls(
+            df["x"].to_numpy()[mask],
+            df["y"].to_numpy()[mask],
+            struct[mask].to_numpy(),
+            category[mask],
+            table,
+        )
+
+    @classmethod
+    def from_mapping(cls, structures, table=None):
+        """{(x, y): 이름} 딕셔너리로 인덱스를 만듭니다 (table로 카테고리 판별)."""
+        if isinstance(structures, cls):
+            return structures
+        items = list(structures.items())
+        return cls(
+            [pos[0] for pos, _ in items],
+            [pos[1] for pos, _ in items],
+            [name for _, name in items],
+            table=table,
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def _codes(self, category):
+        """카테고리 번호/이름 하나 또는 여러 개를 번호 튜플로 바꿉니다.
+
+        코드표에 없는 이름은 어떤 구조물과도 맞지 않습니다.
+        """
+        if category is None:
+            return None
+        if isinstance(category, (str, int, np.integer)):
+            category = (category,)
+        codes = set()
+        for item in category:
+            code = self.table.code(item) if isinstance(item, str) else item
+            if code is not None:
+                codes.add(int(code))
+        return tuple(sorted(codes))
+
+    def _select(self, category=None, exclude=None):
+        """카테고리 조건에 맞는 구조물 번호 배열 (원래 순서 유지)"""
+        mask = np.ones(len(self), dtype=bool)
+        if category is not None:
+            mask &= np.isin(self.categories, self._codes(category))
+        if exclude is not None:
+            mask &= ~np.isin(self.categories, self._codes(exclude))
+        return np.flatnonzero(mask)
+
+    def _coords(self, ids):
+        return list(zip(self.xs[ids].tolist(), self.ys[ids].tolist()))
+
+    def positions(self, category=None, exclude=None):
+        """구조물 좌표 리스트를 반환합니다.
+
+        category/exclude: 카테고리 번호나 이름 하나 또는 여러 개 (고를/뺄 종류)
+        """
+        if category is None and exclude is None:
+            return list(zip(self.xs.tolist(), self.ys.tolist()))
+        return self._coords(self._select(category, exclude))
+
+    def first(self, category):
+        """해당 카테고리의 첫 번째 구조물 좌표 (없으면 None)"""
+        ids = self._select(category)
+        return self._coords(ids[:1])[0] if ids.size else None
+
+    def _grid(self, category):
+        key = self._codes(category)
+        if key not in self._grids:
+            ids = self._select(category)
+            self._grids[key] = (ids, BucketGrid(self.xs[ids], self.ys[ids]))
+        return self._grids[key]
+
+    def nearest(self, pos, k=1, category=None):
+        """pos에서 맨해튼 거리가 가까운 구조물 k개를 [(좌표, 거리), ...]로 반환합니다."""
+        ids, grid = self._grid(category)
+        found, dist = grid.nearest(int(pos[0]), int(pos[1]), k)
+        return list(zip(self._coords(ids[found]), dist.tolist()))
+
+    def within(self, pos, radius, category=None):
+        """pos에서 맨해튼 거리 radius 이내의 구조물을 가까운 순으로 반환합니다."""
+        ids, grid = self._grid(category)
+        found, dist = grid.within(int(pos[0]), int(pos[1]), int(radius))
+        return list(zip(self._coords(ids[found]), dist.tolist()))
+
+    def items(self):
+        """((x, y), 이름) 쌍을 반환합니다."""
+        return zip(self.positions(), self.names.tolist())
+
+    def values(self):
+        """구조물 이름 리스트를 반환합니다."""
+        return self.names.tolist()
+
+
+def build_grid_layers(df, missing=0):
+    """병합 데이터의 모든 격자 레이어를 NumPy 인덱싱으로 한 번에 채웁니다.
+
+    지도 크기는 데이터의 최대 x, y 좌표로 정하므로 15x15가 아닌 지도도
+    그대로 처리합니다. 데이터에 없는 칸(예: 한 area만 불러온 경우)의
+    건설현장 레이어 값은 missing으로 채웁니다.
+    """
+    xs = df["x"].to_numpy(dtype=np.intp)
+    ys = df["y"].to_numpy(dtype=np.intp)
+    max_x = int(xs.max())
+    max_y = int(ys.max())
+    shape = (max_y + 1, max_x + 1)
+
+    construction = np.full(shape, missing, dtype=np.uint8)
+    area = np.zeros(shape, dtype=np.int16)
+    category = np.zeros(shape, dtype=np.uint8)
+
+    construction[ys, xs] = df["ConstructionSite"].to_numpy()
+    area[ys, xs] = df["area"].to_numpy()
+    category[ys, xs] = df["category"].to_numpy()
+
+    return GridLayers(construction, area, category, max_x, max_y)
@@ -0,0 +1,155 @@
+import math
+
+import numpy as np
+
+BLOCKED = 1
+PASSABLE = 0
+SQRT2 = math.sqrt(2)
+
+
+def require_dense(graph, user):
+    """격자 전체 셀 배열을 쓰는 구조에 sparse 격자(BitGrid)가 오면 거부합니다.
+
+    BitGrid.cells는 칸 하나씩만 읽을 수 있어서 배열 연산에 넘기면 오류 없이
+    틀린 값이 나올 수 있으므로, 처음부터 TypeError로 알립니다.
+    """
+    if getattr(graph, "sparse", False):
+        raise TypeError(
+            f"{user}: 메모리에 올린 GridGraph가 필요합니다 "
+            "(BitGrid는 to_grid()로 GridGraph를 만들어 사용)."
+        )
+
+
+class GridGraph:
+    """1-based (x, y) 격자를 테두리가 막힌 1차원 uint8 배열로 표현하는 클래스
+
+    셀 번호는 열 우선(idx = x * stride + y)으로 매기므로 셀 번호의 대소 비교가
+    (x, y) 튜플 비교와 같습니다. 바깥 테두리(0행/열, max+1행/열)는 항상 막혀
+    있어서 이웃을 구할 때 범위 검사가 필요 없습니다.
+
+    costs(칸별 이동 비용)나 diagonal(8방향 이동)을 주면 가중치 격자가 되어
+    탐색 엔진이 BFS/단위 비용 A* 대신 Dijkstra/가중치 A*를 사용합니다.
+    """
+
+    def __init__(self, grid, max_x, max_y, costs=None, diagonal=False):
+        self._set_shape(max_x, max_y)
+
+        cells = np.full((self.max_x + 2, self.stride), BLOCKED, dtype=np.uint8)
+        interior = np.asarray(grid, dtype=np.uint8)[
+            1 : self.max_y + 1, 1 : self.max_x + 1
+        ]
+        cells[1 : self.max_x + 1, 1 : self.max_y + 1] = interior.T
+        self.cells = cells.ravel()
+        self.diagonal = bool(diagonal)
+        self.set_costs(costs)
+
+    @classmethod
+    def from_cells(cls, cells, max_x, max_y):
+        """이미 테두리가 포함된 1차원 셀 배열로 격자를 만듭니다 (복사 없음).
+
+        공유 메모리처럼 다른 곳에서 만든 버퍼를 그대로 쓸 때 사용합니다.
+        """
+        graph = cls.__new__(cls)
+        graph._set_shape(max_x, max_y)
+        if len(cells) != graph.size:
+            raise ValueError("셀 배열 크기가 지도 크기와 맞지 않습니다.")
+        graph.cells = cells
+        graph.diagonal = False
+        graph.set_costs(None)
+        return graph
+
+    def _set_shape(self, max_x, max_y):
+        self.max_x = int(max_x)
+        self.max_y = int(max_y)
+        self.stride = self.max_y + 2
+        self.size = (self.max_x + 2) * self.stride
+
+        # get_neighbors와 같은 순서: 좌, 우, 상, 하
+        self.offsets = (-self.stride, self.stride, -1, 1)
+
+    def set_costs(self, costs):
+        """칸별 이동 비용 격자(1-based grid[y][x])를 설정합니다 (None: 단위 비용).
+
+        이동 가능한 칸의 비용은 0보다 큰 유한한 값이어야 하며, 건설현장 칸의
+        값은 사용하지 않습니다. 테두리는 inf로 채웁니다.
+        """
+        self.costs = None
+        self.min_cost = 1.0
+        if costs is None:
+            return
+
+        interior = np.asarray(costs, dtype=np.float32)[
+            1 : self.max_y + 1, 1 : self.max_x + 1
+        ].T
+        padded = np.full((self.max_x + 2, self.stride), np.inf, np.float32)
+        padded[1 : self.max_x + 1, 1 : self.max_y + 1] = interior
+        flat = padded.ravel()
+
+        passable = flat[self.cells == PASSABLE]
+        if not np.all(np.isfinite(passable) & (passable > 0)):
+            raise ValueError(
+                "이동 가능한 칸의 비용은 0보다 큰 유한한 값이어야 합니다."
+            )
+        self.costs = flat
+        if passable.size:
+            self.min_cost = float(passable.min())
+
+    @property
+    def unit_cost(self):
+        """모든 이동 비용이 1인 4방향 격자인지 확인합니다 (BFS 사용 가능 여부)."""
+        return self.costs is None and not self.diagonal
+
+    def moves(self):
+        """이동 방향 목록 [(셀 번호 차이, 이동 거리, 모서리 칸 1, 모서리 칸 2)]
+
+        4방향 다음에 대각선 방향이 오며, 대각선은 모서리 두 칸이 모두 열려
+        있어야 지나갈 수 있습니다 (직선 이동의 모서리 칸은 0).
+        """
+        moves = [(offset, 1.0, 0, 0) for offset in self.offsets]
+        if self.diagonal:
+            for dx in (-self.stride, self.stride):
+                for dy in (-1, 1):
+                    moves.append((dx + dy, SQRT2, dx, dy))
+        return moves
+
+    def step_cost(self, a, b):
+        """인접한 두 셀 사이의 이동 비용 (이동 거리 × 두 칸 비용의 평균)
+
+        양방향 비용이 같으므로 도착점에서 거꾸로 탐색해도 결과가 같습니다.
+        """
+        length = 1.0 if abs(b - a) in (1, self.stride) else SQRT2
+        if self.costs is None:
+            return length
+        return length * (float(self.costs[a]) + float(self.costs[b])) / 2
+
+    def index(self, pos):
+        """(x, y) 좌표를 셀 번호로 변환합니다."""
+        return pos[0] * self.stride + pos[1]
+
+    def indices(self, positions):
+        """(x, y) 좌표 배열을 셀 번호 배열로 한꺼번에 변환합니다.
+
+        지도 밖 좌표는 -1로 표시합니다.
+        """
+        points = np.asarray(positions, dtype=np.intp).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        inside = (
+            (1 <= xs) & (xs <= self.max_x) & (1 <= ys) & (ys <= self.max_y)
+        )
+        return np.where(inside, xs * self.stride + ys, -1)
+
+    def coord(self, idx):
+        """셀 번호를 (x, y) 좌표로 변환합니다."""
+        x, y = divmod(int(idx), self.stride)
+        return (x, y)
+
+    def is_passable(self, pos):
+        """해당 좌표가 지도 안에 있고 이동 가능한지 확인합니다."""
+        x, y = pos
+        if not (1 <= x <= self.max_x and 1 <= y <= self.max_y):
+            return False
+        return self.cells[self.index(pos)] == PASSABLE
+
+    def set_blocked(self, pos, blocked=True):
+        """해당 좌표의 건설현장 여부를 변경합니다."""
+        self.cells[self.index(pos)] = BLOCKED if blocked else PASSABLE
@@ -0,0 +1,645 @@
+import heapq
+import os
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+import pathfinding
+import profiling
+from batch_routing import CafeRoute
+from connectivity import ConnectivityIndex
+from distance_field import UNREACHABLE, DistanceField
+from grid_graph import BLOCKED, GridGraph
+from pathfinding import SearchResult
+
+DEFAULT_CLUSTER_SIZE = 16
+# 이 길이 이상 열린 경계 구간은 양 끝에 입구를 두 개 둠 (짧으면 가운데 하나)
+ENTRANCE_SPLIT = 6
+# 입구 간 거리를 계산할 때 한 번에 묶어서 BFS하는 구역 수
+CLUSTER_BATCH = 64
+# 비트 집합 BFS에서 한 번에 진행하는 출발 입구 수 (uint64 비트 수)
+SOURCE_BITS = 64
+FORMAT_VERSION = 1
+
+# 입구 그래프 탐색 결과 (length: 전체 칸 수, waypoints: 출발점, 경유 입구,
+# 도착점의 셀 번호 - 경로 없음: None)
+AbstractPath = namedtuple(
+    "AbstractPath", ["length", "waypoints", "expanded", "pushes", "max_open"]
+)
+
+
+def _check_unit_cost(graph):
+    if not graph.unit_cost:
+        raise ValueError(
+            "HPA*는 단위 비용 4방향 격자에서만 사용할 수 있습니다."
+        )
+
+
+class HierarchicalPlanner:
+    """격자를 cluster_size 크기의 구역으로 나눈 HPA* 경로 탐색기
+
+    구역 경계에서 양쪽 모두 열린 구간마다 입구(경계를 사이에 둔 두 칸)를
+    두고, 같은 구역 안 입구끼리의 거리를 미리 계산해 둡니다. 긴 경로는
+    입구 그래프에서 먼저 찾고(추상 경로), 칸 단위 경로는 필요한 구간만
+    해당 구역 안에서 BFS로 채웁니다. 입구가 구간마다 한두 개뿐이므로
+    결과 경로는 최단 경로보다 조금 길 수 있습니다.
+
+    건설현장이 바뀌면 그 칸이 속한 구역과 입구가 달라진 이웃 구역만 다시
+    계산하며, 입구 그래프는 파일로 저장해 다음 실행에서 재사용합니다.
+    """
+
+    def __init__(self, graph, cluster_size=DEFAULT_CLUSTER_SIZE):
+        _check_unit_cost(graph)
+        self.graph = graph
+        self.cluster_size = int(cluster_size)
+        self.columns = -(-graph.max_x // self.cluster_size)
+        self.rows = -(-graph.max_y // self.cluster_size)
+        self.borders = {}  # (cx, cy, 축) → [(칸 a, 칸 b), ...]
+        self.partners = {}  # 입구 칸 → 경계 건너편 입구 칸 집합
+        # 구역 → (입구 칸 리스트, 입구 간 거리 행렬 - 도달 불가: -1)
+        self.edges = {}
+        self.rebuilt = 0
+        # 다른 연결 요소로 가는 요청은 추상 그래프를 다 돌기 전에 걸러 냄
+        self.connectivity = ConnectivityIndex(graph)
+
+        self._refresh(self.clusters(), self._all_borders())
+
+    # 구역/경계 좌표
+
+    def _cells2d(self):
+        return self.graph.cells.reshape(self.graph.max_x + 2, -1)
+
+    def clusters(self):
+        """모든 구역 번호 (cx, cy)를 반환합니다."""
+        return [
+            (cx, cy) for cx in range(self.columns) for cy in range(self.rows)
+        ]
+
+    def cluster_of(self, idx):
+        """셀 번호가 속한 구역 번호를 반환합니다."""
+        x, y = divmod(int(idx), self.graph.stride)
+        return ((x - 1) // self.cluster_size, (y - 1) // self.cluster_size)
+
+    def _bounds(self, cluster):
+        """구역의 x/y 범위 (x0, x1, y0, y1, 양 끝 포함)"""
+        cx, cy = cluster
+        size = self.cluster_size
+        return (
+            cx * size + 1,
+            min((cx + 1) * size, self.graph.max_x),
+            cy * size + 1,
+            min((cy + 1) * size, self.graph.max_y),
+        )
+
+    def _all_borders(self):
+        borders = [
+            (cx, cy, 0)
+            for cx in range(self.columns - 1)
+            for cy in range(self.rows)
+        ]
+        borders += [
+            (cx, cy, 1)
+            for cx in range(self.columns)
+            for cy in range(self.rows - 1)
+        ]
+        return borders
+
+    def _cluster_borders(self, cluster):
+        """구역의 네 변에 해당하는 경계 번호 (지도 가장자리 제외)"""
+        cx, cy = cluster
+        candidates = [
+            (cx - 1, cy, 0),
+            (cx, cy, 0),
+            (cx, cy - 1, 1),
+            (cx, cy, 1),
+        ]
+        return [
+            (bx, by, axis)
+            for bx, by, axis in candidates
+            if 0 <= bx < self.columns - (axis == 0)
+            and 0 <= by < self.rows - (axis == 1)
+        ]
+
+    def _border_clusters(self, border):
+        cx, cy, axis = border
+        return ((cx, cy), (cx + 1, cy) if axis == 0 else (cx, cy + 1))
+
+    def cluster_nodes(self, cluster):
+        """구역 안에 있는 입구 칸 번호를 정렬해서 반환합니다."""
+        nodes = set()
+        for border in self._cluster_borders(cluster):
+            side = self._border_clusters(border).index(cluster)
+            nodes.update(pair[side] for pair in self.borders.get(border, ()))
+        return sorted(nodes)
+
+    # 추상 그래프 계산
+
+    def _find_entrances(self, border):
+        """경계 양쪽이 모두 열린 구간마다 입구 칸 쌍을 만듭니다."""
+        cells = self._cells2d()
+        stride = self.graph.stride
+        cx, cy, axis = border
+        x0, x1, y0, y1 = self._bounds((cx, cy))
+        if axis == 0:
+            line = np.arange(y0, y1 + 1)
+            is_open = (cells[x1, line] == 0) & (cells[x1 + 1, line] == 0)
+
+            def pair(y):
+                return (x1 * stride + y, (x1 + 1) * stride + y)
+
+        else:
+            line = np.arange(x0, x1 + 1)
+            is_open = (cells[line, y1] == 0) & (cells[line, y1 + 1] == 0)
+
+            def pair(x):
+                return (x * stride + y1, x * stride + y1 + 1)
+
+        # 열린 구간의 시작/끝 위치
+        padded = np.concatenate(([False], is_open, [False]))
+        changes = np.flatnonzero(padded[1:] != padded[:-1])
+        entrances = []
+        for start, stop in zip(changes[::2], changes[1::2]):
+            first, last = int(line[start]), int(line[stop - 1])
+            if stop - start >= ENTRANCE_SPLIT:
+                entrances += [pair(first), pair(last)]
+            else:
+                entrances.append(pair((first + last) // 2))
+        return entrances
+
+    def _set_border(self, border, entrances):
+        for a, b in self.borders.get(border, ()):
+            self.partners[a].discard(b)
+            self.partners[b].discard(a)
+        self.borders[border] = entrances
+        for a, b in entrances:
+            self.partners.setdefault(a, set()).add(b)
+            self.partners.setdefault(b, set()).add(a)
+
+    def _cluster_graph(self, cluster):
+        """구역만 잘라 낸 GridGraph와 구역의 (x0, y0)를 반환합니다.
+
+        구역 바깥은 막힌 테두리가 되므로 구역 안에서만 이동합니다.
+        """
+        x0, x1, y0, y1 = self._bounds(cluster)
+        window = self._cells2d()[x0 - 1 : x1 + 2, y0 - 1 : y1 + 2].copy()
+        window[[0, -1], :] = BLOCKED
+        window[:, [0, -1]] = BLOCKED
+        sub = GridGraph.from_cells(window.ravel(), x1 - x0 + 1, y1 - y0 + 1)
+        return sub, (x0, y0)
+
+    def _intra_edges(self, clusters):
+        """여러 구역의 입구끼리 BFS 거리를 한꺼번에 계산합니다.
+
+        크기가 같은 구역을 CLUSTER_BATCH개씩 묶어 (구역, 입구, 너비, 높이)
+        불리언 배열의 경계를 한 칸씩 넓히므로, 모든 입구의 BFS가 레벨마다
+        NumPy 연산 몇 번으로 함께 진행됩니다.
+        반환값: 구역 → (입구 칸 리스트, 입구 간 거리 행렬)
+        """
+        groups = {}
+        for cluster in clusters:
+            x0, x1, y0, y1 = self._bounds(cluster)
+            groups.setdefault((x1 - x0 + 1, y1 - y0 + 1), []).append(cluster)
+
+        edges = {}
+        for group in groups.values():
+            for i in range(0, len(group), CLUSTER_BATCH):
+                edges.update(
+                    self._intra_edges_batch(group[i : i + CLUSTER_BATCH])
+                )
+        return edges
+
+    @staticmethod
+    def _bitset_bfs(passable, local, valid, sources, table):
+        """여러 구역에서 입구 최대 64개의 BFS를 비트 집합으로 동시에 진행합니다.
+
+        칸마다 uint64 하나에 "이 칸에 도달한 출발 입구" 비트를 모읍니다.
+        레벨마다 네 방향 시프트의 OR로 경계를 넓히고, 새로 도달한 비트를
+        입구 칸 위치에서 읽어 table[구역, 출발 입구, 도착 입구]에 기록합니다.
+        """
+        batch = np.arange(len(passable))[:, None]
+        target_x, target_y = local[:, :, 0], local[:, :, 1]
+        shifts = np.arange(len(sources), dtype=np.uint64)
+
+        frontier = np.zeros(passable.shape, dtype=np.uint64)
+        for bit, i in enumerate(sources):
+            rows = np.flatnonzero(valid[:, i])
+            frontier[rows, target_x[rows, i], target_y[rows, i]] |= np.uint64(
+                1 << bit
+            )
+        mask = np.uint64((1 << len(sources)) - 1)
+        unvisited = np.where(passable, mask, np.uint64(0)) & ~frontier
+        grown = np.empty_like(frontier)
+
+        level = 0
+        while True:
+            level += 1
+            grown[...] = 0
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown[:, :, 1:] |= frontier[:, :, :-1]
+            grown[:, :, :-1] |= frontier[:, :, 1:]
+            grown &= unvisited
+            if not grown.any():
+                break
+            unvisited ^= grown
+
+            hits = grown[batch, target_x, target_y]
+            if hits.any():
+                reached = (hits[:, None, :] >> shifts[None, :, None]) & 1
+                table[:, sources.start : sources.stop][reached != 0] = level
+            frontier, grown = grown, frontier
+
+    def _intra_edges_batch(self, clusters):
+        cells = self._cells2d()
+        stride = self.graph.stride
+        nodes = [self.cluster_nodes(cluster) for cluster in clusters]
+        count = max(len(n) for n in nodes)
+        if count < 2:
+            return {
+                cluster: (members, np.zeros((len(members),) * 2, np.int32))
+                for cluster, members in zip(clusters, nodes)
+            }
+
+        windows = []
+        local = np.zeros((len(clusters), count, 2), dtype=np.intp)
+        valid = np.zeros((len(clusters), count), dtype=bool)
+        for b, (cluster, members) in enumerate(zip(clusters, nodes)):
+            x0, x1, y0, y1 = self._bounds(cluster)
+            windows.append(cells[x0 : x1 + 1, y0 : y1 + 1] == 0)
+            for i, node in enumerate(members):
+                x, y = divmod(node, stride)
+                local[b, i] = (x - x0, y - y0)
+                valid[b, i] = True
+        passable = np.stack(windows)
+
+        # table[b, i, j]: 구역 b의 입구 i에서 입구 j까지의 거리
+        table = np.full((len(clusters), count, count), UNREACHABLE, np.int32)
+        for first in range(0, count, SOURCE_BITS):
+            sources = range(first, min(first + SOURCE_BITS, count))
+            self._bitset_bfs(passable, local, valid, sources, table)
+        # BFS는 출발 칸 자신을 기록하지 않으므로 count < 2일 때처럼 대각을 0으로
+        diagonal = np.arange(count)
+        table[:, diagonal, diagonal] = 0
+        edges = {}
+        for b, (cluster, members) in enumerate(zip(clusters, nodes)):
+            k = len(members)
+            edges[cluster] = (members, table[b, :k, :k].copy())
+        return edges
+
+    def _refresh(self, clusters, borders):
+        """경계 입구를 다시 찾고, 입구가 바뀐 구역의 내부 거리를 다시 계산합니다."""
+        dirty = set(clusters)
+        for border in borders:
+            entrances = self._find_entrances(border)
+            if entrances != self.borders.get(border):
+                self._set_border(border, entrances)
+                dirty.update(self._border_clusters(border))
+        self.edges.update(self._intra_edges(sorted(dirty)))
+        self.rebuilt += len(dirty)
+        return len(dirty)
+
+    def update_cells(self, positions):
+        """바뀐 칸 목록을 받아 영향받는 구역만 다시 계산합니다.
+
+        칸이 구역의 바깥쪽 줄에 있으면 그 변의 입구도 다시 찾습니다.
+        반환값: 다시 계산한 구역 수
+        """
+        positions = list(positions)
+        self.connectivity.update_cells(positions)
+        clusters = set()
+        borders = set()
+        for pos in positions:
+            cluster = self.cluster_of(self.graph.index(pos))
+            clusters.add(cluster)
+            x0, x1, y0, y1 = self._bounds(cluster)
+            x, y = pos
+            edge_of = {
+                (cluster[0] - 1, cluster[1], 0): x == x0,
+                (cluster[0], cluster[1], 0): x == x1,
+                (cluster[0], cluster[1] - 1, 1): y == y0,
+                (cluster[0], cluster[1], 1): y == y1,
+            }
+            borders.update(
+                border
+                for border in self._cluster_borders(cluster)
+                if edge_of[border]
+            )
+        return self._refresh(clusters, borders)
+
+    def set_blocked(self, pos, blocked=True):
+        """칸 하나의 건설현장 여부를 바꾸고 해당 구역을 다시 계산합니다."""
+        self.graph.set_blocked(pos, blocked)
+        return self.update_cells([pos])
+
+    # 저장/불러오기
+
+    def _checksums(self):
+        """구역별 셀 내용의 CRC32 (저장된 추상 그래프와 비교용)"""
+        cells = self._cells2d()
+        checksums = np.zeros((self.columns, self.rows), dtype=np.uint32)
+        for cluster in self.clusters():
+            x0, x1, y0, y1 = self._bounds(cluster)
+            checksums[cluster] = zlib.crc32(
+                cells[x0 : x1 + 1, y0 : y1 + 1].tobytes()
+            )
+        return checksums
+
+    def save(self, path):
+        """입구 그래프와 구역별 체크섬을 .npz 파일로 저장합니다."""
+        border_rows = [
+            (*border, a, b)
+            for border, entrances in sorted(self.borders.items())
+            for a, b in entrances
+        ]
+        # 구역 순서대로 입구 수, 입구 칸, 거리 행렬을 이어 붙여 저장
+        clusters = self.clusters()
+        node_counts = [len(self.edges[cluster][0]) for cluster in clusters]
+        nodes = [node for c in clusters for node in self.edges[c][0]]
+        tables = [self.edges[c][1].ravel() for c in clusters]
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        np.savez(
+            path,
+            header=np.array(
+                [
+                    FORMAT_VERSION,
+                    self.cluster_size,
+                    self.graph.max_x,
+                    self.graph.max_y,
+                ],
+                dtype=np.int64,
+            ),
+            checksums=self._checksums(),
+            borders=np.array(border_rows, dtype=np.int64).reshape(-1, 5),
+            node_counts=np.array(node_counts, dtype=np.int64),
+            nodes=np.array(nodes, dtype=np.int64),
+            tables=np.concatenate(tables).astype(np.int32),
+        )
+
+    @classmethod
+    def load(cls, graph, path, cluster_size=DEFAULT_CLUSTER_SIZE):
+        """저장된 입구 그래프를 불러오고, 셀이 바뀐 구역만 다시 계산합니다.
+
+        파일이 없거나 지도 크기/구역 크기가 다르면 처음부터 계산합니다.
+        rebuilt 속성에 다시 계산한 구역 수가 남습니다.
+        """
+        _check_unit_cost(graph)
+        expected = [FORMAT_VERSION, cluster_size, graph.max_x, graph.max_y]
+        try:
+            with np.load(path) as saved:
+                if saved["header"].tolist() != expected:
+                    return cls(graph, cluster_size)
+                data = {name: saved[name] for name in saved.files}
+        except (OSError, ValueError, KeyError):
+            return cls(graph, cluster_size)
+
+        planner = cls.__new__(cls)
+        planner.graph = graph
+        planner.cluster_size = int(cluster_size)
+        planner.columns = -(-graph.max_x // planner.cluster_size)
+        planner.rows = -(-graph.max_y // planner.cluster_size)
+        planner.borders = {border: [] for border in planner._all_borders()}
+        planner.partners = {}
+        planner.edges = {}
+        planner.rebuilt = 0
+        planner.connectivity = ConnectivityIndex(graph)
+
+        for cx, cy, axis, a, b in data["borders"].tolist():
+            planner.borders[(cx, cy, axis)].append((a, b))
+            planner.partners.setdefault(a, set()).add(b)
+            planner.partners.setdefault(b, set()).add(a)
+        nodes = data["nodes"].tolist()
+        node_start = table_start = 0
+        for cluster, k in zip(
+            planner.clusters(), data["node_counts"].tolist()
+        ):
+            table = data["tables"][table_start : table_start + k * k]
+            planner.edges[cluster] = (
+                nodes[node_start : node_start + k],
+                table.reshape(k, k),
+            )
+            node_start += k
+            table_start += k * k
+
+        changed = np.argwhere(planner._checksums() != data["checksums"])
+        clusters = [tuple(int(v) for v in cluster) for cluster in changed]
+        borders = {
+            border
+            for cluster in clusters
+            for border in planner._cluster_borders(cluster)
+        }
+        planner._refresh(clusters, borders)
+        return planner
+
+    @classmethod
+    def load_or_build(cls, graph, path, cluster_size=DEFAULT_CLUSTER_SIZE):
+        """저장 파일을 재사용하고, 다시 계산한 구역이 있으면 파일을 갱신합니다."""
+        planner = cls.load(graph, path, cluster_size)
+        if planner.rebuilt or not os.path.exists(path):
+            planner.save(path)
+        return planner
+
+    # 탐색
+
+    def _local_field(self, idx):
+        """칸이 속한 구역 안에서 그 칸을 출발점으로 한 BFS 거리장"""
+        sub, (x0, y0) = self._cluster_graph(self.cluster_of(idx))
+        x, y = divmod(idx, self.graph.stride)
+        return DistanceField(sub, [(x - x0 + 1, y - y0 + 1)]), (x0, y0)
+
+    def _field_distances(self, field, origin, nodes):
+        x0, y0 = origin
+        positions = [
+            (x - x0 + 1, y - y0 + 1)
+            for x, y in (divmod(node, self.graph.stride) for node in nodes)
+        ]
+        dist, _ = field.query_many(positions)
+        return {
+            node: d
+            for node, d in zip(nodes, dist.tolist())
+            if d != UNREACHABLE
+        }
+
+    def abstract_search(self, start, goal):
+        """입구 그래프에서 start → goal 추상 경로를 찾습니다 (셀 번호).
+
+        반환값: AbstractPath
+        """
+        stride = self.graph.stride
+        goal_x, goal_y = divmod(goal, stride)
+        if start == goal:
+            return AbstractPath(0, [start], 0, 0, 0)
+        if self.graph.cells[goal]:
+            return AbstractPath(None, None, 0, 0, 0)
+
+        start_field, start_origin = self._local_field(start)
+        goal_field, goal_origin = self._local_field(goal)
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        exits = self._field_distances(
+            goal_field, goal_origin, self.cluster_nodes(goal_cluster)
+        )
+
+        # 같은 구역이면 구역 안 직접 경로도 후보
+        best_length = None
+        best_node = None
+        if start_cluster == goal_cluster:
+            direct = self._field_distances(start_field, start_origin, [goal])
+            if goal in direct:
+                best_length = direct[goal]
+
+        g_score = {}
+        came_from = {}
+        open_heap = []
+        for node, d in self._field_distances(
+            start_field, start_origin, self.cluster_nodes(start_cluster)
+        ).items():
+            g_score[node] = d
+            came_from[node] = start
+            x, y = divmod(node, stride)
+            open_heap.append((d + abs(x - goal_x) + abs(y - goal_y), -d, node))
+        heapq.heapify(open_heap)
+
+        expanded = 0
+        popped = 0
+        max_open = len(open_heap)
+        while open_heap:
+            max_open = max(max_open, len(open_heap))
+            f, neg_g, current = heapq.heappop(open_heap)
+            popped += 1
+            if best_length is not None and f >= best_length:
+                break
+            current_g = -neg_g
+            if current_g > g_score[current]:
+                continue
+            expanded += 1
+
+            if current in exits:
+                length = current_g + exits[current]
+                if best_length is None or length < best_length:
+                    best_length = length
+                    best_node = current
+
+            nodes, table = self.edges[self.cluster_of(current)]
+            costs = table[nodes.index(current)].tolist()
+            neighbors = [(b, 1) for b in self.partners.get(current, ())]
+            neighbors += [(b, d) for b, d in zip(nodes, costs) if d > 0]
+            for neighbor, cost in neighbors:
+                tentative_g = current_g + cost
+                if tentative_g < g_score.get(neighbor, tentative_g + 1):
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    nx, ny = divmod(neighbor, stride)
+                    heapq.heappush(
+                        open_heap,
+                        (
+                            tentative_g + abs(nx - goal_x) + abs(ny - goal_y),
+                            -tentative_g,
+                            neighbor,
+                        ),
+                    )
+
+        pushes = popped + len(open_heap)
+        profiling.record_search("hpa", expanded, pushes, max_open)
+        if best_length is None:
+            waypoints = None
+        elif best_node is None:
+            waypoints = [start, goal]
+        else:
+            waypoints = [goal, best_node]
+            while waypoints[-1] != start:
+                waypoints.append(came_from[waypoints[-1]])
+            waypoints.reverse()
+        return AbstractPath(best_length, waypoints, expanded, pushes, max_open)
+
+    def refine(self, waypoints):
+        """추상 경로의 구간을 하나씩 칸 단위 경로(셀 번호)로 채워 내보냅니다.
+
+        필요한 구간만 구역 안 A*로 계산하므로, 경로 일부만 쓰는 경우
+        나머지 구간은 계산하지 않습니다. 각 구간은 끝 칸을 포함하고
+        시작 칸은 포함하지 않습니다.
+        """
+        stride = self.graph.stride
+        for a, b in zip(waypoints, waypoints[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                yield [b]  # 경계를 건너는 한 칸 이동
+                continue
+            sub, (x0, y0) = self._cluster_graph(cluster)
+            ax, ay = divmod(a, stride)
+            bx, by = divmod(b, stride)
+            segment = pathfinding.astar_search(
+                sub,
+                sub.index((ax - x0 + 1, ay - y0 + 1)),
+                sub.index((bx - x0 + 1, by - y0 + 1)),
+            ).path
+            yield [
+                (lx + x0 - 1) * stride + ly + y0 - 1
+                for lx, ly in map(sub.coord, segment[1:])
+            ]
+
+    def search(self, start, goal):
+        """(x, y) 좌표로 HPA* 탐색을 수행합니다 (pathfinding.search와 같은 결과형).
+
+        구역 하나 안에 들어가는 짧은 거리는 일반 A*로 바로 찾고, 서로 다른
+        연결 요소 사이의 요청은 탐색 없이 경로 없음을 반환합니다.
+        """
+        if not self.connectivity.connected(start, goal):
+            return SearchResult(None, 0)
+        if (
+            abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+            <= self.cluster_size
+        ):
+            return pathfinding.search(self.graph, start, goal)
+
+        start_idx = self.graph.index(start)
+        route = self.abstract_search(start_idx, self.graph.index(goal))
+        path = None
+        if route.waypoints is not None:
+            cells = [start_idx]
+            for segment in self.refine(route.waypoints):
+                cells.extend(segment)
+            path = [self.graph.coord(idx) for idx in cells]
+        return SearchResult(path, route.expanded, route.pushes, route.max_open)
+
+    def find_path(self, start, goal):
+        """(x, y) 좌표로 HPA* 탐색을 수행해 좌표 리스트 경로를 반환합니다."""
+        return self.search(start, goal).path
+
+    def nearest_route(self, origin, goals):
+        """추상 그래프에서 가장 가까운 도착점을 고르고 그 경로만 채웁니다.
+
+        출발점과 다른 연결 요소에 있는 도착점은 탐색하지 않습니다.
+        도착점을 맨해튼 거리(경로 길이의 하한) 순으로 보고, 하한이 지금까지
+        찾은 가장 짧은 경로보다 길어지면 나머지는 탐색하지 않습니다.
+        """
+        origin_idx = self.graph.index(origin)
+        goals = self.connectivity.reachable(origin, goals)
+        bounds = [abs(x - origin[0]) + abs(y - origin[1]) for x, y in goals]
+        best_goal = None
+        best = None
+        best_rank = None
+        for rank in np.argsort(bounds, kind="stable").tolist():
+            if best is not None and bounds[rank] > best.length:
+                break
+            goal = goals[rank]
+            route = self.abstract_search(origin_idx, self.graph.index(goal))
+            if route.waypoints is None:
+                continue
+            # 길이가 같으면 원래 목록에서 앞선 도착점을 고름
+            if best is None or (route.length, rank) < (best.length, best_rank):
+                best_goal, best, best_rank = goal, route, rank
+        if best is None:
+            return CafeRoute(origin, None, None, None)
+
+        path = [origin_idx]
+        for segment in self.refine(best.waypoints):
+            path.extend(segment)
+        return CafeRoute(
+            origin,
+            best_goal,
+            best.length,
+            [self.graph.coord(idx) for idx in path],
+        )
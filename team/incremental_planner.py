@@ -0,0 +1,242 @@
+import heapq
+
+import numpy as np
+
+from connectivity import ConnectivityIndex
+
+INF = 1 << 30
+
+
+class DStarLite:
+    """도착점(들)에서 거꾸로 탐색하는 D* Lite 경로 탐색기
+
+    건설현장이 생기거나 사라지면 해당 칸의 이웃만 다시 계산 대상으로 올리고,
+    compute_shortest_path가 영향을 받은 부분만 재확장해 경로를 복구합니다.
+    도착점을 여러 개 주면 그중 가장 가까운 곳까지의 경로를 유지합니다.
+    """
+
+    def __init__(self, graph, start, goals):
+        self.graph = graph
+        self.start = graph.index(start)
+        self.goals = {graph.index(goal) for goal in goals}
+        self.km = 0
+        self.expanded = 0
+
+        self._g_array = np.full(graph.size, INF, dtype=np.int32)
+        self._rhs_array = np.full(graph.size, INF, dtype=np.int32)
+        self._key_array = np.zeros((2, graph.size), dtype=np.int32)
+        self._queued_array = np.zeros(graph.size, dtype=np.uint8)
+        self.g = memoryview(self._g_array)
+        self.rhs = memoryview(self._rhs_array)
+        self.key1 = memoryview(self._key_array[0])
+        self.key2 = memoryview(self._key_array[1])
+        self.queued = memoryview(self._queued_array)
+        self.open_heap = []
+
+        for goal in sorted(self.goals):
+            self.rhs[goal] = 0
+            self._push(goal)
+
+    def _heuristic(self, idx):
+        """출발점까지의 맨하탄 거리"""
+        stride = self.graph.stride
+        x, y = divmod(idx, stride)
+        sx, sy = divmod(self.start, stride)
+        return abs(x - sx) + abs(y - sy)
+
+    def _calculate_key(self, idx):
+        best = min(self.g[idx], self.rhs[idx])
+        if best >= INF:
+            return (INF, INF)
+        return (best + self._heuristic(idx) + self.km, best)
+
+    def _push(self, idx):
+        k1, k2 = self._calculate_key(idx)
+        self.key1[idx] = k1
+        self.key2[idx] = k2
+        self.queued[idx] = 1
+        heapq.heappush(self.open_heap, (k1, k2, idx))
+
+    def _top(self):
+        """가장 작은 유효 키를 가진 항목을 반환합니다 (오래된 항목은 버림)."""
+        heap = self.open_heap
+        while heap:
+            k1, k2, idx = heap[0]
+            if (
+                self.queued[idx]
+                and self.key1[idx] == k1
+                and self.key2[idx] == k2
+            ):
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _in_map(self, idx):
+        x, y = divmod(idx, self.graph.stride)
+        return 1 <= x <= self.graph.max_x and 1 <= y <= self.graph.max_y
+
+    def _update_vertex(self, idx):
+        if not self._in_map(idx):
+            return  # 지도 바깥 테두리
+
+        cells = self.graph.cells
+        if idx not in self.goals:
+            best = INF
+            for offset in self.graph.offsets:
+                neighbor = idx + offset
+                # 건설현장으로 들어가는 비용은 무한대
+                if cells[neighbor]:
+                    continue
+                neighbor_g = self.g[neighbor]
+                if neighbor_g < INF and neighbor_g + 1 < best:
+                    best = neighbor_g + 1
+            self.rhs[idx] = best
+
+        if self.g[idx] != self.rhs[idx]:
+            self._push(idx)
+        else:
+            self.queued[idx] = 0
+
+    def compute_shortest_path(self):
+        """출발점의 값이 일관될 때까지 필요한 노드만 확장합니다."""
+        start = self.start
+        offsets = self.graph.offsets
+        while True:
+            top = self._top()
+            if top is None:
+                break
+            start_key = self._calculate_key(start)
+            if (top[0], top[1]) >= start_key and (
+                self.rhs[start] == self.g[start]
+            ):
+                break
+
+            k_old = (top[0], top[1])
+            idx = top[2]
+            k_new = self._calculate_key(idx)
+            if k_old < k_new:
+                self._push(idx)
+                continue
+
+            heapq.heappop(self.open_heap)
+            self.queued[idx] = 0
+            self.expanded += 1
+
+            if self.g[idx] > self.rhs[idx]:
+                self.g[idx] = self.rhs[idx]
+                for offset in offsets:
+                    self._update_vertex(idx + offset)
+            else:
+                self.g[idx] = INF
+                self._update_vertex(idx)
+                for offset in offsets:
+                    self._update_vertex(idx + offset)
+
+    def cell_changed(self, idx):
+        """idx 칸의 통행 가능 여부가 바뀌었을 때 영향을 받는 이웃을 갱신합니다."""
+        for offset in self.graph.offsets:
+            self._update_vertex(idx + offset)
+
+    def move_start(self, start):
+        """출발점을 옮깁니다 (이미 계산한 값은 재사용)."""
+        new_start = self.graph.index(start)
+        self.km += self._heuristic(new_start)
+        self.start = new_start
+
+    def distance(self):
+        """현재 출발점에서 가장 가까운 도착점까지의 거리 (도달 불가: None)"""
+        self.compute_shortest_path()
+        d = self.g[self.start]
+        return None if d >= INF else d
+
+    def path(self):
+        """현재 격자 상태의 최단 경로를 좌표 리스트로 반환합니다."""
+        if self.distance() is None:
+            return None
+
+        cells = self.graph.cells
+        current = self.start
+        path = [self.graph.coord(current)]
+        while current not in self.goals:
+            best = None
+            for offset in self.graph.offsets:
+                neighbor = current + offset
+                if cells[neighbor] or self.g[neighbor] >= INF:
+                    continue
+                if best is None or self.g[neighbor] < self.g[best]:
+                    best = neighbor
+            current = best
+            path.append(self.graph.coord(current))
+        return path
+
+
+class IncrementalPlanner:
+    """건설현장 변경을 받아 등록된 경로들을 점진적으로 복구하는 플래너
+
+    집 → 카페 경로는 add_route로, 구조물 투어는 방문 순서를 정한 뒤
+    add_tour로 등록합니다. set_blocked로 칸을 막거나 열면 모든 탐색기에
+    변경만 알려 두고, 경로를 요청할 때 영향받은 부분만 다시 계산합니다.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        # 목표와 끊긴 경로는 D* Lite가 연결 영역 전체를 확장하기 전에 걸러 냄
+        self.connectivity = ConnectivityIndex(graph)
+        self.routes = {}
+        self.tours = {}
+
+    def add_route(self, name, start, goals):
+        """start에서 goals 중 가장 가까운 곳까지의 경로를 등록합니다."""
+        self.routes[name] = DStarLite(self.graph, start, goals)
+        return self.path(name)
+
+    def add_tour(self, name, points):
+        """points 순서대로 방문하고 처음 지점으로 돌아오는 투어를 등록합니다."""
+        legs = []
+        for a, b in zip(points, points[1:] + points[:1]):
+            legs.append(DStarLite(self.graph, a, [b]))
+        self.tours[name] = legs
+        return self.path(name)
+
+    def _searches(self):
+        yield from self.routes.values()
+        for legs in self.tours.values():
+            yield from legs
+
+    def set_blocked(self, pos, blocked=True):
+        """칸의 건설현장 여부를 바꾸고 변경 사항을 모든 탐색기에 알립니다."""
+        idx = self.graph.index(pos)
+        if not self.connectivity.set_blocked(pos, blocked):
+            return False
+        for search in self._searches():
+            search.cell_changed(idx)
+        return True
+
+    def path(self, name):
+        """등록된 경로 또는 투어의 현재 최단 경로를 반환합니다."""
+        if name in self.routes:
+            search = self.routes[name]
+            if not self._reachable(search):
+                return None
+            return search.path()
+
+        legs = self.tours[name]
+        if not all(self._reachable(leg) for leg in legs):
+            return None
+        total_path = None
+        for leg in legs:
+            segment = leg.path()
+            if segment is None:
+                return None
+            if total_path is None:
+                total_path = segment
+            else:
+                total_path.extend(segment[1:])
+        return total_path
+
+    def _reachable(self, search):
+        return self.connectivity.connected_cells(search.start, search.goals)
+
+    def expanded(self):
+        """지금까지 모든 탐색기가 확장한 노드 수의 합"""
+        return sum(search.expanded for search in self._searches())
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from csv_ingest import StructTable, read_merged
+
+SOURCE_FILES = ("area_map.csv", "area_struct.csv", "area_category.csv")
+CACHE_DIR_NAME = "merged_data_cache"
+MANIFEST_NAME = "manifest.json"
+CACHE_VERSION = 2
+
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(file_path):
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def source_fingerprints(data_folder):
+    """세 원본 CSV의 해시와 크기/수정 시각을 반환합니다."""
+    fingerprints = {}
+    for name in SOURCE_FILES:
+        file_path = os.path.join(data_folder, name)
+        fingerprints[name] = dict(
+            _source_stat(file_path), sha256=file_sha256(file_path)
+        )
+    return fingerprints
+
+
+def cache_dir(data_folder):
+    """병합 데이터 캐시 폴더 경로를 반환합니다."""
+    return os.path.join(data_folder, CACHE_DIR_NAME)
+
+
+def write_cache(merged, data_folder):
+    """병합 데이터를 컬럼별 .npy 파일과 원본 해시 매니페스트로 저장합니다.
+
+    struct 컬럼은 공용 코드표(StructTable)의 정수 코드(.npy, 결측: -1)와
+    이름 목록(매니페스트)으로 나눠 저장합니다. 매니페스트를 마지막에 쓰므로 매니페스트가 있으면
+    모든 컬럼 파일이 완성된 상태입니다.
+    """
+    folder = cache_dir(data_folder)
+    os.makedirs(folder, exist_ok=True)
+
+    manifest_path = os.path.join(folder, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    table = StructTable.load(data_folder)
+    columns = {}
+    struct_names = []
+    for column in merged.columns:
+        values = merged[column]
+        if column == "struct":
+            values = values.astype(table.dtype)
+            struct_names = [str(name) for name in values.cat.categories]
+            array = values.cat.codes.to_numpy()
+        else:
+            array = values.to_numpy()
+        np.save(os.path.join(folder, f"{column}.npy"), array)
+        columns[column] = str(array.dtype)
+
+    manifest = {
+        "version": CACHE_VERSION,
+        "rows": len(merged),
+        "columns": columns,
+        "struct_names": struct_names,
+        "sources": source_fingerprints(data_folder),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return folder
+
+
+def _read_manifest(data_folder):
+    manifest_path = os.path.join(cache_dir(data_folder), MANIFEST_NAME)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def is_cache_valid(manifest, data_folder):
+    """원본 CSV가 캐시를 만들 때와 같은 내용인지 확인합니다.
+
+    크기와 수정 시각이 같으면 해시 계산을 생략하고, 다를 때만 해시를 다시
+    계산해 비교합니다.
+    """
+    for name in SOURCE_FILES:
+        file_path = os.path.join(data_folder, name)
+        saved = manifest["sources"].get(name)
+        if saved is None or not os.path.exists(file_path):
+            return False
+        stat = _source_stat(file_path)
+        if stat["size"] != saved["size"]:
+            return False
+        if stat["mtime_ns"] != saved["mtime_ns"]:
+            if file_sha256(file_path) != saved["sha256"]:
+                return False
+    return True
+
+
+def load_cached_frame(data_folder, usecols=None):
+    """유효한 캐시가 있으면 메모리 매핑으로 DataFrame을 만들고, 없으면 None
+
+    usecols를 주면 그 컬럼 파일만 엽니다.
+    """
+    manifest = _read_manifest(data_folder)
+    if manifest is None or not is_cache_valid(manifest, data_folder):
+        return None
+
+    folder = cache_dir(data_folder)
+    data = {}
+    for column in manifest["columns"]:
+        if usecols is not None and column not in usecols:
+            continue
+        array = np.load(os.path.join(folder, f"{column}.npy"), mmap_mode="r")
+        if column == "struct":
+            # 코드 배열은 그대로 두고 이름 목록만 붙임 (-1: 결측)
+            array = pd.Categorical.from_codes(
+                array, categories=manifest["struct_names"]
+            )
+        data[column] = array
+    return pd.DataFrame(data, copy=False)
+
+
+def load_merged_data(file_path, usecols=None):
+    """병합 데이터를 불러옵니다 (캐시가 유효하면 CSV 파싱을 생략).
+
+    usecols: 필요한 컬럼만 읽을 때 컬럼 이름 목록 (없으면 전체)
+    struct 컬럼은 category 번호로 만든 공용 코드표의 Categorical입니다.
+    """
+    data_folder = os.path.dirname(file_path)
+    df = load_cached_frame(data_folder, usecols)
+    if df is None:
+        df = read_merged(file_path, StructTable.load(data_folder), usecols)
+    return df
@@ -1,11 +1,41 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib import font_manager
-import heapq
-import csv
+import argparse
 import os
-from itertools import permutations
+
+import pandas as pd
+
+import profiling
+from area_index import load_area
+from batch_routing import NearestCafeRouter
+from compact_path import Path
+from connectivity import ConnectivityIndex
+from cost_layers import cost_grid_from_frame
+from csv_ingest import BANDALGOM_COFFEE, MY_HOME, StructTable
+from distance_field import DistanceTable
+from grid_builder import StructureIndex, build_grid_layers
+from grid_graph import GridGraph
+from hierarchical_planner import HierarchicalPlanner
+from map_cache import cache_dir, load_merged_data
+from map_render import (
+    GRID_LINE_LIMIT,
+    draw_grid_lines,
+    draw_structure_markers,
+    rasterize_layers,
+)
+from parallel_search import ParallelRouter
+from pathfinding import find_path, path_cost
+from profiling import add_profile_argument, stage
+from tour_solver import (
+    DEFAULT_EXACT_LIMIT,
+    DEFAULT_TIME_BUDGET,
+    build_distance_matrix,
+    leg_path,
+    solve_tour,
+)
+
+DATA_FOLDER = os.path.join(os.path.dirname(__file__), "dataFile")
 
 
 # 한글 폰트 설정
@@ -23,238 +53,202 @@ def setup_korean_font():
         plt.rcParams["axes.unicode_minus"] = False
 
 
-def load_data():
-    """CSV 데이터를 로드합니다 (좌표 변환 없이)."""
-    data_folder = os.path.join(os.path.dirname(__file__), "dataFile")
-    file_path = os.path.join(data_folder, "merged_data.csv")
-    df = pd.read_csv(file_path)
-    # 좌표 변환 제거 - 원본 1-15 좌표계 유지
-    return df
-
-
-def create_grid_matrix(df):
-    """그리드 매트릭스를 생성합니다."""
-    max_x = df["x"].max()
-    max_y = df["y"].max()
-
-    # 그리드 초기화 (0: 이동 가능, 1: 건설현장으로 이동 불가)
-    # 1-15 좌표계를 위해 크기 조정
-    grid = [[0 for _ in range(max_x + 1)] for _ in range(max_y + 1)]
-
-    # 구조물 정보 저장
-    structures = {}
-
-    for _, row in df.iterrows():
-        x, y = int(row["x"]), int(row["y"])
-
-        # 건설현장은 이동 불가
-        if row["ConstructionSite"] == 1:
-            grid[y][x] = 1
-
-        # 구조물 정보 저장
-        if row["struct"] != "일반 지역":
-            structures[(x, y)] = row["struct"]
-
-    return grid, structures, max_x, max_y
-
-
-def heuristic(a, b):
-    """A* 알고리즘의 휴리스틱 함수 (맨하탄 거리)"""
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-
-def get_neighbors(pos, max_x, max_y):
-    """주변 4방향의 이웃 좌표를 반환합니다."""
-    x, y = pos
-    neighbors = []
-
-    # 4방향 이동 (상하좌우)
-    directions = [
-        (-1, 0),
-        (1, 0),
-        (0, -1),
-        (0, 1),
-    ]
+def hpa_cache_path(area=None):
+    """HPA* 입구 그래프 저장 파일 경로 (전체 지도/area별로 따로 저장)"""
+    name = "hpa_all.npz" if area is None else f"hpa_area{area}.npz"
+    return os.path.join(cache_dir(DATA_FOLDER), name)
 
-    for dx, dy in directions:
-        new_x, new_y = x + dx, y + dy
-        # 1-15 좌표계로 변경
-        if 1 <= new_x <= max_x and 1 <= new_y <= max_y:
-            neighbors.append((new_x, new_y))
 
-    return neighbors
+def load_data(area=None):
+    """CSV 데이터를 로드합니다 (좌표 변환 없이).
 
+    caffee_map.py가 만든 바이너리 캐시가 원본과 일치하면 CSV 파싱을 생략합니다.
+    area를 지정하면 해당 area 파티션만 불러옵니다.
+    """
+    if area is not None:
+        return load_area(area, DATA_FOLDER)
 
-def a_star_pathfinding(grid, start, goal, max_x, max_y):
-    """A* 알고리즘으로 최단 경로를 찾습니다."""
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-
-    while open_set:
-        current = heapq.heappop(open_set)[1]
-
-        if current == goal:
-            # 경로 재구성
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            return path[::-1]
-
-        for neighbor in get_neighbors(current, max_x, max_y):
-            nx, ny = neighbor
-
-            # 건설현장은 지나갈 수 없음
-            if grid[ny][nx] == 1:
-                continue
-
-            # 대각선 이동이 없으므로 항상 1씩 증가
-            tentative_g_score = g_score[current] + 1
-
-            if (
-                neighbor not in g_score
-                or tentative_g_score < g_score[neighbor]
-            ):
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = (
-                    g_score[neighbor] + heuristic(neighbor, goal)
-                )
+    file_path = os.path.join(DATA_FOLDER, "merged_data.csv")
+    df = load_merged_data(file_path)
+    # 좌표 변환 제거 - 원본 1-15 좌표계 유지
+    return df
 
-                if (f_score[neighbor], neighbor) not in open_set:
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
 
-    return None  # 경로를 찾을 수 없음
+def create_grid_matrix(df, table=None):
+    """그리드 매트릭스를 생성합니다.
+
+    grid[y][x]가 1이면 건설현장으로 이동 불가, 0이면 이동 가능합니다.
+    구조물 정보는 좌표/이름 배열을 가진 StructureIndex로 반환합니다.
+    table: 카테고리 코드표 (없으면 dataFile의 area_category.csv)
+    """
+    if table is None:
+        table = StructTable.load(DATA_FOLDER)
+    # 데이터에 없는 칸(다른 area)은 이동 불가로 처리
+    layers = build_grid_layers(df, missing=1)
+    structures = StructureIndex.from_frame(df, table)
+    return layers.construction, structures, layers.max_x, layers.max_y
+
+
+def a_star_pathfinding(
+    grid, start, goal, max_x, max_y, algorithm="astar", connectivity=None
+):
+    """A* 알고리즘으로 최단 경로를 찾습니다.
+
+    이미 만들어 둔 GridGraph를 grid로 넘기면 격자 변환 없이 바로 탐색합니다.
+    algorithm으로 "jps"(Jump Point Search)나 "bidir"(양방향 A*)를 고를 수
+    있습니다. 같은 격자를 여러 번 탐색할 때는 ConnectivityIndex를
+    connectivity로 넘기면 도달할 수 없는 목표는 탐색 없이 None을 반환합니다.
+    없으면 목표 칸이 막혔는지만 먼저 확인합니다.
+    """
+    graph = (
+        grid if isinstance(grid, GridGraph) else GridGraph(grid, max_x, max_y)
+    )
+    if not graph.is_passable(goal) or not graph.is_passable(start):
+        return None
+    return find_path(graph, start, goal, algorithm, connectivity)
 
 
-def calculate_path_distance(path):
-    """경로의 총 거리를 계산합니다."""
+def calculate_path_distance(path, graph=None):
+    """경로의 총 거리를 계산합니다 (가중치 격자를 주면 이동 비용 합)."""
     if not path or len(path) < 2:
         return 0
+    if graph is not None:
+        return path_cost(graph, path)
 
     # 경로의 길이는 단계의 수와 동일 (대각선 이동 없음)
     return len(path) - 1
 
 
-def find_optimal_structure_tour(grid, home, structures, max_x, max_y):
-    """모든 구조물을 한 번씩 방문하는 최적화된 경로를 계산합니다 (TSP 변형)."""
-    # 구조물 위치만 추출 (내 집 제외)
+def find_optimal_structure_tour(
+    grid,
+    home,
+    structures,
+    max_x,
+    max_y,
+    exact_limit=DEFAULT_EXACT_LIMIT,
+    time_budget=DEFAULT_TIME_BUDGET,
+    workers=None,
+    costs=None,
+    diagonal=False,
+    connectivity=None,
+):
+    """모든 구조물을 한 번씩 방문하는 최적화된 경로를 계산합니다 (TSP 변형).
+
+    집과 각 구조물에서 BFS 거리장을 한 번씩 만들어 최단 거리 행렬을 구한 뒤, 구조물 수가 exact_limit 이하이면
+    Held-Karp 비트마스크 DP로 정확해를, 초과하면 최근접 이웃 + 2-opt/Or-opt
+    휴리스틱(time_budget 초 이내)으로 순회 순서를 정합니다.
+    workers가 2 이상이면 거리 행렬 행과 후보 순회 경로를 여러 프로세스에
+    나눠 계산합니다 (parallel_search.py). 이때 후보 개선은 time_budget이
+    아니라 개선 횟수로 멈추므로 작업자 수와 관계없이 같은 순서가 나옵니다.
+    costs(칸별 이동 비용)나 diagonal(8방향 이동)을 주면 거리장을 Dijkstra로
+    구하고 이동 비용 합으로 순회 순서를 정합니다 (병렬 계산은 사용하지 않음).
+    집과 다른 연결 요소에 있는 구조물이 있으면 거리장을 만들기 전에
+    (None, 0)을 반환합니다 (connectivity: 이미 만든 ConnectivityIndex).
+    """
+    # 구조물 위치만 추출 (내 집, 빈 칸, 건설현장 위 구조물 제외)
+    structures = StructureIndex.from_mapping(structures)
     structure_positions = [
-        pos for pos, name in structures.items() if "MyHome" not in name
+        pos
+        for pos in structures.positions(exclude=(0, MY_HOME))
+        if grid[pos[1]][pos[0]] != 1
     ]
 
     if not structure_positions:
         return None, 0
 
-    best_total_path = None
-    best_total_distance = float("inf")
-
-    # 모든 구조물 방문 순서의 순열을 시도
-    for perm in permutations(structure_positions):
-        total_path = [home]  # 집에서 시작
-        total_distance = 0
-        current_pos = home
-        valid_tour = True
+    points = [home] + structure_positions
+    graph = GridGraph(grid, max_x, max_y, costs, diagonal)
+    if connectivity is None:
+        connectivity = ConnectivityIndex(graph)
+    if not connectivity.all_connected(points):
+        return None, 0
 
-        # 각 구조물을 순서대로 방문
-        for target_pos in perm:
-            path_segment = a_star_pathfinding(
-                grid, current_pos, target_pos, max_x, max_y
-            )
-            if path_segment is None:
-                valid_tour = False
-                break
-
-            # 경로 연결 (시작점 중복 제거)
-            total_path.extend(path_segment[1:])
-            total_distance += calculate_path_distance(path_segment)
-            current_pos = target_pos
-
-        # 마지막에 집으로 돌아가기
-        if valid_tour:
-            return_path = a_star_pathfinding(
-                grid, current_pos, home, max_x, max_y
-            )
-            if return_path is not None:
-                total_path.extend(return_path[1:])
-                total_distance += calculate_path_distance(return_path)
+    if workers and workers > 1 and graph.unit_cost:
+        with ParallelRouter(graph, workers) as router:
+            dist, legs = router.distance_matrix(points)
+            if len(structure_positions) <= exact_limit:
+                order, total_distance = solve_tour(dist, exact_limit)
+            else:
+                # 후보 개선 횟수로 멈추므로 결과가 작업자 수와 무관함
+                order, total_distance = router.best_tour(dist)
+                if router.cut_off:
+                    print(
+                        f"안전장치 시간 초과로 후보 {router.cut_off}개의 "
+                        "개선이 중단되었습니다."
+                    )
+    else:
+        table = DistanceTable(graph, points)
+        cost_fn = None if graph.unit_cost else (lambda p: path_cost(graph, p))
+        dist, legs = build_distance_matrix(points, table.path, cost_fn)
+        order, total_distance = solve_tour(dist, exact_limit, time_budget)
+
+    if order is None:
+        return None, 0
 
-                if total_distance < best_total_distance:
-                    best_total_path = total_path
-                    best_total_distance = total_distance
+    # 방문 순서대로 구간 경로 연결 (시작점 중복 제거), 마지막에 집으로 복귀
+    # 구간 경로는 셀 번호 배열 view로만 이어 붙임 (복사 없음)
+    total_path = Path.concat(
+        Path.from_coords(leg_path(legs, a, b), graph.stride)
+        for a, b in zip(order, order[1:] + [0])
+    )
 
-    return best_total_path, best_total_distance
+    return total_path, total_distance
 
 
 def save_path_to_csv(path, filename):
-    """경로를 CSV 파일로 저장합니다."""
-    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["step", "x", "y"])
-        for i, (x, y) in enumerate(path):
-            writer.writerow([i + 1, x, y])
-
-
-def draw_map_with_path(df, path, structures, max_x, max_y, bonus_path=None):
-    """지도와 경로를 그립니다 - 1,1 좌표계 시작"""
+    """경로를 CSV 파일로 저장합니다 (셀 번호 버퍼에서 덩어리 단위로 기록)."""
+    Path.from_coords(path).write_csv(filename)
+
+
+def draw_map_with_path(
+    df,
+    path,
+    structures,
+    max_x,
+    max_y,
+    bonus_path=None,
+    output_path="map_final.png",
+    graph=None,
+):
+    """지도와 경로를 그립니다 - 1,1 좌표계 시작
+
+    구조물 마커는 df의 카테고리 격자로 그리고, 번호는 structures의
+    코드표로 해석합니다.
+    graph(가중치 격자)를 주면 정보 상자의 거리를 이동 비용 합으로 표시합니다.
+    """
+    table = StructureIndex.from_mapping(structures).table
     fig, ax = plt.subplots(figsize=(14, 12))
 
-    # 배경 설정 (1-15 좌표계)
+    # 건설현장은 칸 하나가 픽셀 하나인 이미지 한 장으로 그리기 (1-based 좌표계)
+    layers = build_grid_layers(df)
+    construction = layers.construction[1:, 1:]
+    category = layers.category[1:, 1:]
+    ax.imshow(
+        rasterize_layers(construction),
+        interpolation="nearest",
+        extent=(0.5, max_x + 0.5, max_y + 0.5, 0.5),
+        alpha=0.7,
+        zorder=0,
+    )
     ax.set_xlim(0.5, max_x + 0.5)
     ax.set_ylim(0.5, max_y + 0.5)
     ax.set_aspect("equal")
 
     # 그리드 라인 그리기
-    for i in range(1, max_x + 2):
-        ax.axvline(x=i - 0.5, color="lightgray", linewidth=0.5)
-    for i in range(1, max_y + 2):
-        ax.axhline(y=i - 0.5, color="lightgray", linewidth=0.5)
-
-    # 건설현장과 구조물 그리기
-    for _, row in df.iterrows():
-        x, y = int(row["x"]), int(row["y"])
-
-        # 건설현장 (회색 사각형)
-        if row["ConstructionSite"] == 1:
-            rect = patches.Rectangle(
-                (x - 0.4, y - 0.4),
-                0.8,
-                0.8,
-                linewidth=1,
-                edgecolor="gray",
-                facecolor="gray",
-                alpha=0.7,
-            )
-            ax.add_patch(rect)
-            continue  # 건설현장이면 다른 구조물은 그리지 않음
-
-        # 구조물 그리기
-        struct = str(row["struct"]).strip()
-        if struct == "Apartment" or struct == "Building":
-            circle = patches.Circle((x, y), 0.3, color="brown", alpha=0.8)
-            ax.add_patch(circle)
-        elif struct == "MyHome":
-            triangle = patches.RegularPolygon(
-                (x, y), 3, radius=0.3, orientation=0, color="green", alpha=0.8
-            )
-            ax.add_patch(triangle)
-        elif struct == "BandalgomCoffee":
-            # 반달곰 커피 색상을 초록색으로 변경
-            rect = patches.Rectangle(
-                (x - 0.3, y - 0.3),
-                0.6,
-                0.6,
-                linewidth=1,
-                edgecolor="green",
-                facecolor="green",
-                alpha=0.8,
-            )
-            ax.add_patch(rect)
+    draw_grid_lines(
+        ax, max_x, max_y, offset=1, color="lightgray", linewidth=0.5
+    )
+
+    # 구조물은 카테고리별 scatter 한 번씩 (건설현장 위 구조물은 제외)
+    draw_structure_markers(
+        ax,
+        category,
+        construction,
+        offset=1,
+        size=200,
+        label_limit=0,
+        table=table,
+    )
 
     # 기본 최단 경로 그리기 (빨간 선)
     if path and len(path) > 1:
@@ -284,8 +278,9 @@ def draw_map_with_path(df, path, structures, max_x, max_y, bonus_path=None):
         )
 
     # 좌표축 설정 (1-15 좌표계)
-    ax.set_xticks(range(1, max_x + 1))
-    ax.set_yticks(range(1, max_y + 1))
+    if max(max_x, max_y) <= GRID_LINE_LIMIT:
+        ax.set_xticks(range(1, max_x + 1))
+        ax.set_yticks(range(1, max_y + 1))
     ax.invert_yaxis()  # y축 뒤집기 (좌상단이 (1,1))
 
     # 제목과 라벨
@@ -328,12 +323,12 @@ def draw_map_with_path(df, path, structures, max_x, max_y, bonus_path=None):
     # 정보 텍스트 박스
     info_lines = []
     if path:
-        distance = calculate_path_distance(path)
+        distance = calculate_path_distance(path, graph)
         info_lines.append(f"최단 경로: {len(path)}단계")
         info_lines.append(f"총 거리: {distance:.2f}칸")
 
     if bonus_path:
-        bonus_distance = calculate_path_distance(bonus_path)
+        bonus_distance = calculate_path_distance(bonus_path, graph)
         info_lines.append(f"구조물 투어: {len(bonus_path)}단계")
         info_lines.append(f"투어 거리: {bonus_distance:.2f}칸")
 
@@ -350,46 +345,58 @@ def draw_map_with_path(df, path, structures, max_x, max_y, bonus_path=None):
         )
 
     plt.tight_layout()
-    plt.savefig("map_final.png", dpi=300, bbox_inches="tight")
+    plt.savefig(output_path, dpi=300, bbox_inches="tight")
     plt.close()
 
 
 def find_coffee_locations(structures):
     """카페 위치를 찾습니다."""
-    coffee_locations = []
-    for pos, struct in structures.items():
-        if isinstance(struct, str) and "BandalgomCoffee" in struct:
-            coffee_locations.append(pos)
-    return coffee_locations
+    return StructureIndex.from_mapping(structures).positions(BANDALGOM_COFFEE)
 
 
-def find_home_location(structures):
-    """내 집 위치를 찾습니다."""
-    for pos, struct in structures.items():
-        if isinstance(struct, str) and "MyHome" in struct:
-            return pos
-    return None
+def find_home_locations(structures):
+    """모든 내 집 위치를 찾습니다."""
+    return StructureIndex.from_mapping(structures).positions(MY_HOME)
 
 
-def main():
-    """메인 함수"""
+def find_home_location(structures):
+    """내 집 위치를 찾습니다."""
+    return StructureIndex.from_mapping(structures).first(MY_HOME)
+
+
+def main(
+    area=None,
+    workers=None,
+    hpa=False,
+    weighted=False,
+    diagonal=False,
+    congestion=None,
+):
+    """메인 함수 (area를 지정하면 해당 area 안에서만 경로를 탐색)
+
+    hpa가 True이면 저장된 구역 추상 그래프(HPA*)로 가장 가까운 커피숍을
+    고르고 그 경로만 칸 단위로 채웁니다 (큰 지도용, 최단 경로보다 조금 길 수 있음).
+    weighted가 True이면 area/구조물/혼잡도(congestion CSV)로 만든 칸별 이동
+    비용을, diagonal이 True이면 8방향 이동을 사용합니다.
+    """
     try:
         # 한글 폰트 설정
         setup_korean_font()
 
         # 데이터 로드
-        print("데이터를 로드하는 중...")
-        df = load_data()
+        if area is None:
+            message = "데이터를 로드하는 중..."
+        else:
+            message = f"area {area} 데이터를 로드하는 중..."
+        with stage("load_data", message, area=area):
+            df = load_data(area)
 
         # 그리드 매트릭스 생성
-        print("그리드 매트릭스를 생성하는 중...")
-        grid, structures, max_x, max_y = create_grid_matrix(df)
+        with stage("grid_build", "그리드 매트릭스를 생성하는 중..."):
+            grid, structures, max_x, max_y = create_grid_matrix(df)
 
         print(f"지도 크기: {max_x} x {max_y} (1-{max_x} x 1-{max_y})")
-        print(
-            f'총 구조물 개수: '
-            f'{len([s for s in structures.values() if s != "일반 지역"])}개'
-        )
+        print(f"총 구조물 개수: {len(structures)}개")
 
         # 시작점과 도착점 찾기
         home_location = find_home_location(structures)
@@ -406,27 +413,56 @@ def main():
         print(f"시작점 (내 집): {home_location}")
         print(f"도착점 후보 (반달곰 커피): {coffee_locations}")
 
-        # 가장 가까운 커피숍 찾기
-        best_path = None
-        best_goal = None
-        shortest_distance = float("inf")
-
-        for coffee_pos in coffee_locations:
-            print(f"\n{coffee_pos} 위치의 반달곰 커피로의 경로를 탐색 중...")
-            path = a_star_pathfinding(
-                grid, home_location, coffee_pos, max_x, max_y
-            )
-
-            if path:
-                distance = calculate_path_distance(path)
-                print(f"경로 발견: {len(path)}단계, 거리: {distance:.2f}칸")
-
-                if distance < shortest_distance:
-                    best_path = path
-                    best_goal = coffee_pos
-                    shortest_distance = distance
+        costs = None
+        if weighted or congestion:
+            with stage("cost_layers", "칸별 이동 비용을 계산하는 중..."):
+                congestion_df = (
+                    pd.read_csv(congestion) if congestion else None
+                )
+                costs = cost_grid_from_frame(
+                    df, congestion=congestion_df, table=structures.table
+                )
+        graph = GridGraph(grid, max_x, max_y, costs, diagonal)
+        router = None
+        if hpa:
+            with stage(
+                "hpa_route",
+                "\n구역 추상 그래프(HPA*)로 가장 가까운 커피숍을 찾는 중...",
+            ):
+                planner = HierarchicalPlanner.load_or_build(
+                    graph, hpa_cache_path(area)
+                )
+                route = planner.nearest_route(home_location, coffee_locations)
+            print(f"다시 계산한 구역: {planner.rebuilt}개")
+        else:
+            # 가장 가까운 커피숍 찾기: 모든 커피숍에서 동시에 BFS 한 번
+            with stage(
+                "nearest_cafe",
+                "\n모든 반달곰 커피에서 거리장을 계산하는 중...",
+            ):
+                router = NearestCafeRouter(graph, coffee_locations)
+                route = router.route(home_location)
+
+        # 내 집이 여러 곳이면 같은 거리장으로 한꺼번에 조회
+        home_locations = find_home_locations(structures)
+        if router is not None and len(home_locations) > 1:
+            print(f"\n내 집 {len(home_locations)}곳의 가장 가까운 커피숍:")
+            with stage("batch_routes", homes=len(home_locations)):
+                routes = router.route_many(home_locations)
+            for other in routes:
+                print(f"  {other.origin} -> {other.cafe} ({other.distance}칸)")
+
+        best_goal, shortest_distance, best_path = (
+            route.cafe,
+            route.distance,
+            route.path,
+        )
 
         if best_path:
+            print(
+                f"경로 발견: {len(best_path)}단계, "
+                f"거리: {shortest_distance:.2f}칸"
+            )
             print("\n=== 최단 경로 결과 ===")
             print(f"목적지: {best_goal}")
             print(f"경로 길이: {len(best_path)}단계")
@@ -434,19 +470,43 @@ def main():
             print(f'경로: {" -> ".join([f"({x},{y})" for x, y in best_path])}')
 
             # CSV 파일로 저장
-            print("\n경로를 CSV 파일로 저장하는 중...")
-            save_path_to_csv(best_path, "home_to_cafe.csv")
+            with stage("save_csv", "\n경로를 CSV 파일로 저장하는 중..."):
+                save_path_to_csv(best_path, "home_to_cafe.csv")
             print("home_to_cafe.csv 파일이 저장되었습니다.")
 
-            # 보너스 기능 비활성화
-            print("\n보너스 기능은 계산 시간이 오래 걸려 생략합니다.")
-            bonus_path = None
-
-            # 지도 시각화 (보너스 경로 없이)
-            print("\n지도를 시각화하는 중...")
-            draw_map_with_path(
-                df, best_path, structures, max_x, max_y, bonus_path
-            )
+            # 보너스: 모든 구조물 방문 경로
+            with stage(
+                "tour", "\n모든 구조물을 방문하는 경로를 계산하는 중..."
+            ):
+                bonus_path, bonus_distance = find_optimal_structure_tour(
+                    grid,
+                    home_location,
+                    structures,
+                    max_x,
+                    max_y,
+                    workers=workers,
+                    costs=costs,
+                    diagonal=diagonal,
+                )
+            if bonus_path:
+                print(
+                    f"구조물 투어: {len(bonus_path)}단계, "
+                    f"거리: {bonus_distance:.2f}칸"
+                )
+            else:
+                print("모든 구조물을 방문하는 경로를 찾을 수 없습니다.")
+
+            # 지도 시각화
+            with stage("render", "\n지도를 시각화하는 중..."):
+                draw_map_with_path(
+                    df,
+                    best_path,
+                    structures,
+                    max_x,
+                    max_y,
+                    bonus_path,
+                    graph=None if graph.unit_cost else graph,
+                )
             print("map_final.png 파일이 저장되었습니다.")
 
         else:
@@ -462,4 +522,45 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="최단 경로 탐색")
+    parser.add_argument(
+        "--area", type=int, default=None, help="이 area 안에서만 경로 탐색"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="구조물 투어 계산에 쓸 프로세스 수 (기본: 1개, 병렬 없음)",
+    )
+    parser.add_argument(
+        "--hpa",
+        action="store_true",
+        help="큰 지도용 계층 탐색(HPA*) 사용 (구역 그래프를 저장해 재사용)",
+    )
+    parser.add_argument(
+        "--weighted",
+        action="store_true",
+        help="area/구조물별 칸 이동 비용 사용 (cost_layers.py)",
+    )
+    parser.add_argument(
+        "--diagonal", action="store_true", help="8방향(대각선) 이동 허용"
+    )
+    parser.add_argument(
+        "--congestion",
+        default=None,
+        metavar="CSV",
+        help="x, y, congestion 컬럼의 혼잡도 CSV (칸 이동 비용에 더함)",
+    )
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.hpa and (args.weighted or args.diagonal or args.congestion):
+        parser.error("--hpa는 단위 비용 4방향 이동에서만 사용할 수 있습니다.")
+    profiling.enable(args.profile)
+    main(
+        args.area,
+        args.workers,
+        args.hpa,
+        args.weighted,
+        args.diagonal,
+        args.congestion,
+    )
@@ -1,10 +1,29 @@
+import argparse
 import os
 import platform
 
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
+
+import profiling
+from area_index import load_area
+from csv_ingest import (
+    APARTMENT,
+    BANDALGOM_COFFEE,
+    BUILDING,
+    MY_HOME,
+    StructTable,
+)
+from grid_builder import build_grid_layers
+from map_render import (
+    GRID_LINE_LIMIT,
+    draw_grid_lines,
+    draw_structure_markers,
+    rasterize_layers,
+    render_tile_pyramid,
+)
+from map_cache import load_merged_data
+from profiling import add_profile_argument, stage
 
 
 def setup_korean_font():
@@ -25,20 +44,30 @@ def setup_korean_font():
 
 
 class MapDrawer:
-    def __init__(self, data_file="dataFile/merged_data.csv"):
-        """지도 그리기 클래스"""
+    def __init__(self, data_file="dataFile/merged_data.csv", area=None):
+        """지도 그리기 클래스 (area를 지정하면 해당 area만 불러옴)"""
         setup_korean_font()  # 한글 폰트 설정
 
         self.data_file = data_file
+        self.area = area
         self.df = None
-        self.grid_size = 15
+        self.table = None
+        self.max_x = 0
+        self.max_y = 0
         self.load_data()
 
     def load_data(self):
         """통합된 데이터를 불러오는 함수"""
         try:
             file_path = os.path.join(os.path.dirname(__file__), self.data_file)
-            self.df = pd.read_csv(file_path)
+            self.table = StructTable.load(os.path.dirname(file_path))
+            with stage("load_data", area=self.area):
+                if self.area is None:
+                    self.df = load_merged_data(file_path)
+                else:
+                    self.df = load_area(self.area, os.path.dirname(file_path))
+            self.max_x = int(self.df["x"].max())
+            self.max_y = int(self.df["y"].max())
             print(f"데이터 로딩 완료: {len(self.df)}개 데이터 포인트")
             print(f"컬럼: {list(self.df.columns)}")
         except Exception as e:
@@ -46,122 +75,66 @@ class MapDrawer:
 
     def create_grid_matrices(self):
         """시각화를 위한 격자 행렬들을 생성하는 함수"""
-        # 각 속성별로 15x15 격자 생성
-        construction_grid = np.zeros((self.grid_size, self.grid_size))
-        area_grid = np.zeros((self.grid_size, self.grid_size))
-        category_grid = np.zeros((self.grid_size, self.grid_size))
-
-        for _, row in self.df.iterrows():
-            x, y = int(row["x"]) - 1, int(row["y"]) - 1  # 1-based를 0-based로 변환
-            if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
-                construction_grid[y, x] = row["ConstructionSite"]
-                area_grid[y, x] = row["area"]
-                category_grid[y, x] = row["category"]
-
-        return construction_grid, area_grid, category_grid
-
-    def draw_map(self, save_as_png=True):
-        """지도를 그리는 메인 함수"""
+        # 지도 크기만큼의 격자를 한 번에 채운 뒤 0-based 좌표로 자름
+        layers = build_grid_layers(self.df)
+        return (
+            layers.construction[1:, 1:],
+            layers.area[1:, 1:],
+            layers.category[1:, 1:],
+        )
+
+    def draw_map(self, save_as_png=True, tiles_dir=None):
+        """지도를 그리는 메인 함수
+
+        모든 격자 레이어를 RGBA 이미지 한 장으로 합쳐 imshow로 그리고,
+        구조물 마커는 카테고리별 scatter 한 번씩으로 그립니다.
+        tiles_dir를 주면 확대/축소용 z/x/y 타일 피라미드도 저장합니다.
+        """
         print("\n지역 지도 생성 중...")
         print("=" * 50)
 
-        (construction_grid, area_grid, _) = self.create_grid_matrices()
+        with stage("grid_build"):
+            construction_grid, area_grid, category_grid = (
+                self.create_grid_matrices()
+            )
 
         # 지도 생성 - 창 크기 설정
         plt.figure(figsize=(10, 8))
-
-        # 배경: 지역별 색상
-        plt.imshow(area_grid, cmap="Pastel1", alpha=0.3)
-
-        # 1단계: 먼저 일반 구조물들을 그리기 (건설 현장이 아닌 것들)
-        for _, row in self.df.iterrows():
-            x, y = int(row["x"]) - 1, int(row["y"]) - 1  # 1-based를 0-based로 변환
-            cat_id = row["category"]
-            is_construction = row["ConstructionSite"] == 1
-
-            # 건설 현장이 아닌 경우에만 구조물 표시
-            if not is_construction and cat_id > 0:
-                if cat_id == 1:  # 아파트 - 갈색 원형
-                    plt.scatter(
-                        x, y, c="brown", s=150, marker="o", alpha=0.8, zorder=2
-                    )
-                    plt.annotate(
-                        "아파트",
-                        (x, y),
-                        xytext=(5, 5),
-                        textcoords="offset points",
-                        fontsize=9,
-                        zorder=3,
-                    )
-                elif cat_id == 2:  # 빌딩 - 갈색 원형
-                    plt.scatter(
-                        x, y, c="brown", s=150, marker="o", alpha=0.8, zorder=2
-                    )
-                    plt.annotate(
-                        "빌딩",
-                        (x, y),
-                        xytext=(5, 5),
-                        textcoords="offset points",
-                        fontsize=9,
-                        zorder=3,
-                    )
-                elif cat_id == 3:  # 내 집 - 녹색 삼각형
-                    plt.scatter(
-                        x, y, c="green", s=150, marker="^", alpha=0.8, zorder=2
-                    )
-                    plt.annotate(
-                        "내 집",
-                        (x, y),
-                        xytext=(5, 5),
-                        textcoords="offset points",
-                        fontsize=9,
-                        zorder=3,
-                    )
-                elif cat_id == 4:  # 반달곰 커피 - 녹색 사각형
-                    plt.scatter(
-                        x, y, c="green", s=150, marker="s", alpha=0.8, zorder=2
-                    )
-                    plt.annotate(
-                        "반달곰커피",
-                        (x, y),
-                        xytext=(5, 5),
-                        textcoords="offset points",
-                        fontsize=9,
-                        zorder=3,
-                    )
-
-        # 2단계: 건설 현장을 나중에 그리기 (겹침 우선순위)
-        construction_y, construction_x = np.where(construction_grid == 1)
-
-        # 건설 현장을 회색 사각형으로 표시 (살짝 큰 크기로 겹침 허용)
-        for cx, cy in zip(construction_x, construction_y):
-            # 사각형 패치를 사용하여 정확한 위치에 그리기
-            rect = patches.Rectangle(
-                (cx - 0.4, cy - 0.4),
-                0.8,
-                0.8,
-                linewidth=1,
-                edgecolor="darkgray",
-                facecolor="gray",
-                alpha=0.9,
-                zorder=4,
-            )
-            plt.gca().add_patch(rect)
+        ax = plt.gca()
+
+        # 배경(지역별 색상)과 건설 현장을 이미지 한 장으로 그리기
+        # 건설 현장은 구조물보다 위에 보이도록 마커보다 나중 레이어로 한 번 더 그림
+        plt.imshow(
+            rasterize_layers(construction_grid, area=area_grid),
+            interpolation="nearest",
+            zorder=0,
+        )
+        draw_structure_markers(
+            ax, category_grid, construction_grid, table=self.table
+        )
+        plt.imshow(
+            rasterize_layers(construction_grid),
+            interpolation="nearest",
+            zorder=4,
+        )
 
         # 격자 표시
-        for i in range(self.grid_size + 1):
-            plt.axhline(i - 0.5, color="black", linewidth=0.5, zorder=1)
-            plt.axvline(i - 0.5, color="black", linewidth=0.5, zorder=1)
+        draw_grid_lines(
+            ax, self.max_x, self.max_y, color="black", linewidth=0.5
+        )
 
         # 좌표 라벨 추가 (좌측 상단이 (1,1))
-        plt.xticks(range(self.grid_size), range(1, self.grid_size + 1))
-        plt.yticks(range(self.grid_size), range(1, self.grid_size + 1))
+        if max(self.max_x, self.max_y) <= GRID_LINE_LIMIT:
+            plt.xticks(range(self.max_x), range(1, self.max_x + 1))
+            plt.yticks(range(self.max_y), range(1, self.max_y + 1))
 
         # Y축 반전 제거 - 이미 데이터 변환에서 처리됨
         # plt.gca().invert_yaxis()  # 이 줄을 주석 처리
 
         plt.title(
-            "지역 지도 (15x15 격자) - 좌측 상단 (1,1)", fontsize=16, fontweight="bold"
+            f"지역 지도 ({self.max_x}x{self.max_y} 격자) - 좌측 상단 (1,1)",
+            fontsize=16,
+            fontweight="bold",
         )
         plt.xlabel("X 좌표")
         plt.ylabel("Y 좌표")
@@ -186,38 +159,22 @@ class MapDrawer:
                 loc="upper left"
             )
 
-        # 지도 정보 텍스트
-        apartment_count = len(
-            self.df[
-                (self.df["category"] == 1) & (self.df["ConstructionSite"] == 0)
-            ]
-        )
-        building_count = len(
-            self.df[
-                (self.df["category"] == 2) & (self.df["ConstructionSite"] == 0)
-            ]
-        )
-        home_count = len(
-            self.df[
-                (self.df["category"] == 3) & (self.df["ConstructionSite"] == 0)
-            ]
-        )
-        coffee_count = len(
-            self.df[
-                (self.df["category"] == 4) & (self.df["ConstructionSite"] == 0)
-            ]
-        )
-        construction_count = len(construction_x)
+        # 지도 정보 텍스트 (카테고리 번호는 코드표에서 이름으로 찾음)
+        apartment_count = self.count_visible(APARTMENT)
+        building_count = self.count_visible(BUILDING)
+        home_count = self.count_visible(MY_HOME)
+        coffee_count = self.count_visible(BANDALGOM_COFFEE)
+        construction_count = int((construction_grid == 1).sum())
 
         info_text = f"""지도 정보:
-• 총 {self.grid_size}x{self.grid_size} = {self.grid_size**2}개 구역
+• 총 {self.max_x}x{self.max_y} = {self.max_x * self.max_y}개 구역
 • 건설 현장: {construction_count}개 (회색 사각형)
 • 아파트: {apartment_count}개 (갈색 원형)
 • 빌딩: {building_count}개 (갈색 원형)
 • 내 집: {home_count}개 (녹색 삼각형)
 • 반달곰커피: {coffee_count}개 (녹색 사각형)
-• 좌표 범위: (1,1) ~ ({self.grid_size},{self.grid_size})
-• 좌측 상단이 (1,1), 우측 하단이 ({self.grid_size},{self.grid_size})
+• 좌표 범위: (1,1) ~ ({self.max_x},{self.max_y})
+• 좌측 상단이 (1,1), 우측 하단이 ({self.max_x},{self.max_y})
 • 건설 현장과 구조물 겹침 시 건설 현장 우선"""
 
         plt.figtext(
@@ -233,15 +190,30 @@ class MapDrawer:
         # PNG 파일로 저장
         if save_as_png:
             output_path = os.path.join(os.path.dirname(__file__), "map.png")
-            plt.savefig(
-                output_path,
-                dpi=300,
-                bbox_inches="tight",
-                facecolor="white",
-                edgecolor="none",
-            )
+            with stage("savefig"):
+                plt.savefig(
+                    output_path,
+                    dpi=300,
+                    bbox_inches="tight",
+                    facecolor="white",
+                    edgecolor="none",
+                )
             print(f"\n지도가 저장되었습니다: {output_path}")
 
+        # 큰 지도는 확대/축소해서 볼 수 있도록 타일로도 저장
+        if tiles_dir is not None:
+            with stage("tiles"):
+                tile_count = render_tile_pyramid(
+                    rasterize_layers(
+                        construction_grid,
+                        area=area_grid,
+                        category=category_grid,
+                        table=self.table,
+                    ),
+                    tiles_dir,
+                )
+            print(f"지도 타일 {tile_count}개가 저장되었습니다: {tiles_dir}")
+
         plt.show()
 
         return (
@@ -252,7 +224,19 @@ class MapDrawer:
             coffee_count,
         )
 
-    def print_summary(self):
+    def count_visible(self, name):
+        """건설현장이 아닌 칸에 있는 해당 이름의 구조물 수를 셉니다."""
+        code = self.table.code(name)
+        if code is None:
+            return 0
+        return int(
+            (
+                (self.df["category"] == code)
+                & (self.df["ConstructionSite"] == 0)
+            ).sum()
+        )
+
+    def print_summary(self, tiles_dir=None):
         """지도 생성 결과 요약 출력"""
         (
             construction_count,
@@ -260,7 +244,7 @@ class MapDrawer:
             building_count,
             home_count,
             coffee_count,
-        ) = self.draw_map()
+        ) = self.draw_map(tiles_dir=tiles_dir)
 
         print("\n" + "=" * 50)
         print("지도 생성 완료 요약")
@@ -272,28 +256,28 @@ class MapDrawer:
         print(f"반달곰커피: {coffee_count}개 위치")
         print("\n특징:")
         print(
-            f"   - 좌측 상단이 (1,1), 우측 하단이 ({self.grid_size},{self.grid_size})"
+            f"   - 좌측 상단이 (1,1), 우측 하단이 ({self.max_x},{self.max_y})"
         )
         print("   - 건설 현장은 회색 사각형으로 표시 (겹침 허용)")
         print("   - 건설 현장과 구조물 겹침 시 건설 현장 우선")
         print("   - 결과 이미지: map.png로 저장")
 
 
-def main():
+def main(area=None, tiles_dir=None):
     """메인 실행 함수"""
     try:
         print("지역 지도 생성 시스템")
         print("=" * 60)
 
         # MapDrawer 인스턴스 생성
-        drawer = MapDrawer()
+        drawer = MapDrawer(area=area)
 
         if drawer.df is None:
             print("데이터를 불러올 수 없습니다. 프로그램을 종료합니다.")
             return
 
         # 지도 생성 및 요약 출력
-        drawer.print_summary()
+        drawer.print_summary(tiles_dir)
 
         print("\n지도 생성이 완료되었습니다!")
         print("생성된 파일: map.png")
@@ -307,4 +291,20 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="지역 지도 그리기")
+    parser.add_argument(
+        "--area",
+        type=int,
+        default=None,
+        help="해당 area만 불러와서 그림 (기본: 전체 지도)",
+    )
+    parser.add_argument(
+        "--tiles",
+        default=None,
+        metavar="DIR",
+        help="확대/축소용 z/x/y 타일 피라미드를 저장할 폴더",
+    )
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.enable(args.profile)
+    main(args.area, args.tiles)
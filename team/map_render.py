@@ -0,0 +1,188 @@
+import math
+import os
+
+import matplotlib.colors as mcolors
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+
+from csv_ingest import (
+    APARTMENT,
+    BANDALGOM_COFFEE,
+    BUILDING,
+    MY_HOME,
+    StructTable,
+)
+
+# 구조물 이름 → (라벨, 색상, 마커). 격자의 카테고리 번호는 코드표로 이름을 찾음
+STRUCTURE_STYLES = {
+    APARTMENT: ("아파트", "brown", "o"),
+    BUILDING: ("빌딩", "brown", "o"),
+    MY_HOME: ("내 집", "green", "^"),
+    BANDALGOM_COFFEE: ("반달곰커피", "green", "s"),
+}
+CONSTRUCTION_RGBA = (128, 128, 128, 230)
+
+# 이 개수를 넘으면 구조물 이름표를, 이 크기를 넘으면 칸 격자선을 생략
+LABEL_LIMIT = 200
+GRID_LINE_LIMIT = 100
+
+
+def structure_styles(table=None):
+    """코드표(StructTable)로 카테고리 번호 → (라벨, 색상, 마커)를 만듭니다.
+
+    table이 없으면 기본 코드표를 쓰고, 스타일이 없는 종류는 그리지 않습니다.
+    """
+    if table is None:
+        table = StructTable.default()
+    return {
+        code: STRUCTURE_STYLES[name]
+        for code, name in table.names.items()
+        if name in STRUCTURE_STYLES
+    }
+
+
+def rasterize_layers(
+    construction, area=None, category=None, area_alpha=0.3, table=None
+):
+    """격자 레이어들을 칸 하나가 픽셀 하나인 RGBA 이미지로 합칩니다.
+
+    배열은 0-based [y, x] 좌표입니다. area를 주면 Pastel1 색으로 배경을
+    칠하고, category를 주면 구조물 칸을 마커 색으로 칠합니다 (타일용).
+    category의 번호는 table(area_category.csv의 StructTable)로 해석합니다.
+    건설현장은 항상 마지막에 칠하므로 다른 구조물보다 우선합니다.
+    """
+    height, width = construction.shape
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+
+    if area is not None:
+        low, high = float(area.min()), float(area.max())
+        normalized = (area - low) / (high - low) if high > low else area * 0.0
+        image[:] = plt.get_cmap("Pastel1")(normalized, bytes=True)
+        image[..., 3] = int(area_alpha * 255)
+
+    if category is not None:
+        for code, (_, color, _) in structure_styles(table).items():
+            rgba = np.array(mcolors.to_rgba(color)) * 255
+            image[category == code] = rgba.astype(np.uint8)
+
+    image[construction == 1] = CONSTRUCTION_RGBA
+    return image
+
+
+def draw_structure_markers(
+    ax,
+    category,
+    construction,
+    offset=0,
+    size=150,
+    label_limit=LABEL_LIMIT,
+    table=None,
+):
+    """카테고리마다 scatter를 한 번만 호출해 구조물 마커를 그립니다.
+
+    건설현장 위의 구조물은 그리지 않습니다. offset은 배열 인덱스에 더할
+    좌표 보정값입니다 (1-based 축이면 1). 구조물이 label_limit개 이하일
+    때만 이름표를 붙입니다. table: 카테고리 번호를 해석할 StructTable
+    """
+    styles = structure_styles(table)
+    visible = (category > 0) & (construction == 0)
+    ys, xs = np.nonzero(visible)
+    codes = category[ys, xs]
+
+    for code, (_, color, marker) in styles.items():
+        mask = codes == code
+        if mask.any():
+            ax.scatter(
+                xs[mask] + offset,
+                ys[mask] + offset,
+                c=color,
+                s=size,
+                marker=marker,
+                alpha=0.8,
+                zorder=2,
+            )
+
+    if len(codes) <= label_limit:
+        for x, y, code in zip(xs, ys, codes):
+            if code in styles:
+                ax.annotate(
+                    styles[code][0],
+                    (x + offset, y + offset),
+                    xytext=(5, 5),
+                    textcoords="offset points",
+                    fontsize=9,
+                    zorder=3,
+                )
+
+
+def draw_grid_lines(ax, max_x, max_y, offset=0, **line_kwargs):
+    """칸 경계선을 hlines/vlines 한 번씩으로 그립니다 (큰 지도는 생략)."""
+    if max(max_x, max_y) > GRID_LINE_LIMIT:
+        return
+    low = offset - 0.5
+    ax.hlines(
+        np.arange(max_y + 1) + low, low, max_x + low, zorder=1, **line_kwargs
+    )
+    ax.vlines(
+        np.arange(max_x + 1) + low, low, max_y + low, zorder=1, **line_kwargs
+    )
+
+
+def _downsample(image):
+    """가로세로를 절반으로 줄입니다 (2x2 픽셀 평균)."""
+    height, width = image.shape[:2]
+    padded = np.zeros(
+        (height + height % 2, width + width % 2, 4), dtype=np.float32
+    )
+    padded[:height, :width] = image
+    blocks = padded.reshape(
+        padded.shape[0] // 2, 2, padded.shape[1] // 2, 2, 4
+    )
+    return blocks.mean(axis=(1, 3)).astype(np.uint8)
+
+
+def render_tile_pyramid(image, output_dir, tile_size=256, cell_px=8):
+    """RGBA 이미지를 z/x/y.png 타일 피라미드로 저장합니다.
+
+    가장 큰 줌 레벨에서 칸 하나는 cell_px 픽셀이고, 줌 레벨이 하나 내려갈
+    때마다 절반으로 줄어 0레벨에서는 지도 전체가 타일 하나에 들어갑니다.
+    타일마다 필요한 부분만 확대/축소하므로 비용은 출력 픽셀 수에 비례합니다.
+
+    반환값: 저장한 타일 수
+    """
+    height, width = image.shape[:2]
+    max_zoom = max(
+        0, math.ceil(math.log2(max(height, width) * cell_px / tile_size))
+    )
+
+    source = image
+    source_scale = 1  # source 한 픽셀이 차지하는 칸 수
+    count = 0
+    for zoom in range(max_zoom, -1, -1):
+        px_per_cell = cell_px / 2 ** (max_zoom - zoom)
+        while px_per_cell * source_scale < 1:
+            source = _downsample(source)
+            source_scale *= 2
+        # source 한 픽셀이 차지하는 출력 픽셀 수. 정수가 아니어도 되도록
+        # 출력 픽셀마다 source 좌표를 직접 구해서 타일 경계에 틈이 없음
+        scale = px_per_cell * source_scale
+        offsets = np.arange(tile_size)
+
+        rows = math.ceil(source.shape[0] * scale / tile_size)
+        cols = math.ceil(source.shape[1] * scale / tile_size)
+        for ty in range(rows):
+            ys = ((ty * tile_size + offsets) / scale).astype(np.int64)
+            ys = ys[ys < source.shape[0]]
+            for tx in range(cols):
+                xs = ((tx * tile_size + offsets) / scale).astype(np.int64)
+                xs = xs[xs < source.shape[1]]
+                tile = np.zeros((tile_size, tile_size, 4), dtype=np.uint8)
+                tile[: len(ys), : len(xs)] = source[np.ix_(ys, xs)]
+
+                tile_dir = os.path.join(output_dir, str(zoom), str(tx))
+                os.makedirs(tile_dir, exist_ok=True)
+                mpimg.imsave(os.path.join(tile_dir, f"{ty}.png"), tile)
+                count += 1
+
+    return count
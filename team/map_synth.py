@@ -0,0 +1,151 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from csv_ingest import (
+    APARTMENT,
+    BANDALGOM_COFFEE,
+    BUILDING,
+    DEFAULT_CATEGORIES,
+    MY_HOME,
+    StructTable,
+)
+from distance_field import UNREACHABLE, multi_source_bfs
+from grid_graph import GridGraph
+
+# 원본 area_category.csv와 같은 카테고리 번호/이름 (write_map이 그대로 씀)
+CATEGORIES = DEFAULT_CATEGORIES
+DEFAULT_DENSITY = 0.2
+DEFAULT_STRUCTURES = 12
+DEFAULT_CAFES = 2
+DEFAULT_AREAS = 4
+
+
+def generate_map(
+    size,
+    density=DEFAULT_DENSITY,
+    structures=DEFAULT_STRUCTURES,
+    cafes=DEFAULT_CAFES,
+    areas=DEFAULT_AREAS,
+    seed=0,
+):
+    """size x size 크기의 가상 지도를 만듭니다.
+
+    건설현장은 density 비율로 무작위 배치합니다. 내 집을 먼저 놓고, 카페와
+    나머지 구조물(아파트/빌딩)은 내 집에서 도달 가능한 칸에만 놓으므로 경로와
+    구조물 투어가 항상 존재합니다. area는 x 방향으로 areas개 띠로 나눕니다.
+
+    반환값: (map_df, struct_df) - 원본 CSV와 같은 컬럼/정렬 순서
+    """
+    rng = np.random.default_rng(seed)
+    table = StructTable(CATEGORIES)
+    shape = (size + 1, size + 1)  # 1-based grid[y, x]
+
+    construction = (rng.random(shape) < density).astype(np.uint8)
+    category = np.zeros(shape, dtype=np.uint8)
+
+    free_ys, free_xs = np.nonzero(construction[1:, 1:] == 0)
+    if not len(free_xs):
+        raise ValueError("건설현장 비율이 너무 높아 빈 칸이 없습니다.")
+    home = rng.integers(len(free_xs))
+    home_pos = (int(free_xs[home]) + 1, int(free_ys[home]) + 1)
+    category[home_pos[1], home_pos[0]] = table.code(MY_HOME)
+
+    # 내 집과 연결된 칸 중에서 나머지 구조물 위치를 고름
+    graph = GridGraph(construction, size, size)
+    dist, _, _ = multi_source_bfs(graph, [home_pos])
+    reachable = np.flatnonzero(dist != UNREACHABLE)
+    reachable = reachable[reachable != graph.index(home_pos)]
+    count = min(structures + cafes, len(reachable))
+    chosen = rng.choice(reachable, count, replace=False)
+    xs, ys = np.divmod(chosen, graph.stride)
+
+    codes = np.full(count, table.code(BANDALGOM_COFFEE), dtype=np.uint8)
+    codes[cafes:] = rng.choice(
+        [table.code(APARTMENT), table.code(BUILDING)],
+        count - min(cafes, count),
+    )
+    category[ys, xs] = codes
+
+    # 원본과 같이 x 우선, y 다음 순서로 정렬된 행
+    grid_x, grid_y = np.meshgrid(
+        np.arange(1, size + 1), np.arange(1, size + 1), indexing="ij"
+    )
+    flat_x = grid_x.ravel()
+    flat_y = grid_y.ravel()
+    map_df = pd.DataFrame(
+        {
+            "x": flat_x,
+            "y": flat_y,
+            "ConstructionSite": construction[flat_y, flat_x],
+        }
+    )
+    struct_df = pd.DataFrame(
+        {
+            "x": flat_x,
+            "y": flat_y,
+            "category": category[flat_y, flat_x],
+            "area": (flat_x - 1) * areas // size,
+        }
+    )
+    return map_df, struct_df
+
+
+def write_map(data_folder, map_df, struct_df):
+    """원본과 같은 형식(BOM, ' struct' 헤더)으로 세 CSV 파일을 씁니다."""
+    os.makedirs(data_folder, exist_ok=True)
+    map_df.to_csv(
+        os.path.join(data_folder, "area_map.csv"),
+        index=False,
+        encoding="utf-8-sig",
+    )
+    struct_df.to_csv(
+        os.path.join(data_folder, "area_struct.csv"),
+        index=False,
+        encoding="utf-8-sig",
+    )
+    with open(
+        os.path.join(data_folder, "area_category.csv"), "w", encoding="utf-8"
+    ) as f:
+        f.write("category, struct\n")
+        for code, name in CATEGORIES.items():
+            f.write(f"{code}, {name}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가상 지도 CSV 생성")
+    parser.add_argument("output", help="CSV를 저장할 폴더")
+    parser.add_argument("--size", type=int, default=15, help="지도 한 변 길이")
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=DEFAULT_DENSITY,
+        help="건설현장 비율 (0~1)",
+    )
+    parser.add_argument(
+        "--structures",
+        type=int,
+        default=DEFAULT_STRUCTURES,
+        help="아파트/빌딩 개수",
+    )
+    parser.add_argument("--cafes", type=int, default=DEFAULT_CAFES)
+    parser.add_argument("--areas", type=int, default=DEFAULT_AREAS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    map_df, struct_df = generate_map(
+        args.size,
+        args.density,
+        args.structures,
+        args.cafes,
+        args.areas,
+        args.seed,
+    )
+    write_map(args.output, map_df, struct_df)
+    print(f"{args.size}x{args.size} 가상 지도를 저장했습니다: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
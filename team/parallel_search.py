@@ -0,0 +1,236 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch_routing import NearestCafeRouter
+from distance_field import DistanceField
+from grid_graph import GridGraph, require_dense
+from pathfinding import find_path
+from tour_solver import (
+    DEFAULT_MAX_PASSES,
+    INF,
+    improve_tour_passes,
+    nearest_neighbor_tour,
+    tour_length,
+)
+
+# 작업 하나가 너무 작으면 프로세스 간 통신 비용이 커지므로
+# 작업자 하나당 이 정도 개수의 묶음으로 나눔
+CHUNKS_PER_WORKER = 4
+# best_tour의 안전장치 시간 (초). 후보 개선은 max_passes로 멈추고, 이 시간은
+# 비정상적으로 큰 입력에서만 걸리도록 넉넉하게 잡음
+DEFAULT_SAFETY_BUDGET = 30.0
+
+
+class SharedGrid:
+    """GridGraph의 셀 배열을 공유 메모리에 한 번 올려 두는 클래스
+
+    작업자 프로세스는 이름으로 같은 메모리를 붙여(attach) 복사 없이
+    GridGraph를 만듭니다. with 문이 끝나면 공유 메모리를 해제합니다.
+    """
+
+    def __init__(self, graph):
+        self.max_x = graph.max_x
+        self.max_y = graph.max_y
+        self._shm = shared_memory.SharedMemory(create=True, size=graph.size)
+        self.name = self._shm.name
+        self.graph = attach_graph(self._shm, self.max_x, self.max_y)
+        self.graph.cells[:] = graph.cells
+
+    def close(self):
+        """공유 메모리를 닫고 삭제합니다."""
+        if self._shm is not None:
+            self.graph = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_graph(shm, max_x, max_y):
+    """공유 메모리 버퍼를 셀 배열로 쓰는 GridGraph를 만듭니다."""
+    size = (max_x + 2) * (max_y + 2)
+    cells = np.ndarray((size,), dtype=np.uint8, buffer=shm.buf)
+    return GridGraph.from_cells(cells, max_x, max_y)
+
+
+# 작업자 프로세스마다 한 번 붙인 공유 격자와 재사용할 카페 거리장
+_worker = {}
+
+
+def _init_worker(name, max_x, max_y):
+    shm = shared_memory.SharedMemory(name=name)
+    _worker["shm"] = shm  # 참조를 유지해야 버퍼가 닫히지 않음
+    _worker["graph"] = attach_graph(shm, max_x, max_y)
+    _worker["routers"] = {}
+
+
+def _search_chunk(pairs, algorithm):
+    graph = _worker["graph"]
+    return [find_path(graph, start, goal, algorithm) for start, goal in pairs]
+
+
+def _distance_rows(rows, points):
+    """지점 i마다 BFS 한 번으로 i < j인 모든 지점까지의 경로를 구합니다."""
+    graph = _worker["graph"]
+    results = []
+    for i in rows:
+        field = DistanceField(graph, [points[i]])
+        legs = {}
+        for j in range(i + 1, len(points)):
+            path = field.path(points[j])
+            if path is not None:
+                legs[j] = path[::-1]
+        results.append((i, legs))
+    return results
+
+
+def _route_chunk(origins, cafes, with_paths):
+    routers = _worker["routers"]
+    router = routers.get(cafes)
+    if router is None:
+        router = routers[cafes] = NearestCafeRouter(_worker["graph"], cafes)
+    return router.route_many(origins, with_paths)
+
+
+def _improve_candidates(firsts, dist, max_passes, deadline):
+    # 개선 횟수는 max_passes로 정해지고, 공유 마감 시각은 안전장치로만 씀
+    results = []
+    for first in firsts:
+        order, cut_off = improve_tour_passes(
+            dist, nearest_neighbor_tour(dist, first), max_passes, deadline
+        )
+        results.append((tour_length(dist, order), first, order, cut_off))
+    return results
+
+
+def _chunks(items, size):
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class ParallelRouter:
+    """서로 독립적인 경로 탐색을 여러 프로세스에 나눠 실행하는 클래스
+
+    격자는 공유 메모리에 한 번만 올리고, 작업은 입력 순서대로 묶어
+    ProcessPoolExecutor.map으로 보냅니다. 결과도 입력 순서대로 모으므로
+    작업자 수나 묶음 크기와 관계없이 항상 같은 결과를 반환합니다.
+
+    사용 예:
+        with ParallelRouter(graph, workers=8) as router:
+            paths = router.paths([(start, goal), ...])
+    """
+
+    def __init__(self, graph, workers=None, chunk_size=None):
+        require_dense(graph, "병렬 탐색")
+        # 작업자에는 셀 배열만 공유하므로 칸별 비용/대각선 이동은 전달되지 않음
+        if not graph.unit_cost:
+            raise ValueError(
+                "병렬 탐색은 단위 비용 4방향 격자에서만 사용할 수 있습니다."
+            )
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # 마지막 best_tour에서 안전장치 시간 때문에 개선이 끊긴 후보 수
+        self.cut_off = 0
+        self.shared = SharedGrid(graph)
+        try:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.shared.name, graph.max_x, graph.max_y),
+            )
+        except Exception:
+            self.shared.close()
+            raise
+
+    def close(self):
+        """작업자 프로세스를 종료하고 공유 메모리를 해제합니다."""
+        self.executor.shutdown()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunk_size(self, count):
+        if self.chunk_size:
+            return self.chunk_size
+        return max(1, -(-count // (self.workers * CHUNKS_PER_WORKER)))
+
+    def _map(self, fn, items, *args):
+        chunks = _chunks(list(items), self._chunk_size(len(items)))
+        repeated = [[arg] * len(chunks) for arg in args]
+        results = []
+        for part in self.executor.map(fn, chunks, *repeated):
+            results.extend(part)
+        return results
+
+    def paths(self, pairs, algorithm="astar"):
+        """(출발점, 도착점) 쌍마다 최단 경로를 구합니다 (입력 순서대로)."""
+        return self._map(_search_chunk, pairs, algorithm)
+
+    def distance_matrix(self, points):
+        """모든 지점 쌍의 거리 행렬과 구간 경로를 병렬로 계산합니다.
+
+        tour_solver.build_distance_matrix와 같은 (dist, legs) 형식을 반환합니다.
+        행 i마다 BFS 한 번씩이므로 행 단위로 작업자에게 나눕니다.
+        """
+        points = [tuple(p) for p in points]
+        n = len(points)
+        dist = [[0 if i == j else INF for j in range(n)] for i in range(n)]
+        legs = {}
+        for i, row in self._map(_distance_rows, range(n), points):
+            for j, path in row.items():
+                dist[i][j] = dist[j][i] = len(path) - 1
+                legs[(i, j)] = path
+        return dist, legs
+
+    def nearest_cafe_routes(self, cafes, origins, with_paths=False):
+        """여러 출발점의 가장 가까운 카페 결과를 작업자에 나눠 구합니다.
+
+        작업자마다 카페 거리장을 한 번만 만들고, 이후 묶음에서는 재사용합니다.
+        """
+        cafes = tuple(tuple(c) for c in cafes)
+        return self._map(_route_chunk, origins, cafes, with_paths)
+
+    def best_tour(
+        self,
+        dist,
+        time_budget=DEFAULT_SAFETY_BUDGET,
+        max_passes=DEFAULT_MAX_PASSES,
+    ):
+        """0번 다음 방문 지점을 바꾼 후보 경로들을 병렬로 개선해 가장 짧은 것을 고릅니다.
+
+        후보마다 최근접 이웃 경로를 2-opt/Or-opt로 최대 max_passes번
+        개선하고, 거리가 같으면 다음 방문 지점 번호가 작은 후보를 고릅니다.
+        개선 횟수로 멈추므로 작업자 수나 실행 시점과 관계없이 결과가 같습니다.
+        time_budget초 뒤의 마감 시각은 모든 후보가 함께 쓰는 안전장치이며,
+        이 때문에 끊긴 후보 수를 self.cut_off에 남깁니다 (0이 아니면 결과가
+        실행마다 다를 수 있음).
+        반환값: (순서, 총 거리), 도달 불가 지점이 있으면 (None, inf)
+        """
+        self.cut_off = 0
+        n = len(dist)
+        if any(dist[0][k] == INF for k in range(1, n)):
+            return None, INF
+        if n <= 2:
+            order = list(range(n))
+            return order, tour_length(dist, order)
+
+        # 작업자 프로세스 간에 공유되는 시계 기준의 마감 시각
+        deadline = time.time() + time_budget
+        candidates = self._map(
+            _improve_candidates, range(1, n), dist, max_passes, deadline
+        )
+        self.cut_off = sum(c[3] for c in candidates)
+        cost, _, order, _ = min(candidates, key=lambda c: (c[0], c[1]))
+        return order, cost
@@ -0,0 +1,498 @@
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+import profiling
+from compact_path import Path
+from grid_graph import SQRT2
+
+# path: 셀 번호 리스트 (경로 없음: None), expanded: 확장한 노드 수,
+# pushes: 힙 삽입 수, max_open: 힙(open set)의 최대 크기 (지연 삭제 항목 포함)
+SearchResult = namedtuple(
+    "SearchResult",
+    ["path", "expanded", "pushes", "max_open"],
+    defaults=(0, 0),
+)
+
+
+class _SparseScores(dict):
+    """방문한 칸만 저장하는 점수 dict (없는 칸: -1, 읽어도 추가하지 않음)"""
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        return -1
+
+
+def _cell_view(graph):
+    """탐색 엔진이 셀 번호로 막힘 여부를 읽을 객체 (NumPy 배열: memoryview)"""
+    cells = graph.cells
+    return memoryview(cells) if isinstance(cells, np.ndarray) else cells
+
+
+def _new_score_arrays(graph):
+    """g-score와 부모를 담을 int32 배열과 그 memoryview를 만듭니다.
+
+    sparse 격자(메모리 매핑 BitGrid)는 격자 크기 배열 대신 방문한 칸만
+    담는 dict를 씁니다.
+    """
+    if getattr(graph, "sparse", False):
+        return None, None, _SparseScores(), _SparseScores()
+    g_array = np.full(graph.size, -1, dtype=np.int32)
+    parent_array = np.full(graph.size, -1, dtype=np.int32)
+    return g_array, parent_array, memoryview(g_array), memoryview(parent_array)
+
+
+def reconstruct_path(came_from, start, goal):
+    """부모 배열을 따라 start에서 goal까지의 셀 번호 경로를 복원합니다."""
+    path = [goal]
+    current = goal
+    while current != start:
+        current = came_from[current]
+        path.append(current)
+    return path[::-1]
+
+
+def astar_search(graph, start, goal):
+    """셀 번호 기반 A* 탐색으로 start에서 goal까지의 셀 번호 경로를 찾습니다.
+
+    g-score와 부모는 격자 크기의 int32 배열에 저장하고, 힙에는 (f, 셀 번호)만
+    넣습니다. 더 짧은 경로가 발견되면 새 항목을 추가하고 오래된 항목은 꺼낼 때
+    건너뛰므로(lazy deletion) open set 포함 여부를 검사할 필요가 없습니다.
+    셀 번호 순서가 (x, y) 순서와 같으므로 f가 같을 때의 선택도
+    (f, (x, y)) 튜플을 쓰던 기존 구현과 동일합니다.
+    """
+    stride = graph.stride
+    offsets = graph.offsets
+    cells = _cell_view(graph)
+    _, _, g_score, came_from = _new_score_arrays(graph)
+
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+
+    g_score[start] = 0
+    open_heap = [(abs(start_x - goal_x) + abs(start_y - goal_y), start)]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expanded = 0
+    popped = 0
+    max_open = 0
+
+    while open_heap:
+        # 힙이 가장 클 때는 항상 꺼내기 직전이므로 여기서만 크기를 확인
+        if len(open_heap) > max_open:
+            max_open = len(open_heap)
+        f, current = heappop(open_heap)
+        popped += 1
+
+        if current == goal:
+            return SearchResult(
+                reconstruct_path(came_from, start, goal),
+                expanded,
+                popped + len(open_heap),
+                max_open,
+            )
+
+        current_g = g_score[current]
+        x, y = divmod(current, stride)
+        if f > current_g + abs(x - goal_x) + abs(y - goal_y):
+            continue  # 더 짧은 경로로 이미 확장된 오래된 항목
+        expanded += 1
+
+        # 대각선 이동이 없으므로 항상 1씩 증가
+        tentative_g = current_g + 1
+        for offset in offsets:
+            neighbor = current + offset
+
+            # 건설현장과 지도 바깥(테두리)은 지나갈 수 없음
+            if cells[neighbor]:
+                continue
+
+            neighbor_g = g_score[neighbor]
+            if neighbor_g < 0 or tentative_g < neighbor_g:
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+                nx, ny = divmod(neighbor, stride)
+                heappush(
+                    open_heap,
+                    (
+                        tentative_g + abs(nx - goal_x) + abs(ny - goal_y),
+                        neighbor,
+                    ),
+                )
+
+    # 경로를 찾을 수 없음 (꺼낸 항목 수 = 삽입한 항목 수)
+    return SearchResult(None, expanded, popped, max_open)
+
+
+def _jump_horizontal(cells, stride, goal, idx, step):
+    """x 방향으로 직진하며 다음 점프 포인트를 찾습니다 (없으면 -1)."""
+    while True:
+        idx += step
+        if cells[idx]:
+            return -1
+        if idx == goal:
+            return idx
+        # 지나온 쪽 위/아래가 막혀 있고 현재 칸 위/아래가 열려 있으면 강제 이웃
+        if (not cells[idx - 1] and cells[idx - step - 1]) or (
+            not cells[idx + 1] and cells[idx - step + 1]
+        ):
+            return idx
+
+
+def _jump_vertical(cells, stride, goal, idx, step):
+    """y 방향으로 직진하며 다음 점프 포인트를 찾습니다 (없으면 -1).
+
+    4방향 격자에서는 세로 이동 중 가로로 갈 수 있는 점프 포인트가 보이면
+    그 칸에서 멈춰야 최단 경로를 놓치지 않습니다.
+    """
+    while True:
+        idx += step
+        if cells[idx]:
+            return -1
+        if idx == goal:
+            return idx
+        if (not cells[idx - stride] and cells[idx - step - stride]) or (
+            not cells[idx + stride] and cells[idx - step + stride]
+        ):
+            return idx
+        if (
+            _jump_horizontal(cells, stride, goal, idx, stride) >= 0
+            or _jump_horizontal(cells, stride, goal, idx, -stride) >= 0
+        ):
+            return idx
+
+
+def _expand_jump_path(jump_points, stride):
+    """점프 포인트 사이의 직선 구간을 채워 칸 단위 경로로 만듭니다."""
+    path = [jump_points[0]]
+    for a, b in zip(jump_points, jump_points[1:]):
+        if abs(b - a) < stride:
+            step = 1 if b > a else -1
+        else:
+            step = stride if b > a else -stride
+        path.extend(range(a + step, b + step, step))
+    return path
+
+
+def jps_search(graph, start, goal):
+    """4방향 균일 비용 격자용 Jump Point Search로 경로를 찾습니다.
+
+    진행 방향의 이웃만 남기고(pruning) 강제 이웃이 생기는 점프 포인트까지
+    한 번에 건너뛰므로, 넓게 트인 지도에서 힙에 들어가는 노드 수가
+    A*보다 크게 줄어듭니다. 점프 포인트는 같은 행/열에 있으므로 두 점
+    사이 거리는 맨하탄 거리와 같습니다. f가 같으면 g가 큰 노드를 먼저
+    꺼냅니다.
+    """
+    stride = graph.stride
+    cells = _cell_view(graph)
+    _, _, g_score, came_from = _new_score_arrays(graph)
+
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+
+    g_score[start] = 0
+    open_heap = [(abs(start_x - goal_x) + abs(start_y - goal_y), 0, start)]
+    expanded = 0
+    popped = 0
+    max_open = 0
+
+    while open_heap:
+        if len(open_heap) > max_open:
+            max_open = len(open_heap)
+        f, _, current = heapq.heappop(open_heap)
+        popped += 1
+
+        if current == goal:
+            jump_points = reconstruct_path(came_from, start, goal)
+            return SearchResult(
+                _expand_jump_path(jump_points, stride),
+                expanded,
+                popped + len(open_heap),
+                max_open,
+            )
+
+        current_g = g_score[current]
+        x, y = divmod(current, stride)
+        if f > current_g + abs(x - goal_x) + abs(y - goal_y):
+            continue
+        expanded += 1
+
+        # 부모에서 온 방향에 따라 탐색할 방향을 줄임
+        parent = came_from[current] if current != start else -1
+        if parent < 0:
+            directions = (-stride, stride, -1, 1)
+        elif abs(current - parent) >= stride:
+            step = stride if current > parent else -stride
+            directions = (step, -1, 1)
+        else:
+            step = 1 if current > parent else -1
+            directions = (step, -stride, stride)
+
+        for direction in directions:
+            if abs(direction) == stride:
+                jump = _jump_horizontal(
+                    cells, stride, goal, current, direction
+                )
+            else:
+                jump = _jump_vertical(cells, stride, goal, current, direction)
+            if jump < 0:
+                continue
+
+            jx, jy = divmod(jump, stride)
+            tentative_g = current_g + abs(jx - x) + abs(jy - y)
+            jump_g = g_score[jump]
+            if jump_g < 0 or tentative_g < jump_g:
+                g_score[jump] = tentative_g
+                came_from[jump] = current
+                heapq.heappush(
+                    open_heap,
+                    (
+                        tentative_g + abs(jx - goal_x) + abs(jy - goal_y),
+                        -tentative_g,
+                        jump,
+                    ),
+                )
+
+    return SearchResult(None, expanded, popped, max_open)
+
+
+def bidirectional_astar_search(graph, start, goal):
+    """출발점과 도착점 양쪽에서 동시에 A*를 수행해 경로를 찾습니다.
+
+    두 탐색 중 open set이 작은 쪽을 먼저 확장하고, 양쪽이 만난 최단 길이 μ보다
+    한쪽의 최소 f가 크거나 같아지면 종료합니다. f가 같을 때는 g가 큰(목표에
+    더 가까운) 노드를 먼저 꺼내 넓은 지도에서 같은 비용의 노드를 덜 확장합니다.
+    """
+    stride = graph.stride
+    offsets = graph.offsets
+    cells = _cell_view(graph)
+
+    if start == goal:
+        return SearchResult([start], 0)
+    if cells[goal]:
+        return SearchResult(None, 0)  # 건설현장은 도착점이 될 수 없음
+
+    forward = _new_score_arrays(graph)[2:]
+    backward = _new_score_arrays(graph)[2:]
+    targets = (divmod(goal, stride), divmod(start, stride))
+    sources = (start, goal)
+
+    heaps = []
+    for (g_score, _), source, (tx, ty) in zip(
+        (forward, backward), sources, targets
+    ):
+        g_score[source] = 0
+        sx, sy = divmod(source, stride)
+        heaps.append([(abs(sx - tx) + abs(sy - ty), 0, source)])
+
+    best_length = -1
+    meeting = -1
+    expanded = 0
+    popped = 0
+    max_open = 0
+
+    while heaps[0] and heaps[1]:
+        open_size = len(heaps[0]) + len(heaps[1])
+        if open_size > max_open:
+            max_open = open_size
+        if best_length >= 0 and (
+            heaps[0][0][0] >= best_length or heaps[1][0][0] >= best_length
+        ):
+            break
+
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        g_score, came_from = (forward, backward)[side]
+        other_g = (backward, forward)[side][0]
+        target_x, target_y = targets[side]
+        open_heap = heaps[side]
+
+        f, _, current = heapq.heappop(open_heap)
+        popped += 1
+        current_g = g_score[current]
+        x, y = divmod(current, stride)
+        if f > current_g + abs(x - target_x) + abs(y - target_y):
+            continue
+        expanded += 1
+
+        tentative_g = current_g + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor]:
+                continue
+
+            neighbor_g = g_score[neighbor]
+            if neighbor_g < 0 or tentative_g < neighbor_g:
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+                nx, ny = divmod(neighbor, stride)
+                heapq.heappush(
+                    open_heap,
+                    (
+                        tentative_g + abs(nx - target_x) + abs(ny - target_y),
+                        -tentative_g,
+                        neighbor,
+                    ),
+                )
+
+                # 반대쪽 탐색이 이미 도달한 칸이면 두 경로를 이어 본다
+                if other_g[neighbor] >= 0:
+                    length = tentative_g + other_g[neighbor]
+                    if best_length < 0 or length < best_length:
+                        best_length = length
+                        meeting = neighbor
+
+    pushes = popped + len(heaps[0]) + len(heaps[1])
+    if meeting < 0:
+        return SearchResult(None, expanded, pushes, max_open)
+
+    head = reconstruct_path(forward[1], start, meeting)
+    tail = reconstruct_path(backward[1], goal, meeting)
+    return SearchResult(head + tail[-2::-1], expanded, pushes, max_open)
+
+
+def weighted_astar_search(graph, start, goal):
+    """칸별 이동 비용과 8방향 이동을 지원하는 A*로 경로를 찾습니다.
+
+    한 번 이동하는 비용은 이동 거리(직선 1, 대각선 √2) × 두 칸 비용의
+    평균입니다(GridGraph.step_cost). 휴리스틱은 최소 칸 비용 × 옥타일 거리
+    (4방향이면 맨하탄 거리)이므로 과대평가하지 않아 최단 경로를 보장합니다.
+    g-score는 float64 배열에 두고, 힙 항목의 g가 저장된 값보다 크면 오래된
+    항목으로 보고 건너뜁니다.
+    """
+    stride = graph.stride
+    cells = _cell_view(graph)
+    costs = graph.costs
+    min_cost = graph.min_cost
+    moves = graph.moves()
+    # 옥타일 거리 = dx + dy + (√2 - 2) × min(dx, dy)
+    diagonal_gain = SQRT2 - 2 if graph.diagonal else 0.0
+
+    g_array = np.full(graph.size, np.inf)
+    g_score = memoryview(g_array)
+    came_from = _new_score_arrays(graph)[3]
+    if costs is not None:
+        costs = memoryview(costs)
+
+    goal_x, goal_y = divmod(goal, stride)
+    start_x, start_y = divmod(start, stride)
+    dx, dy = abs(start_x - goal_x), abs(start_y - goal_y)
+
+    g_score[start] = 0.0
+    open_heap = [
+        (min_cost * (dx + dy + diagonal_gain * min(dx, dy)), 0.0, start)
+    ]
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    expanded = 0
+    popped = 0
+    max_open = 0
+
+    while open_heap:
+        if len(open_heap) > max_open:
+            max_open = len(open_heap)
+        _, neg_g, current = heappop(open_heap)
+        popped += 1
+
+        if current == goal:
+            return SearchResult(
+                reconstruct_path(came_from, start, goal),
+                expanded,
+                popped + len(open_heap),
+                max_open,
+            )
+        current_g = -neg_g
+        if current_g > g_score[current]:
+            continue  # 더 짧은 경로로 이미 확장된 오래된 항목
+        expanded += 1
+
+        half_cost = costs[current] * 0.5 if costs is not None else 0.0
+        for offset, length, corner_a, corner_b in moves:
+            neighbor = current + offset
+            if cells[neighbor]:
+                continue
+            # 대각선은 양옆 두 칸이 모두 열려 있어야 이동 가능 (모서리 통과 금지)
+            if corner_a and (
+                cells[current + corner_a] or cells[current + corner_b]
+            ):
+                continue
+
+            if costs is None:
+                tentative_g = current_g + length
+            else:
+                tentative_g = current_g + length * (
+                    half_cost + costs[neighbor] * 0.5
+                )
+            if tentative_g < g_score[neighbor]:
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+                nx, ny = divmod(neighbor, stride)
+                dx, dy = abs(nx - goal_x), abs(ny - goal_y)
+                heappush(
+                    open_heap,
+                    (
+                        tentative_g
+                        + min_cost
+                        * (dx + dy + diagonal_gain * (dx if dx < dy else dy)),
+                        -tentative_g,
+                        neighbor,
+                    ),
+                )
+
+    return SearchResult(None, expanded, popped, max_open)
+
+
+def path_cost(graph, path):
+    """좌표 경로 또는 Path의 총 이동 비용을 계산합니다 (단위 비용 격자: 칸 수)."""
+    if not path or len(path) < 2:
+        return 0
+    if graph.unit_cost:
+        return len(path) - 1
+    if isinstance(path, Path):
+        cells = path.cells.tolist()
+    else:
+        cells = [graph.index(pos) for pos in path]
+    return sum(graph.step_cost(a, b) for a, b in zip(cells, cells[1:]))
+
+
+SEARCH_ALGORITHMS = {
+    "astar": astar_search,
+    "jps": jps_search,
+    "bidir": bidirectional_astar_search,
+    "weighted": weighted_astar_search,
+}
+
+
+def search(graph, start, goal, algorithm="astar", connectivity=None):
+    """(x, y) 좌표로 탐색을 수행해 좌표 경로와 확장 노드 수를 반환합니다.
+
+    algorithm: "astar" (기본), "jps" (Jump Point Search), "bidir" (양방향 A*),
+    "weighted" (칸별 비용/8방향 A*). 나머지 알고리즘은 단위 비용 4방향 격자
+    전용이므로 가중치 격자에서는 항상 "weighted"를 사용합니다.
+    connectivity(graph의 ConnectivityIndex)를 주면 start와 goal이 다른 연결
+    요소에 있을 때 탐색 없이 바로 경로 없음을 반환합니다.
+    """
+    if algorithm not in SEARCH_ALGORITHMS:
+        raise ValueError(f"지원하지 않는 탐색 알고리즘입니다: {algorithm}")
+    if not graph.unit_cost:
+        algorithm = "weighted"
+
+    start_idx, goal_idx = graph.index(start), graph.index(goal)
+    if connectivity is not None and not connectivity.connected_cells(
+        start_idx, [goal_idx]
+    ):
+        result = SearchResult(None, 0)
+    else:
+        result = SEARCH_ALGORITHMS[algorithm](graph, start_idx, goal_idx)
+    profiling.record_search(
+        algorithm, result.expanded, result.pushes, result.max_open
+    )
+    if result.path is None:
+        return result
+    return result._replace(path=[graph.coord(idx) for idx in result.path])
+
+
+def find_path(graph, start, goal, algorithm="astar", connectivity=None):
+    """(x, y) 좌표로 탐색을 수행해 좌표 리스트 경로를 반환합니다."""
+    return search(graph, start, goal, algorithm, connectivity).path
@@ -0,0 +1,215 @@
+import atexit
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 이 환경 변수에 출력 경로를 주면 스크립트 시작과 동시에 계측을 켬
+# (.json: Chrome trace 파일, "-" 또는 "log": 표준 에러로 JSON 한 줄 로그)
+PROFILE_ENV = "MAP_PROFILE"
+LOG_OUTPUTS = ("-", "log")
+
+SEARCH_COUNTERS = ("searches", "expanded", "pushes", "max_open")
+
+logger = logging.getLogger("map_profile")
+
+
+def peak_rss_kb():
+    """현재 프로세스의 최대 메모리 사용량(KB)을 반환합니다 (확인 불가: None)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위
+    return peak // 1024 if platform.system() == "Darwin" else peak
+
+
+def _add_search(counters, algorithm, values):
+    entry = counters.setdefault(algorithm, dict.fromkeys(SEARCH_COUNTERS, 0))
+    for key, value in values.items():
+        if key == "max_open":
+            entry[key] = max(entry[key], value)
+        else:
+            entry[key] += value
+
+
+class Profiler:
+    """단계별 실행 시간/CPU 시간/최대 메모리와 탐색 카운터를 모으는 클래스
+
+    단계가 끝날 때마다 JSON 한 줄 로그를 남기거나(output이 "-"/"log"),
+    Chrome trace-event 형식으로 모아 두었다가 종료 시 파일로 저장합니다
+    (chrome://tracing 또는 Perfetto에서 열 수 있음).
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.trace = output not in LOG_OUTPUTS
+        self.events = []
+        self.totals = {}  # 알고리즘 → 탐색 카운터
+        self._stack = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.pid = os.getpid()
+
+        if not self.trace and not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    def _timestamp_us(self, t):
+        return (t - self._origin) * 1e6
+
+    @contextmanager
+    def stage(self, name, **args):
+        counters = {}
+        with self._lock:
+            self._stack.append(counters)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            with self._lock:
+                self._stack.remove(counters)
+            record = {
+                "stage": name,
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "peak_rss_kb": peak_rss_kb(),
+            }
+            if counters:
+                record["search"] = counters
+            record.update(args)
+            self._emit(record, wall_start, wall)
+
+    def _emit(self, record, start, duration):
+        if not self.trace:
+            logger.info(json.dumps(record, ensure_ascii=False))
+            return
+
+        event_args = {k: v for k, v in record.items() if k != "stage"}
+        with self._lock:
+            self.events.append(
+                {
+                    "name": record["stage"],
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": self._timestamp_us(start),
+                    "dur": duration * 1e6,
+                    "pid": self.pid,
+                    "tid": threading.get_ident(),
+                    "args": event_args,
+                }
+            )
+            if record["peak_rss_kb"] is not None:
+                self.events.append(
+                    {
+                        "name": "peak_rss_kb",
+                        "ph": "C",
+                        "ts": self._timestamp_us(start + duration),
+                        "pid": self.pid,
+                        "args": {"peak_rss_kb": record["peak_rss_kb"]},
+                    }
+                )
+
+    def record_search(self, algorithm, expanded, pushes, max_open):
+        """탐색 한 번의 확장 노드 수, 큐 삽입 수, 최대 open set 크기를 누적합니다."""
+        values = {
+            "searches": 1,
+            "expanded": expanded,
+            "pushes": pushes,
+            "max_open": max_open,
+        }
+        with self._lock:
+            for counters in [self.totals] + self._stack:
+                _add_search(counters, algorithm, values)
+
+    def write(self):
+        """Chrome trace 파일을 저장하거나 전체 탐색 카운터를 로그로 남깁니다."""
+        summary = {"search": self.totals, "peak_rss_kb": peak_rss_kb()}
+        if not self.trace:
+            logger.info(json.dumps({"summary": summary}, ensure_ascii=False))
+            return
+
+        with self._lock:
+            events = list(self.events)
+        metadata = {"summary": summary, "argv": sys.argv}
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": metadata,
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+
+_profiler = None
+
+
+def enable(output=None):
+    """계측을 켭니다. output이 없으면 MAP_PROFILE 환경 변수를 사용합니다."""
+    global _profiler
+    output = output or os.environ.get(PROFILE_ENV)
+    if not output or _profiler is not None:
+        return _profiler
+    _profiler = Profiler(output)
+    atexit.register(_profiler.write)
+    return _profiler
+
+
+@contextmanager
+def stage(name, message=None, **args):
+    """파이프라인 단계 하나를 계측합니다 (message가 있으면 진행 메시지 출력).
+
+    계측이 꺼져 있으면 메시지 출력만 합니다.
+    """
+    if message:
+        print(message)
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(name, **args):
+        yield
+
+
+def record_search(algorithm, expanded, pushes=0, max_open=0):
+    """탐색 엔진이 탐색마다 호출합니다 (계측이 꺼져 있으면 무시).
+
+    expanded: 확장한 노드 수, pushes: 힙/큐 삽입 수,
+    max_open: open set(힙 또는 BFS 경계)의 최대 크기
+    """
+    if _profiler is not None:
+        _profiler.record_search(algorithm, expanded, pushes, max_open)
+
+
+def add_profile_argument(parser):
+    """스크립트의 argparse에 --profile 옵션을 추가합니다."""
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="OUTPUT",
+        help=(
+            "단계별 시간/메모리/탐색 카운터 기록 "
+            "(.json: Chrome trace 파일, '-': 표준 에러로 JSON 로그). "
+            f"환경 변수 {PROFILE_ENV}로도 지정 가능"
+        ),
+    )
+
+
+# 환경 변수로 지정된 경우 모듈을 불러오는 즉시 계측 시작
+enable()
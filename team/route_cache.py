@@ -0,0 +1,211 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from connectivity import ConnectivityIndex
+from grid_graph import require_dense
+from pathfinding import find_path
+
+DEFAULT_MAXSIZE = 4096
+
+
+def map_version(graph):
+    """격자 크기와 셀 내용으로 지도 버전 해시를 만듭니다."""
+    require_dense(graph, "경로 캐시")
+    digest = hashlib.sha256()
+    digest.update(f"{graph.max_x}x{graph.max_y}".encode())
+    digest.update(graph.cells.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class RouteCache:
+    """(지도 버전, 알고리즘, 출발점, 도착점) → 경로를 보관하는 LRU 캐시
+
+    경로가 지나가는 셀마다 역색인을 두어, 칸 하나가 바뀌면 그 칸을 지나는
+    경로만 지웁니다. 지도 버전이 키에 들어 있으므로 다시 불러온 지도와
+    이전 지도의 경로가 섞이지 않고, 이전 버전 항목은 LRU로 밀려납니다.
+    route_server처럼 여러 요청 스레드가 한 인스턴스를 함께 쓰므로 모든
+    공개 메서드는 잠금 안에서 항목, 역색인, 통계를 함께 바꿉니다.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # 키 → (경로 튜플, 셀 번호 튜플)
+        self._by_cell = {}  # (버전, 셀 번호) → 그 셀을 지나는 키 집합
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key):
+        """캐시된 경로를 반환합니다. 없으면 KeyError (경로 없음은 None)."""
+        with self._lock:
+            try:
+                path, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return None if path is None else list(path)
+
+    def put(self, key, path, cells=()):
+        """경로와 경로가 지나는 셀 번호들을 저장합니다."""
+        path = None if path is None else tuple(path)
+        cells = tuple(cells)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (path, cells)
+            version = key[0]
+            for idx in cells:
+                self._by_cell.setdefault((version, idx), set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _discard(self, key):
+        # 호출하는 쪽에서 잠금을 잡고 있어야 함
+        _, cells = self._entries.pop(key)
+        version = key[0]
+        for idx in cells:
+            keys = self._by_cell.get((version, idx))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_cell[(version, idx)]
+
+    def invalidate_cell(self, version, idx, pos, blocked):
+        """셀 하나가 바뀌었을 때 영향을 받는 경로만 지웁니다.
+
+        막힌 경우: 그 셀을 지나던 경로만 무효입니다.
+        뚫린 경우: 출발점 → 그 셀 → 도착점의 맨해튼 거리가 기존 경로보다
+        짧은 경로(그리고 경로가 없던 항목)만 더 짧아질 수 있으므로 지웁니다.
+
+        반환값: 지운 항목 수
+        """
+        with self._lock:
+            return self._invalidate(version, idx, pos, blocked)
+
+    def _invalidate(self, version, idx, pos, blocked):
+        if blocked:
+            stale = list(self._by_cell.get((version, idx), ()))
+        else:
+            stale = []
+            for key, (path, _) in self._entries.items():
+                if key[0] != version:
+                    continue
+                start, goal = key[2], key[3]
+                if path is None or (
+                    _manhattan(start, pos) + _manhattan(pos, goal)
+                    < len(path) - 1
+                ):
+                    stale.append(key)
+
+        for key in stale:
+            self._discard(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def migrate(self, version, new_version, idx, pos, blocked):
+        """셀 하나가 바뀐 지도의 새 버전으로 항목을 옮깁니다.
+
+        invalidate_cell과 같은 기준으로 영향을 받는 경로를 지운 뒤, 남은
+        version 항목은 변경 후에도 맞으므로 new_version 키로 옮깁니다.
+        키의 버전은 항상 그 경로를 계산한 지도 내용의 해시이므로, 같은
+        캐시를 쓰는 다른 탐색기가 바뀌기 전 지도로 조회해도 지워진 경로나
+        바뀐 지도의 경로를 받지 않습니다.
+
+        반환값: 지운 항목 수
+        """
+        with self._lock:
+            removed = self._invalidate(version, idx, pos, blocked)
+            if new_version == version:
+                return removed
+            moved = [key for key in self._entries if key[0] == version]
+            for key in moved:
+                path, cells = self._entries[key]
+                self._discard(key)
+                new_key = (new_version,) + key[1:]
+                if new_key in self._entries:
+                    continue
+                self._entries[new_key] = (path, cells)
+                for cell in cells:
+                    self._by_cell.setdefault((new_version, cell), set()).add(
+                        new_key
+                    )
+            return removed
+
+    def clear(self):
+        """모든 항목을 지웁니다 (통계는 유지)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_cell.clear()
+
+    def stats(self):
+        """적중/실패/제거/무효화 횟수와 현재 크기를 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class CachedPathfinder:
+    """RouteCache를 앞에 둔 경로 탐색기
+
+    건설현장 변경은 반드시 set_blocked로 해야 캐시와 연결 요소 색인이
+    함께 갱신됩니다. 서로 다른 연결 요소 사이의 요청은 탐색 없이 None을
+    반환합니다. set_blocked는 바뀐 지도 내용으로 version을 다시 계산하므로
+    여러 탐색기(다시 불러온 서버 지도 포함)가 캐시 하나를 함께 써도
+    각자 자기 지도 내용에 맞는 경로만 받습니다.
+    """
+
+    def __init__(self, graph, cache=None, version=None):
+        self.graph = graph
+        self.cache = cache if cache is not None else RouteCache()
+        self.version = version if version is not None else map_version(graph)
+        self.connectivity = ConnectivityIndex(graph)
+
+    def find_path(self, start, goal, algorithm="astar"):
+        """캐시에 있으면 바로, 없으면 탐색 후 저장해 경로를 반환합니다."""
+        start, goal = tuple(start), tuple(goal)
+        if not self.connectivity.connected(start, goal):
+            return None
+        key = (self.version, algorithm, start, goal)
+        try:
+            return self.cache.get(key)
+        except KeyError:
+            pass
+
+        path = find_path(self.graph, start, goal, algorithm)
+        cells = [self.graph.index(pos) for pos in path] if path else ()
+        self.cache.put(key, path, cells)
+        return path
+
+    def set_blocked(self, pos, blocked=True):
+        """건설현장 여부를 바꾸고 영향을 받는 캐시 항목만 지웁니다.
+
+        반환값: 지운 캐시 항목 수 (값이 그대로면 0)
+        """
+        idx = self.graph.index(pos)
+        if not self.connectivity.set_blocked(pos, blocked):
+            return 0
+        version, self.version = self.version, map_version(self.graph)
+        return self.cache.migrate(version, self.version, idx, pos, blocked)
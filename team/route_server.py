@@ -0,0 +1,395 @@
+import argparse
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask, jsonify, request
+
+from batch_routing import NearestCafeRouter
+from grid_graph import GridGraph
+from map_direct_save import (
+    create_grid_matrix,
+    find_coffee_locations,
+    find_home_location,
+    find_optimal_structure_tour,
+    load_data,
+)
+from map_cache import SOURCE_FILES
+from pathfinding import SEARCH_ALGORITHMS
+from route_cache import DEFAULT_MAXSIZE, CachedPathfinder, RouteCache
+
+DATA_FOLDER = os.path.join(os.path.dirname(__file__), "dataFile")
+NEAREST_CAFE = "nearest-cafe"
+DEFAULT_WATCH_INTERVAL = 2.0
+DEFAULT_TOUR_CACHE_SIZE = 32
+
+
+def data_fingerprint(data_folder=DATA_FOLDER):
+    """지도 데이터 파일들의 (크기, 수정 시각)을 모아 변경 여부 확인에 씁니다."""
+    names = SOURCE_FILES + ("merged_data.csv",)
+    fingerprint = []
+    for name in names:
+        try:
+            stat = os.stat(os.path.join(data_folder, name))
+        except OSError:
+            fingerprint.append(None)
+            continue
+        fingerprint.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+class MapState:
+    """한 번 불러온 지도와 탐색용 구조를 묶어 둔 읽기 전용 스냅샷
+
+    요청 처리 중에는 이 객체를 바꾸지 않으므로 여러 요청이 동시에 읽어도
+    안전합니다. 순회 경로는 처음 요청될 때 계산해 출발점별로 최근
+    tour_cache_size개까지 보관합니다.
+    """
+
+    def __init__(
+        self,
+        area=None,
+        version=1,
+        route_cache=None,
+        tour_cache_size=DEFAULT_TOUR_CACHE_SIZE,
+    ):
+        self.area = area
+        self.version = version
+        self.fingerprint = data_fingerprint()
+        self.loaded_at = time.time()
+
+        df = load_data(area)
+        self.grid, self.structures, self.max_x, self.max_y = (
+            create_grid_matrix(df)
+        )
+        self.graph = GridGraph(self.grid, self.max_x, self.max_y)
+        self.home = find_home_location(self.structures)
+        self.cafes = find_coffee_locations(self.structures)
+        self.cafe_router = NearestCafeRouter(self.graph, self.cafes)
+        # 캐시 키에 지도 내용 해시가 들어가므로 다시 불러와도 캐시를 공유 가능
+        self.pathfinder = CachedPathfinder(self.graph, route_cache)
+
+        self.tour_cache_size = max(1, int(tour_cache_size))
+        self._tours = OrderedDict()
+        self._tours_pending = {}
+        self._tour_lock = threading.Lock()
+
+    def tour(self, start):
+        """start에서 출발해 모든 구조물을 돌아오는 경로를 반환합니다 (캐시).
+
+        계산은 잠금 밖에서 하므로 다른 출발점 요청은 기다리지 않고,
+        같은 출발점을 동시에 요청하면 먼저 온 요청의 결과를 함께 씁니다.
+        """
+        while True:
+            with self._tour_lock:
+                if start in self._tours:
+                    self._tours.move_to_end(start)
+                    return self._tours[start]
+                pending = self._tours_pending.get(start)
+                if pending is None:
+                    pending = threading.Event()
+                    self._tours_pending[start] = pending
+                    break
+            # 계산이 실패했으면 깨어난 요청 중 하나가 다시 계산
+            pending.wait()
+
+        try:
+            tour = find_optimal_structure_tour(
+                self.grid,
+                start,
+                self.structures,
+                self.max_x,
+                self.max_y,
+                connectivity=self.pathfinder.connectivity,
+            )
+            with self._tour_lock:
+                self._tours[start] = tour
+                while len(self._tours) > self.tour_cache_size:
+                    self._tours.popitem(last=False)
+        finally:
+            with self._tour_lock:
+                del self._tours_pending[start]
+            pending.set()
+        return tour
+
+    def summary(self):
+        """상태 확인용 요약 정보를 반환합니다."""
+        return {
+            "version": self.version,
+            "area": self.area,
+            "loaded_at": self.loaded_at,
+            "size": [self.max_x, self.max_y],
+            "structures": len(self.structures),
+            "home": self.home,
+            "cafes": self.cafes,
+            "map_hash": self.pathfinder.version,
+        }
+
+
+class MapStore:
+    """현재 MapState를 보관하고 무중단으로 교체하는 클래스
+
+    새 지도는 기존 상태를 그대로 둔 채 따로 만든 뒤 참조만 바꿔 끼우므로,
+    다시 불러오는 동안에도 요청은 이전 지도로 계속 처리됩니다.
+    """
+
+    def __init__(self, area=None, cache_size=DEFAULT_MAXSIZE):
+        self.area = area
+        self._reload_lock = threading.Lock()
+        self.route_cache = RouteCache(cache_size)
+        self.current = MapState(area, route_cache=self.route_cache)
+
+    def reload(self):
+        """지도를 다시 불러와 교체합니다 (실패하면 기존 지도를 유지)."""
+        with self._reload_lock:
+            state = MapState(
+                self.area, self.current.version + 1, self.route_cache
+            )
+            self.current = state
+            return state
+
+    def reload_if_changed(self):
+        """데이터 파일이 바뀌었을 때만 다시 불러옵니다."""
+        if data_fingerprint() == self.current.fingerprint:
+            return None
+        return self.reload()
+
+    def watch(self, interval=DEFAULT_WATCH_INTERVAL):
+        """interval초마다 데이터 파일 변경을 확인하는 백그라운드 스레드를 시작합니다."""
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    state = self.reload_if_changed()
+                except Exception as e:
+                    print(f"지도 다시 불러오기 실패 (기존 지도 유지): {e}")
+                    continue
+                if state is not None:
+                    print(f"지도를 다시 불러왔습니다: 버전 {state.version}")
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
+
+
+def parse_point(text, name):
+    """'x,y' 형식 문자열을 (x, y) 튜플로 변환합니다."""
+    try:
+        x, y = (int(v) for v in text.split(","))
+    except (AttributeError, ValueError):
+        raise ValueError(f"{name}는 'x,y' 형식이어야 합니다: {text!r}")
+    return (x, y)
+
+
+def parse_category(text, table):
+    """카테고리 이름(BandalgomCoffee 등) 또는 번호를 카테고리 번호로 변환합니다.
+
+    table: 지도를 읽을 때 쓴 코드표(StructTable)
+    """
+    codes = {name.lower(): code for code, name in table.names.items()}
+    if text.isdigit() and int(text) in table.names:
+        return int(text)
+    if text.lower() in codes:
+        return codes[text.lower()]
+    raise ValueError(f"알 수 없는 구조물 종류입니다: {text!r}")
+
+
+def _error(message, status=400):
+    return jsonify({"error": message}), status
+
+
+def _path_json(path):
+    return [list(pos) for pos in path]
+
+
+def create_app(store):
+    """경로 탐색 API를 제공하는 Flask 애플리케이션을 만듭니다."""
+    app = Flask(__name__)
+    app.json.ensure_ascii = False
+
+    @app.route("/health")
+    def health():
+        return jsonify(
+            dict(store.current.summary(), cache=store.route_cache.stats())
+        )
+
+    @app.route("/route")
+    def route():
+        """
+        두 지점 또는 가장 가까운 반달곰 커피까지의 최단 경로를 반환합니다.
+        - /route?from=14,2&to=nearest-cafe
+        - /route?from=14,2&to=2,12&algorithm=jps
+        from을 생략하면 내 집에서 출발합니다.
+        """
+        state = store.current
+        algorithm = request.args.get("algorithm", "astar")
+        if algorithm not in SEARCH_ALGORITHMS:
+            return _error(f"지원하지 않는 탐색 알고리즘입니다: {algorithm}")
+
+        try:
+            start = (
+                parse_point(request.args["from"], "from")
+                if "from" in request.args
+                else state.home
+            )
+            target = request.args.get("to", NEAREST_CAFE)
+            goal = (
+                None if target == NEAREST_CAFE else parse_point(target, "to")
+            )
+        except ValueError as e:
+            return _error(str(e))
+
+        if start is None:
+            return _error("출발점이 없습니다 (내 집 데이터 없음).")
+        if not state.graph.is_passable(start):
+            return _error(f"출발점이 지도 밖이거나 건설현장입니다: {start}")
+
+        if goal is None:
+            result = state.cafe_router.route(start)
+            goal, path = result.cafe, result.path
+        elif not state.graph.is_passable(goal):
+            return _error(f"도착점이 지도 밖이거나 건설현장입니다: {goal}")
+        else:
+            path = state.pathfinder.find_path(start, goal, algorithm)
+
+        if path is None:
+            return _error("경로를 찾을 수 없습니다.", 404)
+
+        return jsonify(
+            {
+                "version": state.version,
+                "from": start,
+                "to": goal,
+                "distance": len(path) - 1,
+                "path": _path_json(path),
+            }
+        )
+
+    @app.route("/tour")
+    def tour():
+        """
+        모든 구조물을 한 번씩 방문하고 돌아오는 경로를 반환합니다.
+        - /tour (내 집 출발), /tour?from=1,1
+        """
+        state = store.current
+        try:
+            start = (
+                parse_point(request.args["from"], "from")
+                if "from" in request.args
+                else state.home
+            )
+        except ValueError as e:
+            return _error(str(e))
+
+        if start is None or not state.graph.is_passable(start):
+            return _error(f"출발점이 지도 밖이거나 건설현장입니다: {start}")
+
+        path, distance = state.tour(start)
+        if path is None:
+            return _error(
+                "모든 구조물을 방문하는 경로를 찾을 수 없습니다.", 404
+            )
+
+        return jsonify(
+            {
+                "version": state.version,
+                "from": start,
+                "distance": distance,
+                "path": _path_json(path),
+            }
+        )
+
+    @app.route("/structures")
+    def structures():
+        """
+        가까운 구조물을 맨해튼 거리 순으로 반환합니다.
+        - /structures?near=14,2&category=BandalgomCoffee&k=3
+        - /structures?near=14,2&radius=5 (반경 안의 구조물 전체)
+        near를 생략하면 내 집, k와 radius를 모두 생략하면 k=1입니다.
+        """
+        state = store.current
+        try:
+            near = (
+                parse_point(request.args["near"], "near")
+                if "near" in request.args
+                else state.home
+            )
+            category = (
+                parse_category(
+                    request.args["category"], state.structures.table
+                )
+                if "category" in request.args
+                else None
+            )
+            k = request.args.get("k", type=int)
+            radius = request.args.get("radius", type=int)
+        except ValueError as e:
+            return _error(str(e))
+        if near is None:
+            return _error("기준 좌표가 없습니다 (내 집 데이터 없음).")
+
+        if radius is not None:
+            found = state.structures.within(near, radius, category)
+            if k is not None:
+                found = found[:k]
+        else:
+            found = state.structures.nearest(near, k or 1, category)
+
+        return jsonify(
+            {
+                "version": state.version,
+                "near": near,
+                "structures": [
+                    {"position": list(pos), "distance": distance}
+                    for pos, distance in found
+                ],
+            }
+        )
+
+    @app.route("/reload", methods=["POST"])
+    def reload():
+        """지도 데이터를 다시 불러옵니다 (실패하면 기존 지도 유지)."""
+        try:
+            state = store.reload()
+        except Exception as e:
+            return _error(f"지도 다시 불러오기 실패: {e}", 500)
+        return jsonify(state.summary())
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="경로 탐색 HTTP 서비스")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--area", type=int, default=None, help="이 area 지도만 불러옴"
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="지정한 간격(초)마다 데이터 파일 변경을 확인해 자동으로 다시 불러옴",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAXSIZE,
+        help="경로 캐시에 보관할 최대 경로 수",
+    )
+    args = parser.parse_args()
+
+    store = MapStore(args.area, args.cache_size)
+    print(f"지도 로딩 완료: {store.current.summary()}")
+    if args.watch:
+        store.watch(args.watch)
+
+    app = create_app(store)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import time
+
+INF = float("inf")
+
+# 정확해(Held-Karp)로 푸는 최대 방문 지점 수 (시작점 제외)
+DEFAULT_EXACT_LIMIT = 12
+
+# 휴리스틱 개선(2-opt / Or-opt)에 쓰는 기본 시간 예산 (초)
+DEFAULT_TIME_BUDGET = 0.5
+
+# 병렬 후보 개선에서 후보 하나에 적용하는 최대 개선 횟수.
+# 시간이 아니라 횟수로 멈추므로 기기 속도와 관계없이 같은 결과가 나옴
+DEFAULT_MAX_PASSES = 200
+
+
+def build_distance_matrix(points, leg_fn, cost_fn=None):
+    """모든 지점 쌍의 최단 거리 행렬과 구간 경로를 한 번에 계산합니다.
+
+    leg_fn(a, b)는 a에서 b까지의 경로(좌표 리스트) 또는 None을 반환해야 합니다.
+    격자 이동은 양방향이므로 i < j 쌍만 계산하고 반대 방향은 뒤집어 재사용합니다.
+    cost_fn(path)을 주면 칸 수 대신 그 값을 거리로 씁니다 (가중치 격자).
+    """
+    n = len(points)
+    dist = [[0 if i == j else INF for j in range(n)] for i in range(n)]
+    legs = {}
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            path = leg_fn(points[i], points[j])
+            if path is None:
+                continue
+            cost = len(path) - 1 if cost_fn is None else cost_fn(path)
+            dist[i][j] = dist[j][i] = cost
+            legs[(i, j)] = path
+
+    return dist, legs
+
+
+def leg_path(legs, i, j):
+    """build_distance_matrix가 저장한 구간 경로를 i → j 방향으로 반환합니다."""
+    if i == j:
+        return None
+    if i < j:
+        return legs.get((i, j))
+    path = legs.get((j, i))
+    return path[::-1] if path is not None else None
+
+
+def tour_length(dist, order):
+    """0번 지점에서 출발해 다시 돌아오는 순회 경로의 총 거리를 계산합니다."""
+    total = 0
+    for a, b in zip(order, order[1:] + order[:1]):
+        total += dist[a][b]
+    return total
+
+
+def held_karp_tour(dist):
+    """비트마스크 DP(Held-Karp)로 0번 지점 기준 최적 순회 순서를 찾습니다.
+
+    O(n²·2ⁿ) 시간과 O(n·2ⁿ) 메모리를 사용하므로 작은 n에서만 호출해야 합니다.
+    """
+    n = len(dist)
+    if n <= 1:
+        return [0] if n else [], 0
+
+    m = n - 1  # 0번(출발점)을 제외한 지점들을 비트 0..m-1에 대응
+    full = (1 << m) - 1
+    dp = [[INF] * m for _ in range(full + 1)]
+    parent = [[-1] * m for _ in range(full + 1)]
+
+    for j in range(m):
+        dp[1 << j][j] = dist[0][j + 1]
+
+    for mask in range(1, full + 1):
+        row = dp[mask]
+        for j in range(m):
+            cost = row[j]
+            if cost == INF or not (mask >> j) & 1:
+                continue
+            dist_j = dist[j + 1]
+            for k in range(m):
+                bit = 1 << k
+                if mask & bit:
+                    continue
+                new_cost = cost + dist_j[k + 1]
+                next_mask = mask | bit
+                if new_cost < dp[next_mask][k]:
+                    dp[next_mask][k] = new_cost
+                    parent[next_mask][k] = j
+
+    best_cost = INF
+    last = -1
+    for j in range(m):
+        cost = dp[full][j] + dist[j + 1][0]
+        if cost < best_cost:
+            best_cost = cost
+            last = j
+
+    if last < 0:
+        return None, INF
+
+    # 부모 포인터를 따라 방문 순서 복원
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        prev = parent[mask][last]
+        mask &= ~(1 << last)
+        last = prev
+    order.append(0)
+    order.reverse()
+
+    return order, best_cost
+
+
+def nearest_neighbor_tour(dist, first=None):
+    """가장 가까운 미방문 지점을 차례로 고르는 초기 순회 경로를 만듭니다.
+
+    first를 주면 0번 다음에 first를 방문하도록 고정합니다 (후보 경로 다양화용).
+    """
+    n = len(dist)
+    order = [0]
+    unvisited = set(range(1, n))
+    current = 0
+    if first is not None:
+        order.append(first)
+        unvisited.remove(first)
+        current = first
+
+    while unvisited:
+        row = dist[current]
+        current = min(unvisited, key=lambda k: (row[k], k))
+        order.append(current)
+        unvisited.remove(current)
+
+    return order
+
+
+def _two_opt_pass(dist, order):
+    """구간 뒤집기(2-opt)로 개선되는 첫 번째 변경을 적용합니다."""
+    n = len(order)
+    for i in range(1, n - 1):
+        a, b = order[i - 1], order[i]
+        for j in range(i + 1, n):
+            c, d = order[j], order[(j + 1) % n]
+            delta = dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d]
+            if delta < 0:
+                order[i : j + 1] = order[i : j + 1][::-1]
+                return True
+    return False
+
+
+def _or_opt_pass(dist, order):
+    """길이 1~3의 연속 구간을 다른 위치로 옮기는(Or-opt) 첫 번째 개선을 적용합니다."""
+    n = len(order)
+    for seg_len in (1, 2, 3):
+        for i in range(1, n - seg_len + 1):
+            prev, first = order[i - 1], order[i]
+            last, nxt = order[i + seg_len - 1], order[(i + seg_len) % n]
+            removed_gain = (
+                dist[prev][first] + dist[last][nxt] - dist[prev][nxt]
+            )
+            rest = order[:i] + order[i + seg_len :]
+            segment = order[i : i + seg_len]
+            for k in range(len(rest)):
+                u, v = rest[k], rest[(k + 1) % len(rest)]
+                if k == i - 1:
+                    # 원래 위치에서는 구간을 뒤집는 경우만 의미가 있음
+                    orientations = (segment[::-1],) if seg_len > 1 else ()
+                else:
+                    orientations = (segment, segment[::-1])
+                for seg in orientations:
+                    added = dist[u][seg[0]] + dist[seg[-1]][v] - dist[u][v]
+                    if added < removed_gain:
+                        order[:] = rest[: k + 1] + seg + rest[k + 1 :]
+                        return True
+    return False
+
+
+def improve_tour_passes(dist, order, max_passes=None, deadline=None):
+    """2-opt와 Or-opt를 번갈아 최대 max_passes번 적용해 순회 경로를 개선합니다.
+
+    deadline(time.time() 기준 시각)은 안전장치로, 지나면 개선을 멈춥니다.
+    마감 전에 끝나면 결과는 입력과 max_passes만으로 정해집니다.
+    반환값: (순서, 마감 시각 때문에 멈췄는지 여부)
+    """
+    order = list(order)
+    passes = 0
+    while max_passes is None or passes < max_passes:
+        if deadline is not None and time.time() >= deadline:
+            return order, True
+        passes += 1
+        if _two_opt_pass(dist, order):
+            continue
+        if _or_opt_pass(dist, order):
+            continue
+        break  # 더 이상 개선 불가 (국소 최적)
+    return order, False
+
+
+def improve_tour(
+    dist, order, time_budget=DEFAULT_TIME_BUDGET, max_passes=None
+):
+    """2-opt와 Or-opt를 번갈아 적용해 시간 예산 안에서 순회 경로를 개선합니다.
+
+    max_passes를 주면 개선을 그 횟수만큼 적용한 뒤에도 멈춥니다.
+    """
+    deadline = time.time() + time_budget
+    return improve_tour_passes(dist, order, max_passes, deadline)[0]
+
+
+def solve_tour(
+    dist, exact_limit=DEFAULT_EXACT_LIMIT, time_budget=DEFAULT_TIME_BUDGET
+):
+    """0번 지점에서 출발해 모든 지점을 방문하고 돌아오는 순회 경로를 구합니다.
+
+    방문 지점 수가 exact_limit 이하이면 Held-Karp로 정확해를,
+    그보다 많으면 최근접 이웃 + 2-opt/Or-opt 휴리스틱 해를 반환합니다.
+    도달할 수 없는 지점이 있으면 (None, inf)를 반환합니다.
+    """
+    n = len(dist)
+    # 격자는 양방향 이동이므로 출발점에서 모두 도달 가능하면 모든 쌍이 연결됨
+    if any(dist[0][k] == INF for k in range(1, n)):
+        return None, INF
+
+    if n - 1 <= exact_limit:
+        return held_karp_tour(dist)
+
+    order = improve_tour(dist, nearest_neighbor_tour(dist), time_budget)
+    return order, tour_length(dist, order)